@@ -0,0 +1,116 @@
+"""Compares the ABCI channel (`/abci_query` over HTTP) with the native gRPC channel of the BlockchainClient.
+
+The network benchmark reads the NetworkConfiguration from the environment (or `.env`), grpc_host and grpc_port
+included:
+
+    export host=https://... port=443 chain_id=5600 grpc_host=https://... grpc_port=443
+    python benchmarks/bench_channels.py --requests 1000 --concurrency 200
+
+`--codec-only` skips the network and only measures the per-query encode/decode work of both paths.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import statistics
+import time
+
+from greenfield_python_sdk import BlockchainClient, ChannelType, NetworkConfiguration
+from greenfield_python_sdk.protos.greenfield.sp import (
+    Description,
+    QueryStorageProvidersRequest,
+    QueryStorageProvidersResponse,
+    StorageProvider,
+)
+
+QUERIES = {
+    "params": lambda client: client.storage.get_params(),
+    "sps": lambda client: client.sp.get_storage_providers(),
+    "latest_block": lambda client: client.tendermint.get_latest_block(),
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def bench_channel(channel_type: ChannelType, query: str, requests: int, concurrency: int):
+    configuration = NetworkConfiguration(channel_type=channel_type)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with BlockchainClient(configuration, pool_size=concurrency) as client:
+        # Warm up the connections so the handshakes are not measured
+        await asyncio.gather(*[QUERIES[query](client) for _ in range(min(concurrency, 10))])
+
+        async def run_query():
+            async with semaphore:
+                start = time.perf_counter()
+                await QUERIES[query](client)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[run_query() for _ in range(requests)])
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{channel_type.value:>5} {query}: {requests / elapsed:9.1f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms | p99 {percentile(latencies, 0.99) * 1000:7.2f} ms"
+    )
+
+
+def bench_codec(iterations: int):
+    request = QueryStorageProvidersRequest()
+    response = QueryStorageProvidersResponse(
+        sps=[
+            StorageProvider(
+                id=i,
+                operator_address=f"0x{i:040x}",
+                endpoint=f"https://gnfd-sp-{i}.example.org",
+                description=Description(moniker=f"sp-{i}", details="x" * 200),
+            )
+            for i in range(30)
+        ]
+    )
+    # What the fullnode sends back on each path
+    abci_body = json.dumps({"result": {"response": {"value": base64.b64encode(bytes(response)).decode()}}})
+    grpc_body = bytes(response)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        "0x" + bytes(request).hex()
+        body = json.loads(abci_body)
+        QueryStorageProvidersResponse.FromString(base64.b64decode(body["result"]["response"]["value"]))
+    abci = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        bytes(request)
+        QueryStorageProvidersResponse.FromString(grpc_body)
+    grpc = time.perf_counter() - start
+
+    print(f"payload: {len(grpc_body)} bytes protobuf, {len(abci_body)} bytes ABCI JSON")
+    print(f" abci codec: {iterations / abci:9.1f} msg/s")
+    print(f" grpc codec: {iterations / grpc:9.1f} msg/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--query", choices=QUERIES.keys(), default="params")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--codec-only", action="store_true")
+    args = parser.parse_args()
+
+    bench_codec(args.iterations)
+    if args.codec_only:
+        return
+    for channel_type in ChannelType:
+        asyncio.run(bench_channel(channel_type, args.query, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measures the cold start of a GreenfieldClient, from the import of the SDK to the answer of its first request,
+each run in a fresh interpreter. It reads the NetworkConfiguration from the environment (or `.env`):
+
+    export host=https://... port=443 chain_id=5600
+    python benchmarks/bench_cold_start.py --runs 5 --request balance
+
+`--sync-account` also queries the account in `async_init`, as done when the sequence and account number are not
+given to the client.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+REQUESTS = {
+    "balance": "await client.account.get_account_balance(address)",
+    "block_height": "await client.basic.get_latest_block_height()",
+    "sps": "await client.storage_provider.list_storage_providers()",
+}
+
+COLD_START = """
+import asyncio, json, time
+start = time.perf_counter()
+
+from greenfield_python_sdk import GreenfieldClient, KeyManager, NetworkConfiguration
+
+
+async def main():
+    key_manager = KeyManager()
+    address = key_manager.address
+    kwargs = {{}} if {sync_account} else {{"account_number": 0, "sequence": 0}}
+    async with GreenfieldClient(key_manager, NetworkConfiguration(), **kwargs) as client:
+        entered = time.perf_counter()
+        await client.async_init()
+        {request}
+        done = time.perf_counter()
+    print(json.dumps({{"enter": entered - start, "first_request": done - start}}))
+
+
+asyncio.run(main())
+"""
+
+
+def cold_start(request: str, sync_account: bool) -> dict:
+    script = COLD_START.format(request=REQUESTS[request], sync_account=sync_account)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--request", choices=REQUESTS.keys(), default="balance")
+    parser.add_argument("--sync-account", action="store_true")
+    args = parser.parse_args()
+
+    results = [cold_start(args.request, args.sync_account) for _ in range(args.runs)]
+    for key in ("enter", "first_request"):
+        values = [result[key] for result in results]
+        print(f"{key:>13}: median {statistics.median(values) * 1000:8.1f} ms | min {min(values) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Measures the import time of the SDK entry points, each one in a fresh interpreter, and the modules they load:
+
+    python benchmarks/bench_import.py --runs 10
+
+`--profile` prints the slowest imports of an entry point, as reported by `python -X importtime`.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = {
+    "package": "import greenfield_python_sdk",
+    "greenfield_client": "from greenfield_python_sdk import GreenfieldClient",
+    "blockchain_client": "from greenfield_python_sdk import BlockchainClient",
+    "key_manager": "from greenfield_python_sdk import KeyManager",
+    "all_protos": (
+        "import greenfield_python_sdk.protos.greenfield.storage, greenfield_python_sdk.protos.cosmos.tx.v1beta1"
+    ),
+}
+
+MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+sdk = [m for m in sys.modules if m.startswith("greenfield_python_sdk")]
+protos = [m for m in sdk if m.startswith("greenfield_python_sdk.protos")]
+print(json.dumps({{"elapsed": elapsed, "sdk": len(sdk), "protos": len(protos), "modules": len(sys.modules)}}))
+"""
+
+
+def measure(statement: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE.format(statement=statement)], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def profile(statement: str, top: int):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        rows.append((int(cumulative_us), int(self_us), name))
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:9.1f} ms {self_us / 1000:9.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", choices=ENTRY_POINTS.keys(), default=None)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.profile:
+        profile(ENTRY_POINTS[args.profile], args.top)
+        return
+
+    for name, statement in ENTRY_POINTS.items():
+        results = [measure(statement) for _ in range(args.runs)]
+        elapsed = [result["elapsed"] for result in results]
+        print(
+            f"{name:>18}: median {statistics.median(elapsed) * 1000:8.1f} ms | min {min(elapsed) * 1000:8.1f} ms | "
+            f"{results[0]['sdk']:4d} sdk modules | {results[0]['protos']:3d} protos | "
+            f"{results[0]['modules']:5d} modules"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measures the throughput of the expect_checksums computation of an object, by the Python engine from memory and
+streamed from a file, and by the Go engine when its shared library is built. It runs offline:
+
+    python benchmarks/bench_integrity_hash.py --size-mb 256 --data-shards 4 --parity-shards 2
+
+The checksums of both engines are compared when the Go library is found.
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import pathlib
+import tempfile
+import time
+
+from greenfield_python_sdk.storage_provider.integrity import compute_integrity_hash, compute_integrity_hash_stream
+from greenfield_python_sdk.storage_provider.utils import compute_integrity_hash_go, getDirPath
+
+
+def bench(name: str, compute, content: bytes, runs: int):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        checksums = compute(io.BytesIO(content))
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>7}: {len(content) / best / 2**20:8.1f} MB/s | {best * 1000:8.1f} ms")
+    return checksums
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--segment-mb", type=int, default=16)
+    parser.add_argument("--data-shards", type=int, default=4)
+    parser.add_argument("--parity-shards", type=int, default=2)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    content = os.urandom(args.size_mb * 2**20)
+    segment_size = args.segment_mb * 2**20
+    shards = (args.data_shards, args.parity_shards)
+
+    python = bench("python", lambda reader: compute_integrity_hash(reader, segment_size, *shards), content, args.runs)
+
+    # Read from the disk one segment at a time, the hashing of a segment overlapping the read of the next one
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory) / "object"
+        path.write_bytes(content)
+
+        def stream(_):
+            return asyncio.run(compute_integrity_hash_stream(path, segment_size, *shards))
+
+        assert bench("stream", stream, content, args.runs) == python
+
+    if not os.path.exists(getDirPath()):
+        print("     go: the shared library is not built")
+        return
+    go = bench(
+        "go", lambda reader: compute_integrity_hash_go(reader, segment_size, *shards, "false"), content, args.runs
+    )
+    print(f"same checksums: {python == go}")
+
+
+if __name__ == "__main__":
+    main()
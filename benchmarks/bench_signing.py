@@ -0,0 +1,91 @@
+"""Compares the EIP-712 signing of a tx from the dict conversion of its messages with the direct encoding of the
+proto messages. It runs offline:
+
+    python benchmarks/bench_signing.py --iterations 2000 --messages 1
+"""
+
+import argparse
+import asyncio
+import base64
+import time
+
+from greenfield_python_sdk import BlockchainClient, KeyManager, NetworkConfiguration
+from greenfield_python_sdk.models.eip712_messages.bank.msg_send import TYPE_URL as SEND
+from greenfield_python_sdk.models.eip712_messages.storage.bucket_url import CREATE_BUCKET
+from greenfield_python_sdk.models.transaction import BroadcastOption
+from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import MsgSend
+from greenfield_python_sdk.protos.cosmos.base.v1beta1 import Coin
+from greenfield_python_sdk.protos.greenfield.common import Approval
+from greenfield_python_sdk.protos.greenfield.storage import MsgCreateBucket
+from greenfield_python_sdk.utils.sign_utils import get_signatures
+
+ADDRESS = "0x" + "11" * 20
+CHAIN_ID = 5600
+
+MESSAGES = {
+    "send": (
+        lambda: MsgSend(from_address=ADDRESS, to_address="0x" + "22" * 20, amount=[Coin(denom="BNB", amount="1")]),
+        SEND,
+        None,
+    ),
+    "bucket": (
+        lambda: MsgCreateBucket(
+            creator=ADDRESS,
+            bucket_name="bench",
+            payment_address=ADDRESS,
+            primary_sp_address=ADDRESS,
+            primary_sp_approval=Approval(
+                expired_height=10, global_virtual_group_family_id=1, sig=base64.b64encode(b"sig")
+            ),
+        ),
+        CREATE_BUCKET,
+        BroadcastOption(sp_signature=base64.b64encode(b"sig").decode()),
+    ),
+}
+
+
+async def bench_message(name: str, messages: int, iterations: int):
+    key_manager = KeyManager(private_key="ab" * 32)
+    key_manager.account.account_number = 1
+    key_manager.account.next_sequence = 1
+    configuration = NetworkConfiguration(host="http://localhost", port=26750, chain_id=CHAIN_ID)
+    new_message, type_url, broadcast_option = MESSAGES[name]
+
+    async with BlockchainClient(configuration, key_manager=key_manager) as client:
+        message = [new_message() for _ in range(messages)]
+        tx = await client.build_tx(message, [type_url] * messages)
+
+        signatures = {}
+        for direct_encoding in (False, True):
+            # Warm up the compiled schema
+            signature = await get_signatures(
+                key_manager, tx, message, CHAIN_ID, broadcast_option, direct_encoding=direct_encoding
+            )
+            signatures[direct_encoding] = signature
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await get_signatures(
+                    key_manager, tx, message, CHAIN_ID, broadcast_option, direct_encoding=direct_encoding
+                )
+            elapsed = time.perf_counter() - start
+
+            path = "direct" if direct_encoding else "dict"
+            print(f"{name} x{messages} {path:>6}: {iterations / elapsed:9.1f} signs/s")
+
+        assert signatures[False] == signatures[True], "The signatures differ"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--message", choices=MESSAGES.keys(), default=None)
+    parser.add_argument("--messages", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=1000)
+    args = parser.parse_args()
+
+    for name in [args.message] if args.message else MESSAGES:
+        asyncio.run(bench_message(name, args.messages, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
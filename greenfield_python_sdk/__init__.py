@@ -1,22 +1,55 @@
+import importlib
 import warnings
+from typing import TYPE_CHECKING
 
-from greenfield_python_sdk.blockchain_client import BlockchainClient
-from greenfield_python_sdk.config import (
-    NetworkConfiguration,
-    NetworkLocalnet,
-    NetworkMainnet,
-    NetworkTestnet,
-    get_account_configuration,
-)
-from greenfield_python_sdk.greenfield_client import GreenfieldClient
-from greenfield_python_sdk.key_manager import BLSKeyManager, KeyManager
+if TYPE_CHECKING:
+    from greenfield_python_sdk.blockchain_client import BlockchainClient
+    from greenfield_python_sdk.config import (
+        ChannelType,
+        NetworkConfiguration,
+        NetworkLocalnet,
+        NetworkMainnet,
+        NetworkTestnet,
+        get_account_configuration,
+    )
+    from greenfield_python_sdk.greenfield_client import GreenfieldClient
+    from greenfield_python_sdk.key_manager import BLSKeyManager, KeyManager
 
 warnings.filterwarnings("ignore")
 
+# The clients pull in the generated protos, they are only imported on first access
+_LAZY_IMPORTS = {
+    "BlockchainClient": "greenfield_python_sdk.blockchain_client",
+    "GreenfieldClient": "greenfield_python_sdk.greenfield_client",
+    "NetworkConfiguration": "greenfield_python_sdk.config",
+    "ChannelType": "greenfield_python_sdk.config",
+    "KeyManager": "greenfield_python_sdk.key_manager",
+    "BLSKeyManager": "greenfield_python_sdk.key_manager",
+    "NetworkMainnet": "greenfield_python_sdk.config",
+    "NetworkTestnet": "greenfield_python_sdk.config",
+    "NetworkLocalnet": "greenfield_python_sdk.config",
+    "get_account_configuration": "greenfield_python_sdk.config",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
+
 __all__ = [
     "BlockchainClient",
     "GreenfieldClient",
     "NetworkConfiguration",
+    "ChannelType",
     "KeyManager",
     "BLSKeyManager",
     "NetworkMainnet",
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from grpclib.client import Channel
 
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache, cached_params
 from greenfield_python_sdk.protos.cosmos.auth.v1beta1 import (
     AddressBytesToStringRequest,
     AddressBytesToStringResponse,
@@ -22,9 +25,11 @@ from greenfield_python_sdk.protos.cosmos.auth.v1beta1 import (
 
 
 class Auth:
-    def __init__(self, channel: Channel):
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
         self.query_stub = QueryStub(channel)
+        self.params_cache = params_cache
 
+    @cached_params("auth")
     async def get_params(self) -> QueryParamsResponse:
         request = QueryParamsRequest()
         response = await self.query_stub.params(request)
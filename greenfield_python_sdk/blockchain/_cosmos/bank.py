@@ -1,5 +1,8 @@
+from typing import Optional
+
 from grpclib.client import Channel
 
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache, cached_params
 from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import (
     QueryAllBalancesRequest,
     QueryAllBalancesResponse,
@@ -24,8 +27,9 @@ from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import (
 
 
 class Bank:
-    def __init__(self, channel: Channel):
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
         self.query_stub = QueryStub(channel)
+        self.params_cache = params_cache
 
     async def get_balance(self, request: QueryBalanceRequest) -> QueryBalanceResponse:
         response = await self.query_stub.balance(request)
@@ -49,6 +53,7 @@ class Bank:
         response = await self.query_stub.supply_of(request)
         return response
 
+    @cached_params("bank")
     async def get_params(self) -> QueryParamsResponse:
         request = QueryParamsRequest()
         response = await self.query_stub.params(request)
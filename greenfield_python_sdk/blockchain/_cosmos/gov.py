@@ -1,5 +1,8 @@
+from typing import Optional
+
 from grpclib.client import Channel
 
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache, cached_params
 from greenfield_python_sdk.protos.cosmos.gov.v1 import (
     QueryDepositRequest,
     QueryDepositResponse,
@@ -22,8 +25,9 @@ from greenfield_python_sdk.protos.cosmos.gov.v1 import (
 
 
 class Gov:
-    def __init__(self, channel: Channel):
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
         self.query_stub = QueryStub(channel)
+        self.params_cache = params_cache
 
     async def get_proposal(self, query_proposal_request: QueryProposalRequest) -> QueryProposalResponse:
         response = await self.query_stub.proposal(query_proposal_request)
@@ -41,6 +45,7 @@ class Gov:
         response = await self.query_stub.votes(request)
         return response
 
+    @cached_params("gov")
     async def get_params(self, request: QueryParamsRequest) -> QueryParamsResponse:
         response = await self.query_stub.params(request)
         return response
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from grpclib.client import Channel
 
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache, cached_params
 from greenfield_python_sdk.protos.cosmos.params.v1beta1 import (
     QueryParamsRequest,
     QueryParamsResponse,
@@ -10,9 +13,11 @@ from greenfield_python_sdk.protos.cosmos.params.v1beta1 import (
 
 
 class Params:
-    def __init__(self, channel: Channel):
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
         self.query_stub = QueryStub(channel)
+        self.params_cache = params_cache
 
+    @cached_params("params")
     async def get_params(self, request: QueryParamsRequest) -> QueryParamsResponse:
         response = await self.query_stub.params(request)
         return response
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from grpclib.client import Channel
 
 from greenfield_python_sdk.blockchain._cosmos import (
@@ -17,22 +19,23 @@ from greenfield_python_sdk.blockchain._cosmos import (
     tx,
     upgrade,
 )
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache
 
 
 class Cosmos:
-    def __init__(self, channel: Channel):
-        self.auth = auth.Auth(channel)
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
+        self.auth = auth.Auth(channel, params_cache)
         self.authz = authz.Authz(channel)
-        self.bank = bank.Bank(channel)
-        self.crosschain = crosschain.Crosschain(channel)
+        self.bank = bank.Bank(channel, params_cache)
+        self.crosschain = crosschain.Crosschain(channel, params_cache)
         self.distribution = distribution.Distribution(channel)
         self.evidence = evidence.Evidence(channel)
         self.feegrant = feegrant.FeeGrant(channel)
-        self.gov = gov.Gov(channel)
-        self.mint = mint.Mint(channel)
-        self.params = params.Params(channel)
-        self.slashing = slashing.Slashing(channel)
-        self.staking = staking.Staking(channel)
-        self.oracle = oracle.Oracle(channel)
+        self.gov = gov.Gov(channel, params_cache)
+        self.mint = mint.Mint(channel, params_cache)
+        self.params = params.Params(channel, params_cache)
+        self.slashing = slashing.Slashing(channel, params_cache)
+        self.staking = staking.Staking(channel, params_cache)
+        self.oracle = oracle.Oracle(channel, params_cache)
         self.tx = tx.Tx(channel)
         self.upgrade = upgrade.Upgrade(channel)
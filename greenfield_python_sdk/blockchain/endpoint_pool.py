@@ -0,0 +1,168 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+import aiohttp
+
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.models.const import (
+    DEFAULT_EJECTION_TIME,
+    DEFAULT_HEALTH_CHECK_INTERVAL,
+    DEFAULT_MAX_ENDPOINT_FAILURES,
+    DEFAULT_MAX_HEIGHT_LAG,
+)
+from greenfield_python_sdk.utils.retry import RetryableError
+
+T = TypeVar("T")
+
+# Errors meaning the node could not answer, as opposed to an answer carrying an error
+ENDPOINT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, RetryableError)
+
+
+class Endpoint:
+    def __init__(self, url: str, ewma_alpha: float = 0.3):
+        self.url = url
+        self.ewma_alpha = ewma_alpha
+        self.latency = 0.0  # EWMA in seconds, 0 until the first answer
+        self.in_flight = 0
+        self.failures = 0
+        self.latest_height = 0
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    @property
+    def score(self) -> float:
+        # Unknown nodes count as 1ms so they are tried first while the in-flight requests still spread the load
+        return max(self.latency, 0.001) * (self.in_flight + 1)
+
+    def record_success(self, latency: float):
+        self.failures = 0
+        if self.latency == 0.0:
+            self.latency = latency
+        else:
+            self.latency = self.ewma_alpha * latency + (1 - self.ewma_alpha) * self.latency
+
+    def eject(self, duration: float):
+        self.ejected_until = time.monotonic() + duration
+
+    def readmit(self):
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self):
+        return f"Endpoint({self.url!r}, latency={self.latency:.3f}, in_flight={self.in_flight}, healthy={self.healthy})"
+
+
+class EndpointPool:
+    """Spreads the requests over several fullnode RPC endpoints.
+
+    Queries go to the healthy endpoint with the lowest latency EWMA weighted by its in-flight requests, and fail
+    over to the next one when a node does not answer. Nodes failing `max_failures` requests in a row, or reported
+    as catching up or lagging more than `max_height_lag` blocks by the health check, are ejected for
+    `ejection_time` seconds. Broadcasts stick to a single node to keep the mempool sequence ordering.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        transport: RpcTransport,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        ejection_time: float = DEFAULT_EJECTION_TIME,
+        max_failures: int = DEFAULT_MAX_ENDPOINT_FAILURES,
+        max_height_lag: int = DEFAULT_MAX_HEIGHT_LAG,
+    ):
+        if not urls:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints: List[Endpoint] = [Endpoint(url) for url in dict.fromkeys(urls)]
+        self.transport = transport
+        self.health_check_interval = health_check_interval
+        self.ejection_time = ejection_time
+        self.max_failures = max_failures
+        self.max_height_lag = max_height_lag
+        self._broadcast_endpoint: Optional[Endpoint] = None
+        self._health_check: Optional[asyncio.Task] = None
+
+    def pick(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+        if not candidates:
+            return None
+        # With every node ejected it is still better to try one than to fail straight away
+        healthy = [endpoint for endpoint in candidates if endpoint.healthy]
+        return min(healthy or candidates, key=lambda endpoint: endpoint.score)
+
+    @property
+    def broadcast_endpoint(self) -> Endpoint:
+        if self._broadcast_endpoint is None or not self._broadcast_endpoint.healthy:
+            self._broadcast_endpoint = self.pick()
+        return self._broadcast_endpoint
+
+    async def run(self, call: Callable[[str], Awaitable[T]], failover: bool = True) -> T:
+        """Runs `call(base_url)` against the best endpoint, and against the others in turn when it fails and
+        `failover` is set. Only idempotent calls should fail over."""
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self.pick(exclude=tried)
+            tried.append(endpoint)
+            try:
+                return await self.send(endpoint, call)
+            except ENDPOINT_ERRORS:
+                if not failover or len(tried) == len(self.endpoints):
+                    raise
+
+    async def send(self, endpoint: Endpoint, call: Callable[[str], Awaitable[T]]) -> T:
+        endpoint.in_flight += 1
+        start = time.perf_counter()
+        try:
+            result = await call(endpoint.url)
+        except ENDPOINT_ERRORS:
+            endpoint.failures += 1
+            if endpoint.failures >= self.max_failures:
+                endpoint.eject(self.ejection_time)
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        endpoint.record_success(time.perf_counter() - start)
+        return result
+
+    async def check_health(self):
+        results = await asyncio.gather(
+            *[self.transport.get("/status", base_url=endpoint.url) for endpoint in self.endpoints],
+            return_exceptions=True,
+        )
+        sync_infos = {}
+        for endpoint, result in zip(self.endpoints, results):
+            try:
+                sync_infos[endpoint.url] = result["result"]["sync_info"]
+                endpoint.latest_height = int(sync_infos[endpoint.url]["latest_block_height"])
+            except Exception:
+                continue
+
+        best_height = max((endpoint.latest_height for endpoint in self.endpoints), default=0)
+        for endpoint in self.endpoints:
+            sync_info = sync_infos.get(endpoint.url)
+            if (
+                sync_info is None
+                or sync_info["catching_up"]
+                or best_height - endpoint.latest_height > self.max_height_lag
+            ):
+                endpoint.eject(self.ejection_time)
+            else:
+                endpoint.readmit()
+
+    def start(self):
+        if len(self.endpoints) > 1 and self._health_check is None:
+            self._health_check = asyncio.ensure_future(self._health_check_loop())
+
+    async def _health_check_loop(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_check_interval)
+
+    async def close(self):
+        if self._health_check is not None:
+            self._health_check.cancel()
+            await asyncio.gather(self._health_check, return_exceptions=True)
+            self._health_check = None
@@ -0,0 +1,75 @@
+import math
+import time
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+from greenfield_python_sdk.models.const import DEFAULT_GAS_MULTIPLIER, DEFAULT_GAS_PROFILE_TTL
+
+# Stands for the EIP-712 signature (r, s, v) while the tx is simulated, the chain doesn't verify it then
+PLACEHOLDER_SIGNATURE = bytes(65)
+
+
+class GasProfile(NamedTuple):
+    gas_used: int
+    gas_price: int
+
+
+class GasEstimator:
+    """Gas used by the txs, keyed by the type urls of their messages.
+
+    The gas of a Greenfield message mostly depends on its type, so once a kind of tx is simulated its following
+    txs reuse the gas observed, with a `multiplier` as safety margin, and are built without any simulation. The
+    profiles expire after `ttl` seconds, as governance may change the gas params, and are dropped when a tx
+    built from them runs out of gas. A tx built without simulation only fails once broadcast, in CheckTx or on
+    chain, so the `BlockchainClient` uses the profiles only when given an estimator with `cache` on.
+
+    `placeholder_signature` simulates the txs with `PLACEHOLDER_SIGNATURE` instead of signing them twice.
+    """
+
+    def __init__(
+        self,
+        multiplier: float = DEFAULT_GAS_MULTIPLIER,
+        ttl: float = DEFAULT_GAS_PROFILE_TTL,
+        cache: bool = True,
+        placeholder_signature: bool = True,
+    ):
+        self.multiplier = multiplier
+        self.ttl = ttl
+        self.cache = cache
+        self.placeholder_signature = placeholder_signature
+        self.hits = 0
+        self.misses = 0
+        self._profiles: Dict[Tuple[str, ...], Tuple[GasProfile, float]] = {}
+
+    def get(self, type_urls: Sequence[str]) -> Optional[GasProfile]:
+        entry = self._profiles.get(tuple(type_urls)) if self.cache else None
+        if entry is None or time.monotonic() >= entry[1]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def record(self, type_urls: Sequence[str], gas_used: int, gas_price: int):
+        if not self.cache:
+            return
+        key = tuple(type_urls)
+        entry = self._profiles.get(key)
+        # Keeps the highest gas seen, the messages of a type don't all cost the same
+        if entry is not None and time.monotonic() < entry[1]:
+            gas_used = max(gas_used, entry[0].gas_used)
+        self._profiles[key] = (GasProfile(gas_used, gas_price), time.monotonic() + self.ttl)
+
+    def invalidate(self, type_urls: Optional[Sequence[str]] = None):
+        if type_urls is None:
+            self._profiles.clear()
+        else:
+            self._profiles.pop(tuple(type_urls), None)
+
+    def gas_limit(self, profile: GasProfile) -> int:
+        return math.ceil(profile.gas_used * self.multiplier)
+
+    def __contains__(self, type_urls: Sequence[str]) -> bool:
+        entry = self._profiles.get(tuple(type_urls))
+        return entry is not None and time.monotonic() < entry[1]
+
+    def __len__(self):
+        return len(self._profiles)
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+from greenfield_python_sdk.blockchain.endpoint_pool import EndpointPool
+from greenfield_python_sdk.models.const import (
+    DEFAULT_HEDGE_MAX_DELAY,
+    DEFAULT_HEDGE_MIN_DELAY,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_MAX_HEDGE_RATIO,
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    hedge_won: int = 0  # The duplicate answered first
+
+    @property
+    def hedge_win_rate(self) -> float:
+        return self.hedge_won / self.hedged if self.hedged else 0.0
+
+
+class HedgingPolicy:
+    """Sends a duplicate of a slow read-only query to a second endpoint and keeps whichever answers first.
+
+    The hedge fires once the query has been pending longer than the `percentile` latency of the last `window`
+    answers for the same route, clamped between `min_delay` and `max_delay`. Hedges are capped at `max_hedge_ratio`
+    of the queries so a slow network is not made worse by doubling its traffic.
+
+    By default every `Query` service route is hedged, `routes` restricts the policy to the given ones,
+    i.e. {"/greenfield.storage.Query/HeadBucket", "/greenfield.storage.Query/HeadObject"}.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        max_delay: float = DEFAULT_HEDGE_MAX_DELAY,
+        max_hedge_ratio: float = DEFAULT_MAX_HEDGE_RATIO,
+        window: int = 100,
+        min_samples: int = 10,
+        routes: Optional[Set[str]] = None,
+    ):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.window = window
+        self.min_samples = min_samples
+        self.routes = routes
+        self.metrics: Dict[str, HedgeStats] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._requests = 0
+        self._hedges = 0
+
+    def is_hedgeable(self, route: str) -> bool:
+        if self.routes is not None:
+            return route in self.routes
+        return ".Query/" in route
+
+    def delay(self, route: str) -> float:
+        latencies = self._latencies.get(route)
+        if not latencies or len(latencies) < self.min_samples:
+            return self.max_delay
+        ordered = sorted(latencies)
+        value = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+        return min(self.max_delay, max(self.min_delay, value))
+
+    def _record(self, route: str, latency: float):
+        self._latencies.setdefault(route, deque(maxlen=self.window)).append(latency)
+
+    def _can_hedge(self) -> bool:
+        return self._hedges < self.max_hedge_ratio * self._requests
+
+    async def run(self, pool: EndpointPool, route: str, call: Callable[[str], Awaitable[T]]) -> T:
+        stats = self.metrics.setdefault(route, HedgeStats())
+        stats.requests += 1
+        self._requests += 1
+
+        primary = pool.pick()
+        first = asyncio.ensure_future(pool.send(primary, call))
+        # The latency of an answer is measured from the start of its own attempt, without the hedge delay
+        started = {first: time.perf_counter()}
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.delay(route))
+
+            secondary = pool.pick(exclude=[primary])
+            failed = bool(done) and first.exception() is not None
+            if (done and not failed) or secondary is None or not (failed or self._can_hedge()):
+                result = await first
+                self._record(route, time.perf_counter() - started[first])
+                return result
+
+            if not failed:
+                stats.hedged += 1
+                self._hedges += 1
+            # Otherwise failing over rather than hedging, it does not count against the hedge budget
+            hedge = asyncio.ensure_future(pool.send(secondary, call))
+            started[hedge] = time.perf_counter()
+            pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                answered = [task for task in done if task.exception() is None]
+                if answered or not pending:
+                    task = (answered or list(done))[0]
+                    if task is hedge and not failed:
+                        stats.hedge_won += 1
+                    result = task.result()
+                    self._record(route, time.perf_counter() - started[task])
+                    return result
+        finally:
+            # Also when the caller is cancelled, no attempt is left running
+            for task in pending:
+                task.cancel()
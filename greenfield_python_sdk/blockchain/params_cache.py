@@ -0,0 +1,114 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from greenfield_python_sdk.blockchain.subscription import PROPOSAL_PASSED_QUERY, EventSubscriber, SubscriptionClosed
+from greenfield_python_sdk.blockchain.utils import SingleFlight, _query_height
+from greenfield_python_sdk.models.const import DEFAULT_PARAMS_TTL, DEFAULT_RESUBSCRIBE_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+class ParamsCache:
+    """Params of the chain modules, keyed by module.
+
+    The params only change through governance, so they are kept for `ttl` seconds and dropped as soon as the
+    subscriber reports a block executing a passed proposal. The watch starts with the first cached entry. When the
+    socket of the watch drops every entry is dropped, a proposal may have passed meanwhile. When the subscription
+    can't be made at all the entries are kept, the TTL still applies, and it is tried again after a growing delay.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_PARAMS_TTL,
+        subscriber: Optional[EventSubscriber] = None,
+        resubscribe_delay: float = DEFAULT_RESUBSCRIBE_DELAY,
+    ):
+        self.ttl = ttl
+        self.subscriber = subscriber
+        self.resubscribe_delay = resubscribe_delay
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._single_flight = SingleFlight()
+        self._watcher: Optional[asyncio.Task] = None
+        self._failed_subscriptions = 0
+        self._resubscribe_at = 0.0
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Synchronous read of the cached params, None when they are missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry[1]:
+            return None
+        return entry[0]
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        params = self.peek(key)
+        if params is None:
+            params = await self._single_flight.do(key, lambda: self._fill(key, fetch))
+        return params
+
+    async def _fill(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        params = await fetch()
+        self._entries[key] = (params, time.monotonic() + self.ttl)
+        self._watch()
+        return params
+
+    def invalidate(self, module: Optional[str] = None):
+        """Drops the params of a module, or of every module."""
+        if module is None:
+            self._entries.clear()
+            return
+        for key in list(self._entries):
+            if key == module or (isinstance(key, tuple) and key[0] == module):
+                del self._entries[key]
+
+    def _watch(self):
+        if self.subscriber is None or self._watcher is not None or time.monotonic() < self._resubscribe_at:
+            return
+        self._watcher = asyncio.ensure_future(self._watch_proposals())
+
+    async def _watch_proposals(self):
+        try:
+            async for _ in self.subscriber.subscribe(PROPOSAL_PASSED_QUERY):
+                self._failed_subscriptions = 0
+                self.invalidate()
+        except SubscriptionClosed as e:
+            logger.debug(f"Stopped watching the param changes: {e}")
+            # A proposal may have passed while the socket was down
+            self._failed_subscriptions = 0
+            self.invalidate()
+        except Exception as e:
+            # Nothing was watched, the entries are as fresh as their TTL
+            delay = min(self.resubscribe_delay * 2 ** min(self._failed_subscriptions, 16), self.ttl)
+            self._failed_subscriptions += 1
+            self._resubscribe_at = time.monotonic() + delay
+            logger.debug(f"Could not watch the param changes, trying again in {delay}s: {e}")
+        finally:
+            self._watcher = None
+
+    async def close(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+
+
+def cached_params(module: str):
+    """Serves a `get_params` query wrapper from the `params_cache` of its facade.
+
+    The request, if any, is part of the key. Queries pinned to a height bypass the cache.
+    """
+
+    def decorator(get_params):
+        @functools.wraps(get_params)
+        async def wrapper(self, *args, **kwargs):
+            params_cache = getattr(self, "params_cache", None)
+            if params_cache is None or kwargs or _query_height.get() is not None:
+                return await get_params(self, *args, **kwargs)
+            key = (module, *(bytes(request) for request in args)) if args else module
+            return await params_cache.get(key, lambda: get_params(self, *args))
+
+        return wrapper
+
+    return decorator
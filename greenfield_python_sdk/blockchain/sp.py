@@ -1,6 +1,9 @@
+from typing import Optional
+
 from betterproto import Casing
 from grpclib.client import Channel
 
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache, cached_params
 from greenfield_python_sdk.protos.greenfield.sp import (
     QueryGlobalSpStorePriceByTimeRequest,
     QueryGlobalSpStorePriceByTimeResponse,
@@ -19,9 +22,11 @@ from greenfield_python_sdk.protos.greenfield.sp import (
 
 
 class Sp:
-    def __init__(self, channel: Channel):
+    def __init__(self, channel: Channel, params_cache: Optional[ParamsCache] = None):
         self.query_stub = QueryStub(channel)
+        self.params_cache = params_cache
 
+    @cached_params("sp")
     async def get_params(self) -> QueryParamsResponse:
         request = QueryParamsRequest()
         response = await self.query_stub.params(request)
@@ -0,0 +1,201 @@
+import asyncio
+import heapq
+import itertools
+import json
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.models.const import DEFAULT_WEBSOCKET_HEARTBEAT
+
+# NewBlockHeader is published together with NewBlock, without carrying the whole block
+NEW_BLOCK_HEADER_QUERY = "tm.event='NewBlockHeader'"
+TX_QUERY = "tm.event='Tx'"
+# Blocks executing a passed governance proposal, the only way module params change
+PROPOSAL_PASSED_QUERY = "tm.event='NewBlock' AND active_proposal.proposal_result='proposal_passed'"
+
+
+def websocket_url(base_url: str) -> str:
+    if base_url.startswith("https://"):
+        return "wss://" + base_url[len("https://") :] + "/websocket"
+    if base_url.startswith("http://"):
+        return "ws://" + base_url[len("http://") :] + "/websocket"
+    return base_url + "/websocket"
+
+
+class SubscriptionClosed(ConnectionError):
+    """The socket of an established subscription dropped, the events published meanwhile are lost."""
+
+
+class EventSubscriber:
+    """Tendermint `/websocket` subscription manager.
+
+    Every waiter and subscription is multiplexed over a single socket, opened on first use. When the socket drops,
+    the pending waiters fail with a `SubscriptionClosed` error, a `ConnectionError`, so the callers can fall back to
+    polling, and the next call reconnects.
+    """
+
+    def __init__(self, transport: RpcTransport, heartbeat: float = DEFAULT_WEBSOCKET_HEARTBEAT):
+        self.transport = transport
+        self.url = websocket_url(transport.base_url)
+        self.heartbeat = heartbeat
+        self.latest_height = 0
+
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._ids = itertools.count(1)
+        self._acks: Dict[int, asyncio.Future] = {}
+        self._subscribed: Set[str] = set()
+        self._queues: Dict[str, List[asyncio.Queue]] = {}
+        self._block_waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._tx_waiters: Dict[str, List[asyncio.Future]] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    async def wait_for_block_height(self, height: int) -> int:
+        """Resolves with the height of the first block at or above `height`."""
+        await self._ensure_subscription(NEW_BLOCK_HEADER_QUERY)
+        if self.latest_height >= height:
+            return self.latest_height
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._block_waiters, (height, id(waiter), waiter))
+        return await waiter
+
+    async def tx_waiter(self, tx_hash: str) -> asyncio.Future:
+        """Returns a future resolved with the TxResult of the transaction once it is committed.
+
+        The subscription is active when this returns, so a transaction committed afterwards can not be missed.
+        """
+        await self._ensure_subscription(TX_QUERY)
+        tx_hash = tx_hash.upper()
+        waiter = asyncio.get_running_loop().create_future()
+        self._tx_waiters.setdefault(tx_hash, []).append(waiter)
+        waiter.add_done_callback(lambda future: self._discard_tx_waiter(tx_hash, future))
+        return waiter
+
+    async def subscribe(self, query: str) -> AsyncIterator[dict]:
+        """Yields the events matching a Tendermint query, i.e. "tm.event='Tx' AND message.sender='0x...'"."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.setdefault(query, []).append(queue)
+        try:
+            await self._ensure_subscription(query)
+            while True:
+                event = await queue.get()
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            self._queues[query].remove(queue)
+            if not self._queues[query]:
+                del self._queues[query]
+                await self._unsubscribe(query)
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    async def _ensure_subscription(self, query: str):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self.connected:
+                self._ws = await self.transport.session.ws_connect(self.url, heartbeat=self.heartbeat)
+                self._reader = asyncio.ensure_future(self._read(self._ws))
+            if query not in self._subscribed:
+                await self._request("subscribe", query)
+                self._subscribed.add(query)
+
+    async def _unsubscribe(self, query: str):
+        if query in (NEW_BLOCK_HEADER_QUERY, TX_QUERY) or query not in self._subscribed:
+            return
+        self._subscribed.discard(query)
+        if self.connected:
+            await self._request("unsubscribe", query)
+
+    async def _request(self, method: str, query: str):
+        request_id = next(self._ids)
+        ack = asyncio.get_running_loop().create_future()
+        self._acks[request_id] = ack
+        await self._ws.send_json({"jsonrpc": "2.0", "method": method, "id": request_id, "params": {"query": query}})
+        await ack
+
+    async def _read(self, ws: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self._dispatch(json.loads(message.data))
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        finally:
+            self._disconnect(ws)
+
+    def _dispatch(self, message: dict):
+        ack = self._acks.pop(message.get("id"), None)
+        if "error" in message:
+            if ack is not None and not ack.done():
+                ack.set_exception(Exception(message["error"]))
+            return
+
+        result = message.get("result") or {}
+        query = result.get("query")
+        if query is None:
+            if ack is not None and not ack.done():
+                ack.set_result(None)
+            return
+
+        if query == NEW_BLOCK_HEADER_QUERY:
+            self._on_block(result)
+        elif query == TX_QUERY:
+            self._on_tx(result)
+        for queue in self._queues.get(query, []):
+            queue.put_nowait(result)
+
+    def _on_block(self, result: dict):
+        height = int(result["data"]["value"]["header"]["height"])
+        self.latest_height = max(self.latest_height, height)
+        while self._block_waiters and self._block_waiters[0][0] <= height:
+            _, _, waiter = heapq.heappop(self._block_waiters)
+            if not waiter.done():
+                waiter.set_result(height)
+
+    def _on_tx(self, result: dict):
+        for tx_hash in result.get("events", {}).get("tx.hash", []):
+            for waiter in self._tx_waiters.pop(tx_hash.upper(), []):
+                if not waiter.done():
+                    waiter.set_result(result["data"]["value"]["TxResult"])
+
+    def _discard_tx_waiter(self, tx_hash: str, waiter: asyncio.Future):
+        waiters = self._tx_waiters.get(tx_hash)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._tx_waiters[tx_hash]
+
+    def _disconnect(self, ws: aiohttp.ClientWebSocketResponse):
+        if self._ws is not ws:
+            return
+        self._ws = None
+        self._subscribed = set()
+
+        error = SubscriptionClosed("Tendermint websocket connection closed")
+        waiters = list(self._acks.values()) + [waiter for _, _, waiter in self._block_waiters]
+        waiters += [waiter for tx_waiters in self._tx_waiters.values() for waiter in tx_waiters]
+        self._acks, self._block_waiters, self._tx_waiters = {}, [], {}
+        for waiter in waiters:
+            # Cancelled with its owner, or already resolved
+            if waiter.done():
+                continue
+            waiter.set_exception(error)
+            # Marked as retrieved: an owner awaiting it still gets the error, an abandoned one is not logged
+            waiter.exception()
+        for queues in self._queues.values():
+            for queue in queues:
+                queue.put_nowait(error)
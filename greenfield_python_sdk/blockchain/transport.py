@@ -0,0 +1,82 @@
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from greenfield_python_sdk.__version__ import __version__
+from greenfield_python_sdk.models.const import (
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_REQUEST_TIMEOUT,
+)
+from greenfield_python_sdk.utils.retry import RETRYABLE_STATUSES, RetryableError, parse_retry_after
+
+
+class RpcTransport:
+    """HTTP transport shared by every request sent to the fullnode RPC endpoint.
+
+    It owns the connection pool, the default headers and the timeouts, so the ABCI queries, the JSON-RPC
+    helpers and the tx broadcasts all reuse the same warm connections.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = {
+            "Content-Type": "application/json",
+            "User-Agent": f"greenfield-python-sdk/{__version__}",
+            **(headers or {}),
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=self.timeout)
+        return self._session
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        base_url: Optional[str] = None,
+    ) -> Any:
+        url = (base_url or self.base_url) + path
+        async with self.session.get(url, params=params, headers=headers) as response:
+            self._check_status(response)
+            return await response.json()
+
+    async def post(self, payload: Any, headers: Optional[Dict[str, str]] = None, base_url: Optional[str] = None) -> Any:
+        async with self.session.post(base_url or self.base_url, json=payload, headers=headers) as response:
+            self._check_status(response)
+            return await response.json()
+
+    async def json_rpc(self, method: str, params: Dict[str, Any], base_url: Optional[str] = None) -> Any:
+        data = await self.post({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}, base_url=base_url)
+        if "error" in data:
+            raise Exception(data["error"])
+        return data["result"]
+
+    @staticmethod
+    def _check_status(response: aiohttp.ClientResponse):
+        if response.status in RETRYABLE_STATUSES:
+            raise RetryableError(
+                f"Error {response.status} from {response.url.host}",
+                status=response.status,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
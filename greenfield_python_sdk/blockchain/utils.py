@@ -1,15 +1,32 @@
 import asyncio
 import base64
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, TypeVar
 
 import aiohttp
 from betterproto import Message
 
-from greenfield_python_sdk.__version__ import __version__
-from greenfield_python_sdk.protos.cosmos.auth.v1beta1 import BaseAccount, ModuleAccount
-from greenfield_python_sdk.protos.cosmos.crypto.secp256k1 import PubKey
+from greenfield_python_sdk.blockchain.cache import ByteLRUCache
+from greenfield_python_sdk.blockchain.endpoint_pool import EndpointPool
+from greenfield_python_sdk.blockchain.hedging import HedgingPolicy
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.models.const import (
+    BLOCK_HEIGHT_METADATA,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_HEIGHT_CACHE_SIZE,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_MAX_BATCH_SIZE,
+)
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+T = TypeVar("T")
 
 
 async def parse_account(response):
+    from greenfield_python_sdk.protos.cosmos.auth.v1beta1 import BaseAccount
+    from greenfield_python_sdk.protos.cosmos.crypto.secp256k1 import PubKey
+
     account = BaseAccount().parse(data=response.account.value)
     pub_key = PubKey().parse(data=account.pub_key.value)
     account.pub_key = pub_key
@@ -17,6 +34,8 @@ async def parse_account(response):
 
 
 async def parse_module_account(response):
+    from greenfield_python_sdk.protos.cosmos.auth.v1beta1 import ModuleAccount
+
     account = ModuleAccount().parse(data=response.value)
     assert account
     return account
@@ -25,10 +44,25 @@ async def parse_module_account(response):
 async def wait_for_block_height(blockchain_client, height: int) -> int:
     """Waits for the block with the given height to be committed to the blockchain.
 
+    The NewBlockHeader events of the client's websocket subscriber resolve the wait as soon as the block is
+    committed, the latest block is polled instead when the socket is not available.
+
     Args:
         height (int): The height of the block to wait for.
     """
-    current_height = 0
+    latest_block = await blockchain_client.tendermint.get_latest_block()
+    current_height = latest_block.sdk_block.header.height
+    if current_height >= height:
+        return current_height
+
+    subscriber = getattr(blockchain_client, "subscriber", None)
+    if subscriber is not None:
+        try:
+            return await subscriber.wait_for_block_height(height)
+        except Exception:
+            # The socket is unavailable or dropped, fall back to polling
+            pass
+
     while True:
         latest_block = await blockchain_client.tendermint.get_latest_block()
         current_height = latest_block.sdk_block.header.height
@@ -38,55 +72,259 @@ async def wait_for_block_height(blockchain_client, height: int) -> int:
     return current_height
 
 
+def response_value(response: dict) -> Optional[bytes]:
+    if "error" in response:
+        raise Exception(response["error"])
+    if "result" in response:
+        result = response["result"]
+        try:
+            return base64.b64decode(result["response"]["value"])
+        except Exception as e:
+            raise Exception(result["response"]["log"])
+    else:
+        return None
+
+
+def decode_response(response: dict, grpc_response_type, raw_message: Optional[bytes] = None):
+    if raw_message is None:
+        raw_message = response_value(response)
+        if raw_message is None:
+            return None
+    try:
+        return grpc_response_type.FromString(data=raw_message)
+    except Exception as e:
+        raise Exception(response["result"]["response"]["log"]) from e
+
+
 class Stream:
-    def __init__(self, url, path, grpc_request_type, grpc_response_type):
-        self.url = url
+    def __init__(
+        self, channel: "CustomChannel", path, grpc_request_type, grpc_response_type, height: Optional[int] = None
+    ):
+        self.channel = channel
+        self.url = channel.base_url
         self.path = path
         self.grpc_request_type: Message = grpc_request_type
         self.grpc_response_type: Message = grpc_response_type
+        self.height = height
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        try:
-            await self._resp.release()
-        except Exception:
-            pass
+        pass
 
     async def send_message(self, request, end):
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": f"greenfield-python-sdk/{__version__}",
-        }
-        params = {"path": f'"{self.path}"'}
-        endpoint = "/abci_query"
-        if bytes(request):
-            data = "0x" + bytes(request).hex()  # This took me 2h to find out
-            params["data"] = data
-
-        async with aiohttp.ClientSession() as session:
-            self._resp = await session.get(self.url + endpoint, headers=headers, params=params)
-            self.response = await self._resp.json()
+        self.request = bytes(request)
 
     async def recv_message(self):
-        if "error" in self.response:
-            raise Exception(self.response["error"])
-        if "result" in self.response:
-            result = self.response["result"]
-            try:
-                raw_message = base64.b64decode(result["response"]["value"])
-                result = self.grpc_response_type.FromString(data=raw_message)
-                return result
-            except Exception as e:
-                raise Exception(result["response"]["log"])
-        else:
-            return None
+        return await self.channel.unary(self.path, self.request, self.grpc_response_type, height=self.height)
+
+
+class SingleFlight:
+    """Shares a single call between the concurrent callers asking for the same key.
+
+    Only the calls in flight are shared, the key is dropped as soon as the call completes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # A caller giving up must not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
+
+
+# Set while an explicit `CustomChannel.batch()` scope is active
+_batch_scope: ContextVar[bool] = ContextVar("batch_scope", default=False)
+# Height the queries run at inside a `CustomChannel.at_height()` scope
+_query_height: ContextVar[Optional[int]] = ContextVar("query_height", default=None)
+
+
+class QueryBatcher:
+    """Coalesces the ABCI queries submitted in the same event-loop tick into one Tendermint JSON-RPC batch.
+
+    Each query gets back its own JSON-RPC response object, the same payload `/abci_query` answers with.
+    """
+
+    def __init__(self, pool: EndpointPool, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE):
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, bytes, Optional[int], asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, path: str, data: bytes, height: Optional[int] = None) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((path, data, height, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._send(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, pending: List[Tuple[str, bytes, Optional[int], asyncio.Future]]):
+        payload = []
+        for i, (path, data, height, _) in enumerate(pending):
+            params = {"path": path, "data": data.hex()}
+            if height is not None:
+                params["height"] = str(height)
+            payload.append({"jsonrpc": "2.0", "id": i, "method": "abci_query", "params": params})
+        try:
+            response = await self.pool.run(lambda url: self.pool.transport.post(payload, base_url=url))
+            if isinstance(response, dict):
+                # The node rejected the whole batch
+                raise Exception(response.get("error", response))
+            responses: Dict[int, dict] = {item["id"]: item for item in response}
+        except Exception as e:
+            for *_, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (*_, future) in enumerate(pending):
+            if future.done():
+                continue
+            if i in responses:
+                future.set_result(responses[i])
+            else:
+                future.set_exception(Exception(f"Missing response for batched query {i}"))
 
 
 class CustomChannel:
-    def __init__(self, host: str, port: int):
+    """Routes the betterproto gRPC stubs over the Tendermint `/abci_query` endpoint.
+
+    Every `Stream` created by the channel goes through the same `RpcTransport`, so all the queries share a
+    single keep-alive connection pool. The transport is built by the channel unless one is provided.
+
+    Queries started concurrently inside a `batch()` scope, or anywhere when `auto_batch` is set, are sent
+    together as one JSON-RPC batch request.
+
+    Given an `EndpointPool`, the queries are spread over its endpoints instead of only going to `host:port`, and
+    with a `HedgingPolicy` the slow ones are duplicated to a second endpoint. Batched queries are not hedged.
+    A `RetryPolicy` retries the queries failing for a transient reason on every endpoint.
+
+    Identical queries running concurrently share one network call and the same decoded response, unless
+    `single_flight` is disabled.
+
+    Queries can run against the state at a given height, inside an `at_height()` scope or through the
+    `x-cosmos-block-height` metadata of a stub call. Their results never change, so they are kept in an LRU
+    cache bounded to `height_cache_size` bytes, 0 disables it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        transport: Optional[RpcTransport] = None,
+        auto_batch: bool = False,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        pool: Optional[EndpointPool] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        single_flight: bool = True,
+        height_cache_size: int = DEFAULT_HEIGHT_CACHE_SIZE,
+    ):
         self.base_url = f"{host}:{port}"
+        self._owns_transport = transport is None
+        self.transport = transport or RpcTransport(
+            self.base_url, pool_size=pool_size, keepalive_timeout=keepalive_timeout
+        )
+        self.pool = pool or EndpointPool([self.base_url], self.transport)
+        self.hedging = hedging
+        self.retry_policy = retry_policy
+        self.single_flight = SingleFlight() if single_flight else None
+        self.height_cache = ByteLRUCache(height_cache_size) if height_cache_size else None
+        self.auto_batch = auto_batch
+        self.batcher = QueryBatcher(self.pool, max_batch_size=max_batch_size)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.transport.session
+
+    @asynccontextmanager
+    async def batch(self):
+        token = _batch_scope.set(True)
+        try:
+            yield self
+        finally:
+            _batch_scope.reset(token)
+
+    @asynccontextmanager
+    async def at_height(self, height: int):
+        token = _query_height.set(height)
+        try:
+            yield self
+        finally:
+            _query_height.reset(token)
+
+    async def unary(self, path: str, data: bytes, grpc_response_type, height: Optional[int] = None):
+        if self.single_flight is None:
+            return await self._unary(path, data, grpc_response_type, height)
+        return await self.single_flight.do(
+            (path, data, height), lambda: self._unary(path, data, grpc_response_type, height)
+        )
+
+    async def _unary(self, path: str, data: bytes, grpc_response_type, height: Optional[int] = None):
+        cacheable = height is not None and self.height_cache is not None
+        if cacheable:
+            raw_message = self.height_cache.get((path, data, height))
+            if raw_message is not None:
+                return grpc_response_type.FromString(data=raw_message)
+
+        response = await self.abci_query(path, data, height)
+        raw_message = response_value(response)
+        if raw_message is None:
+            return None
+        if cacheable and response["result"]["response"].get("code", 0) == 0:
+            self.height_cache.put((path, data, height), raw_message)
+        return decode_response(response, grpc_response_type, raw_message)
+
+    async def abci_query(self, path: str, data: bytes, height: Optional[int] = None) -> dict:
+        if self.retry_policy is not None:
+            return await self.retry_policy.run(lambda: self._abci_query(path, data, height))
+        return await self._abci_query(path, data, height)
+
+    async def _abci_query(self, path: str, data: bytes, height: Optional[int] = None) -> dict:
+        if self.auto_batch or _batch_scope.get():
+            return await self.batcher.submit(path, data, height)
+
+        params = {"path": f'"{path}"'}
+        if data:
+            params["data"] = "0x" + data.hex()  # This took me 2h to find out
+        if height is not None:
+            params["height"] = str(height)
+
+        def query(url):
+            return self.transport.get("/abci_query", params=params, base_url=url)
+
+        if self.hedging is not None and len(self.pool.endpoints) > 1 and self.hedging.is_hedgeable(path):
+            return await self.hedging.run(self.pool, path, query)
+        return await self.pool.run(query)
 
     def request(
         self,
@@ -95,6 +333,13 @@ class CustomChannel:
         grpc_request_type,
         grpc_response_type,
         *args,
+        metadata=None,
         **kwargs,
     ):
-        return Stream(self.base_url, path, grpc_request_type, grpc_response_type)
+        height = dict(metadata or {}).get(BLOCK_HEIGHT_METADATA)
+        height = int(height) if height is not None else _query_height.get()
+        return Stream(self, path, grpc_request_type, grpc_response_type, height=height)
+
+    async def close(self):
+        if self._owns_transport:
+            await self.transport.close()
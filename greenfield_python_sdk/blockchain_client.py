@@ -1,38 +1,41 @@
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional
+from urllib.parse import urlparse
 
-import aiohttp
-from betterproto import Casing
-from betterproto.lib.google.protobuf import Any as AnyMessage
 from grpclib.client import Channel
 
-from greenfield_python_sdk.blockchain._cosmos.tx import SimulateRequest
-from greenfield_python_sdk.blockchain.bridge import Bridge
-from greenfield_python_sdk.blockchain.challenge import Challenge
-from greenfield_python_sdk.blockchain.cosmos import Cosmos
-from greenfield_python_sdk.blockchain.payment import Payment
-from greenfield_python_sdk.blockchain.permission import Permission
-from greenfield_python_sdk.blockchain.sp import Sp
-from greenfield_python_sdk.blockchain.storage import Storage
-from greenfield_python_sdk.blockchain.tendermint import Tendermint
+from greenfield_python_sdk.blockchain.endpoint_pool import EndpointPool
+from greenfield_python_sdk.blockchain.gas import PLACEHOLDER_SIGNATURE, GasEstimator
+from greenfield_python_sdk.blockchain.hedging import HedgingPolicy
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache
+from greenfield_python_sdk.blockchain.subscription import EventSubscriber
+from greenfield_python_sdk.blockchain.transport import RpcTransport
 from greenfield_python_sdk.blockchain.utils import CustomChannel
-from greenfield_python_sdk.blockchain.virtual_group import VirtualGroup
-from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.config import ChannelType, NetworkConfiguration
 from greenfield_python_sdk.key_manager import KeyManager
 from greenfield_python_sdk.models.broadcast import BroadcastMode
-from greenfield_python_sdk.models.transaction import BroadcastOption
-from greenfield_python_sdk.protos.cosmos.base.v1beta1 import Coin
-from greenfield_python_sdk.protos.cosmos.crypto.secp256k1 import PubKey
-from greenfield_python_sdk.protos.cosmos.tx.signing.v1beta1 import SignMode
-from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import (
-    AuthInfo,
-    Fee,
-    ModeInfo,
-    ModeInfoSingle,
-    SignerInfo,
-    Tx,
-    TxBody,
-)
-from greenfield_python_sdk.utils.sign_utils import encode_sp_approval_message, get_signatures
+from greenfield_python_sdk.models.const import DEFAULT_CONNECTION_POOL_SIZE
+from greenfield_python_sdk.sp_directory import BucketRouteCache, SpDirectory
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from greenfield_python_sdk.blockchain.bridge import Bridge
+    from greenfield_python_sdk.blockchain.challenge import Challenge
+    from greenfield_python_sdk.blockchain.cosmos import Cosmos
+    from greenfield_python_sdk.blockchain.payment import Payment
+    from greenfield_python_sdk.blockchain.permission import Permission
+    from greenfield_python_sdk.blockchain.sp import Sp
+    from greenfield_python_sdk.blockchain.storage import Storage
+    from greenfield_python_sdk.blockchain.tendermint import Tendermint
+    from greenfield_python_sdk.blockchain.virtual_group import VirtualGroup
+    from greenfield_python_sdk.models.transaction import BroadcastOption
+    from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import Fee, Tx
+
+
+@asynccontextmanager
+async def _no_batch():
+    yield
 
 
 class BlockchainClient:
@@ -41,35 +44,162 @@ class BlockchainClient:
         network_configuration: NetworkConfiguration,
         channel: Optional[Channel] = None,
         key_manager: Optional[KeyManager] = None,
+        pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+        auto_batch: bool = False,
+        use_websocket: bool = True,
+        hedging: Optional[HedgingPolicy] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        gas_estimator: Optional[GasEstimator] = None,
     ):
         self.host = network_configuration.host
         self.port = network_configuration.port
         self.base_url = f"{self.host}:{self.port}"
         self.chain_id = network_configuration.chain_id
+        self.grpc_host = network_configuration.grpc_host
+        self.grpc_port = network_configuration.grpc_port
+        self.channel_type = network_configuration.channel_type
+        self.auto_batch = auto_batch
+        # Duplicates the slow read-only queries to a second endpoint, needs several endpoints
+        self.hedging = hedging
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Every tx is simulated by default, the simulation catches its errors before the fee is spent. Pass a
+        # GasEstimator() to reuse the gas observed by kind of tx, the repeated txs then skip the simulation
+        self.gas_estimator = gas_estimator if gas_estimator is not None else GasEstimator(cache=False)
+
+        # Shared by the ABCI queries, the JSON-RPC helpers and the tx broadcasts
+        self.transport = RpcTransport(self.base_url, pool_size=pool_size)
+        # Queries are balanced over every endpoint, broadcasts stick to one of them
+        self.pool = EndpointPool([self.base_url, *network_configuration.endpoints], self.transport)
+        # Resolves wait_for_tx and wait_for_block_height from the Tendermint events instead of polling
+        self.subscriber = EventSubscriber(self.transport) if use_websocket else None
+
+        # Storage providers indexed by id, operator address and endpoint, shared with the SP client
+        self.sp_directory = SpDirectory(lambda: self.sp.get_storage_providers(), include=self._is_active_sp)
+        # Primary SP of the recently used buckets
+        self.bucket_routes = BucketRouteCache()
+        # Module params, dropped when a governance proposal passes
+        self.params_cache = ParamsCache(subscriber=self.subscriber)
 
         self.channel = channel
         self.key_manager = key_manager
+        # Only the channel built by the client is closed by it, a user provided channel is left untouched
+        self._owns_channel = False
 
     async def __aenter__(self):
         if not self.channel:
-            self.channel = CustomChannel(self.host, self.port)
+            self.channel = self._build_channel()
+            self._owns_channel = True
+        self.pool.start()
+        return self
 
-        # Initialize Tendermint Core
-        self.tendermint = Tendermint(self.channel)
+    # The module facades, and the protos behind them, are only loaded on first use
 
-        # Initialize Greenfield stubs (Tendermint Core X)
-        self.bridge = Bridge(self.channel)
-        self.challenge = Challenge(self.channel)
-        self.payment = Payment(self.channel)
-        self.permission = Permission(self.channel)
-        self.sp = Sp(self.channel)
-        self.storage = Storage(self.channel)
-        self.virtual_group = VirtualGroup(self.channel)
+    def _facade_channel(self):
+        if self.channel is None:
+            raise AttributeError("The BlockchainClient has no channel yet, enter its context first")
+        return self.channel
 
-        # Initialize Cosmos-SDK
-        self.cosmos = Cosmos(self.channel)
+    # Tendermint Core
+    @cached_property
+    def tendermint(self) -> "Tendermint":
+        from greenfield_python_sdk.blockchain.tendermint import Tendermint
 
-        return self
+        return Tendermint(self._facade_channel())
+
+    # Greenfield stubs (Tendermint Core X)
+    @cached_property
+    def bridge(self) -> "Bridge":
+        from greenfield_python_sdk.blockchain.bridge import Bridge
+
+        return Bridge(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def challenge(self) -> "Challenge":
+        from greenfield_python_sdk.blockchain.challenge import Challenge
+
+        return Challenge(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def payment(self) -> "Payment":
+        from greenfield_python_sdk.blockchain.payment import Payment
+
+        return Payment(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def permission(self) -> "Permission":
+        from greenfield_python_sdk.blockchain.permission import Permission
+
+        return Permission(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def sp(self) -> "Sp":
+        from greenfield_python_sdk.blockchain.sp import Sp
+
+        return Sp(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def storage(self) -> "Storage":
+        from greenfield_python_sdk.blockchain.storage import Storage
+
+        return Storage(self._facade_channel(), self.params_cache)
+
+    @cached_property
+    def virtual_group(self) -> "VirtualGroup":
+        from greenfield_python_sdk.blockchain.virtual_group import VirtualGroup
+
+        return VirtualGroup(self._facade_channel())
+
+    # Cosmos-SDK
+    @cached_property
+    def cosmos(self) -> "Cosmos":
+        from greenfield_python_sdk.blockchain.cosmos import Cosmos
+
+        return Cosmos(self._facade_channel(), self.params_cache)
+
+    def _build_channel(self):
+        if self.channel_type == ChannelType.GRPC:
+            if not self.grpc_host or not self.grpc_port:
+                raise ValueError("grpc_host and grpc_port must be set in the network configuration to use gRPC")
+            url = urlparse(self.grpc_host if "://" in self.grpc_host else f"//{self.grpc_host}")
+            ssl = url.scheme == "https" if url.scheme else self.grpc_port == 443
+            return Channel(url.hostname, self.grpc_port, ssl=ssl)
+
+        return CustomChannel(
+            self.host,
+            self.port,
+            transport=self.transport,
+            auto_batch=self.auto_batch,
+            pool=self.pool,
+            hedging=self.hedging,
+            retry_policy=self.retry_policy,
+        )
+
+    def batch(self):
+        """Sends the queries started concurrently inside the scope as a single JSON-RPC batch request.
+        Channels other than the CustomChannel already multiplex their requests, so the scope is a no-op for them.
+
+        Example:
+            async with client.batch():
+                bucket, params = await asyncio.gather(client.storage.get_head_bucket(...), client.storage.get_params())
+        """
+        if not isinstance(self.channel, CustomChannel):
+            return _no_batch()
+        return self.channel.batch()
+
+    def at_height(self, height: int):
+        """Runs the queries started inside the scope against the state at `height`. The results at a given height
+        never change, so they are cached by the channel.
+
+        Example:
+            async with client.at_height(height):
+                bucket, params = await asyncio.gather(client.storage.get_head_bucket(...), client.storage.get_params())
+        """
+        if not isinstance(self.channel, CustomChannel):
+            raise ValueError(
+                "at_height needs the ABCI channel, pass metadata={'x-cosmos-block-height': str(height)} to the query "
+                "stubs of a gRPC channel instead"
+            )
+        return self.channel.at_height(height)
 
     @property
     def connected(self) -> bool:
@@ -81,8 +211,24 @@ class BlockchainClient:
         self,
         messages,
         type_url: List[str],
-        fee: Optional[Fee] = None,
-    ) -> Tx:
+        fee: Optional["Fee"] = None,
+    ) -> "Tx":
+        from betterproto.lib.google.protobuf import Any as AnyMessage
+
+        from greenfield_python_sdk.protos.cosmos.base.v1beta1 import Coin
+        from greenfield_python_sdk.protos.cosmos.crypto.secp256k1 import PubKey
+        from greenfield_python_sdk.protos.cosmos.tx.signing.v1beta1 import SignMode
+        from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import (
+            AuthInfo,
+            Fee,
+            ModeInfo,
+            ModeInfoSingle,
+            SignerInfo,
+            Tx,
+            TxBody,
+        )
+        from greenfield_python_sdk.utils.sign_utils import encode_sp_approval_message
+
         if not self.key_manager:
             raise KeyError("To build txs you need to add a key_manager to the BlockchainClient")
 
@@ -127,66 +273,86 @@ class BlockchainClient:
 
         return tx
 
-    async def simulate_tx(self, tx: Tx):
-        resp = await self.cosmos.tx.simulate(request=SimulateRequest(tx_bytes=bytes(tx)))
-        return resp
+    async def simulate_tx(self, tx: "Tx"):
+        return await self.simulate_raw_tx(bytes(tx))
 
     async def simulate_raw_tx(self, tx_bytes: bytes):
+        from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import SimulateRequest
+
         resp = await self.cosmos.tx.simulate(request=SimulateRequest(tx_bytes=tx_bytes))
         return resp
 
-    async def broadcast_tx(self, tx: Tx, mode: BroadcastMode = BroadcastMode.BROADCAST_MODE_SYNC) -> str:
+    async def broadcast_tx(self, tx: "Tx", mode: BroadcastMode = BroadcastMode.BROADCAST_MODE_SYNC) -> str:
         tx_hash = await self.broadcast_raw_tx(tx_bytes=bytes(tx), mode=mode)
         return tx_hash
 
     async def broadcast_raw_tx(self, tx_bytes: bytes, mode: BroadcastMode = BroadcastMode.BROADCAST_MODE_SYNC) -> str:
-        async with aiohttp.ClientSession() as session:
-            # TODO: Add broadcast mode
-            response = await session.request(
-                "GET",
-                f"{self.base_url}/broadcast_tx_sync",
-                params={"tx": "0x" + tx_bytes.hex()},
-            )
-            data = await response.json()
+        # TODO: Add broadcast mode
+        # Never failed over nor retried once sent, the tx may have reached the mempool of a node that did not answer
+        def broadcast(url):
+            return self.transport.get("/broadcast_tx_sync", params={"tx": "0x" + tx_bytes.hex()}, base_url=url)
+
+        data = await self.retry_policy.run(
+            lambda: self.pool.send(self.pool.broadcast_endpoint, broadcast), idempotent=False
+        )
 
-            if data["result"]["code"] != 0:
-                raise Exception("Transaction error: ", data["result"]["log"])
-            self.key_manager.account.increase_sequence()
-            return data["result"]["hash"]
+        if data["result"]["code"] != 0:
+            raise Exception("Transaction error: ", data["result"]["log"])
+        self.key_manager.account.increase_sequence()
+        return data["result"]["hash"]
 
     async def build_tx_from_message(
         self,
         messages,
         type_url: List[str],
-        fee: Optional[Fee] = None,
-        broadcast_option: Optional[BroadcastOption] = None,
+        fee: Optional["Fee"] = None,
+        broadcast_option: Optional["BroadcastOption"] = None,
     ):
+        from greenfield_python_sdk.utils.sign_utils import get_signatures
+
         tx = await self.build_tx(messages=messages, type_url=type_url, fee=fee)
 
-        signature_pre = await get_signatures(self.key_manager, tx, messages, self.chain_id, broadcast_option)
-        tx.signatures = [signature_pre]
+        profile = self.gas_estimator.get(type_url)
+        if profile is not None:
+            gas_limit = self.gas_estimator.gas_limit(profile)
+            tx.auth_info.fee.gas_limit = gas_limit
+            tx.auth_info.fee.amount[0].amount = str(profile.gas_price * gas_limit)
+        else:
+            await self._simulate_fee(tx, messages, type_url, broadcast_option)
+
+        # Signed once, with the final fee
+        signature = await get_signatures(self.key_manager, tx, messages, self.chain_id, broadcast_option)
+        tx.signatures = [signature]
+        return tx
+
+    async def _simulate_fee(
+        self, tx: "Tx", messages, type_url: List[str], broadcast_option: Optional["BroadcastOption"] = None
+    ):
+        from greenfield_python_sdk.utils.sign_utils import get_signatures
+
+        if self.gas_estimator.placeholder_signature:
+            tx.signatures = [PLACEHOLDER_SIGNATURE]
+        else:
+            tx.signatures = [await get_signatures(self.key_manager, tx, messages, self.chain_id, broadcast_option)]
         try:
             simulation = await self.simulate_tx(tx)
-            tx.auth_info.fee.gas_limit = simulation.gas_info.gas_used
-            tx.auth_info.fee.amount[0].amount = str(
-                int(simulation.gas_info.min_gas_price[:-3]) * int(simulation.gas_info.gas_used)
-            )
+            gas_used = int(simulation.gas_info.gas_used)
+            gas_price = int(simulation.gas_info.min_gas_price[:-3])
+            tx.auth_info.fee.gas_limit = gas_used
+            tx.auth_info.fee.amount[0].amount = str(gas_price * gas_used)
+            self.gas_estimator.record(type_url, gas_used, gas_price)
         except Exception as e:
             if e.args[0] != "":
                 raise Exception(f"Error at simulation: {e}")
             tx.auth_info.fee.gas_limit = 20000000
             tx.auth_info.fee.amount[0].amount = "100000000000000000"
 
-        signature = await get_signatures(self.key_manager, tx, messages, self.chain_id, broadcast_option)
-        tx.signatures = [signature]
-        return tx
-
     async def broadcast_message(
         self,
         messages,
         type_url: List[str],
-        fee: Optional[Fee] = None,
-        broadcast_option: Optional[BroadcastOption] = None,
+        fee: Optional["Fee"] = None,
+        broadcast_option: Optional["BroadcastOption"] = None,
     ):
         tx = await self.build_tx_from_message(
             messages=messages,
@@ -198,19 +364,34 @@ class BlockchainClient:
         if tx.auth_info.fee.payer == self.key_manager.address:
             del tx.auth_info.fee.payer
 
-        tx_hash = await self.broadcast_tx(tx)
+        try:
+            tx_hash = await self.broadcast_tx(tx)
+        except Exception as e:
+            # The gas reused for this kind of tx is too low, the next one is simulated again
+            if "out of gas" in str(e.args[1:]):
+                self.gas_estimator.invalidate(type_url)
+            raise
         return tx_hash
 
+    def _is_active_sp(self, sp: dict) -> bool:
+        return "bnbchain.org" in sp["endpoint"] if "testnet" in self.host else True
+
     async def get_active_sps(self):
-        response = await self.sp.get_storage_providers()
-        return (
-            [sp for sp in response.to_pydict(casing=Casing.SNAKE)["sps"] if "bnbchain.org" in sp["endpoint"]]
-            if "testnet" in self.host
-            else [sp for sp in response.to_pydict(casing=Casing.SNAKE)["sps"]]
-        )
+        await self.sp_directory.ensure_fresh()
+        return self.sp_directory.active()
 
     async def close(self):
-        pass
+        if self._owns_channel:
+            if isinstance(self.channel, CustomChannel):
+                await self.channel.close()
+            else:
+                self.channel.close()
+        await self.params_cache.close()
+        if self.subscriber:
+            await self.subscriber.close()
+        await self.pool.close()
+        await self.sp_directory.close()
+        await self.transport.close()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
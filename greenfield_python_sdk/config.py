@@ -1,4 +1,6 @@
+from enum import Enum
 from functools import lru_cache
+from typing import List, Optional
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
@@ -6,6 +8,13 @@ from pydantic_settings import BaseSettings
 GREENFIELD_VERSION = "v1.2.0"
 
 
+class ChannelType(str, Enum):
+    # gRPC requests tunneled through the Tendermint RPC `/abci_query` endpoint
+    ABCI = "abci"
+    # Native gRPC (HTTP/2, binary protobuf) against the fullnode gRPC port, requires `grpc_host`
+    GRPC = "grpc"
+
+
 class NetworkMainnet(BaseModel):
     host: str = "https://greenfield-chain.bnbchain.org"
     port: int = 443
@@ -22,12 +31,19 @@ class NetworkLocalnet(BaseModel):
     host: str = "http://localhost"
     port: int = 26750
     chain_id: int = 9000
+    grpc_host: str = "http://localhost"
+    grpc_port: int = 9090
 
 
 class NetworkConfiguration(BaseSettings):
     host: str
     port: int
     chain_id: int
+    grpc_host: Optional[str] = None  # i.e. https://grpc.example.org, the scheme selects TLS
+    grpc_port: Optional[int] = None
+    channel_type: ChannelType = ChannelType.ABCI
+    # Extra fullnode RPC endpoints sharing the load with host:port, i.e. ["https://fullnode-2.example.org:443"]
+    endpoints: List[str] = []
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,5 @@
 from typing import List, Tuple
 
-import aiohttp
 from eth_utils import to_checksum_address
 
 from greenfield_python_sdk.blockchain.utils import parse_account, parse_module_account
@@ -122,9 +121,8 @@ class Account:
         payment_accounts = []
         pagination = b""
 
-        async with aiohttp.ClientSession() as session:
-            res = await session.get(self.blockchain_client.channel.base_url + endpoint, headers=self.headers)
-            payment_accounts = [PaymentAccount(**account) for account in (await res.json())["payment_accounts"]]
-            pagination = PaginationResponse(**(await res.json())["pagination"])
+        res = await self.blockchain_client.transport.get(endpoint, headers=self.headers)
+        payment_accounts = [PaymentAccount(**account) for account in res["payment_accounts"]]
+        pagination = PaginationResponse(**res["pagination"])
 
         return payment_accounts, pagination
@@ -1,11 +1,8 @@
 import asyncio
-import json
 import time
 from typing import List, Tuple
 
-import aiohttp
-
-from greenfield_python_sdk.__version__ import __version__
+from greenfield_python_sdk.blockchain.utils import wait_for_block_height
 from greenfield_python_sdk.blockchain_client import BlockchainClient
 from greenfield_python_sdk.key_manager import KeyManager
 from greenfield_python_sdk.models.basic import ResultBlockResults, ResultCommit, ResultStatus
@@ -37,17 +34,14 @@ class Basic:
         return response
 
     async def get_greenfield_node_version(self) -> str:
-        headers = {"Content-Type": "application/json", "User-Agent": f"greenfield-python-sdk/{__version__}"}
         endpoint = "/abci_info"
 
-        async with aiohttp.ClientSession() as session:
-            self._resp = await session.get(self.blockchain_client.channel.base_url + endpoint, headers=headers)
-            self.response = await self._resp.json()
-            return (
-                self.response["result"]["response"]["version"]
-                if "version" in self.response["result"]["response"]
-                else "v1.2.0"
-            )
+        self.response = await self.blockchain_client.transport.get(endpoint)
+        return (
+            self.response["result"]["response"]["version"]
+            if "version" in self.response["result"]["response"]
+            else "v1.2.0"
+        )
 
     async def get_status(self) -> ResultStatus:
         self.response = await self.make_requests("status", {})
@@ -109,29 +103,50 @@ class Basic:
         Args:
             height (int): The height of the block to wait for.
         """
-        current_height = 0
-        while True:
-            latest_block = await self.blockchain_client.tendermint.get_latest_block()
-            current_height = latest_block.sdk_block.header.height
-            if current_height >= height:
-                break
-            await asyncio.sleep(0.5)
-        return current_height
+        return await wait_for_block_height(self.blockchain_client, height)
 
     async def wait_for_tx(self, hash: str, timeout: int = 60):
         """Waits for the transaction with the given hash to be committed to the blockchain.
         Has a default timeout of 60 seconds.
+
+        The Tx events of the websocket subscriber wake the wait up as soon as the transaction is committed,
+        the transaction is polled every 0.5 seconds instead when the socket is not available.
         """
         initial_time = time.time()
-        while True:
-            current_time = time.time()
-            if current_time - initial_time > timeout:
-                raise TimeoutError
+        waiter = None
+        subscriber = self.blockchain_client.subscriber
+        if subscriber is not None:
             try:
-                response = await self.blockchain_client.cosmos.tx.get_tx(GetTxRequest(hash=hash))
-                return response
+                waiter = await asyncio.wait_for(subscriber.tx_waiter(hash), timeout)
             except Exception:
-                await asyncio.sleep(0.5)
+                waiter = None
+
+        try:
+            while True:
+                current_time = time.time()
+                if current_time - initial_time > timeout:
+                    raise TimeoutError
+                try:
+                    response = await self.blockchain_client.cosmos.tx.get_tx(GetTxRequest(hash=hash))
+                    return response
+                except Exception:
+                    pass
+
+                if waiter is None:
+                    await asyncio.sleep(0.5)
+                    continue
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter), timeout - (time.time() - initial_time))
+                except asyncio.TimeoutError:
+                    raise TimeoutError
+                except Exception:
+                    # The socket dropped, keep polling
+                    pass
+                # The tx may not be indexed yet when the event arrives, poll from here on
+                waiter = None
+        finally:
+            if waiter is not None:
+                waiter.cancel()
 
     async def wait_for_n_blocks(self, n: int):
         block_height = await self.get_latest_block_height()
@@ -165,18 +180,8 @@ class Basic:
         raise NotImplementedError
 
     async def make_requests(self, method: str, params):
-        headers = {"Content-Type": "application/json"}
-        data = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params,
-        }
-        async with aiohttp.ClientSession() as session:
-            self._resp = await session.post(
-                self.blockchain_client.channel.base_url, data=json.dumps(data), headers=headers
-            )
-            return (await self._resp.json())["result"]
+        transport = self.blockchain_client.transport
+        return await self.blockchain_client.pool.run(lambda url: transport.json_rpc(method, params, base_url=url))
 
     async def set_tag(self, resource_grn: str, tags: ResourceTags):
         msg_set_tag = MsgSetTag(operator=self.key_manager.address, resource=resource_grn, tags=tags)
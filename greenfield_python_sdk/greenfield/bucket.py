@@ -1,4 +1,6 @@
-from typing import List, Tuple
+import asyncio
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 
 from greenfield_python_sdk.blockchain_client import BlockchainClient
 from greenfield_python_sdk.key_manager import KeyManager
@@ -45,8 +47,10 @@ from greenfield_python_sdk.protos.greenfield.storage import (
     VisibilityType,
 )
 from greenfield_python_sdk.protos.greenfield.virtualgroup import QueryGlobalVirtualGroupFamilyRequest
+from greenfield_python_sdk.sp_directory import UNAVAILABLE_SP_STATUSES, BucketRoute, WrongSpError
 from greenfield_python_sdk.storage_client import StorageClient
 from greenfield_python_sdk.storage_provider.utils import check_address, check_valid_bucket_name
+from greenfield_python_sdk.utils.retry import RetryableError
 
 
 class Bucket:
@@ -85,6 +89,7 @@ class Bucket:
 
         delete_bucket_msg = MsgDeleteBucket(operator=self.key_manager.address, bucket_name=bucket_name)
         tx_hash = await self.blockchain_client.broadcast_message(messages=[delete_bucket_msg], type_url=[DELETE_BUCKET])
+        self.blockchain_client.bucket_routes.invalidate(bucket_name)
         return tx_hash
 
     async def update_bucket_visibility(
@@ -239,7 +244,8 @@ class Bucket:
         sp = await self.storage_provider_by_bucket(bucket_name)
         if sp == None:
             raise Exception("Storage provider not found")
-        return await self.storage_client.bucket.list_bucket_read_record(bucket_name, sp, opts)
+        with self.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.bucket.list_bucket_read_record(bucket_name, sp, opts)
 
     async def get_quota_update_time(self, bucket_name: str) -> int:
         res = await self.blockchain_client.storage.get_quota_update_time(QueryQuoteUpdateTimeRequest(bucket_name))
@@ -267,7 +273,8 @@ class Bucket:
         sp = await self.storage_provider_by_bucket(bucket_name)
         if sp == None:
             raise Exception("Storage provider not found")
-        return await self.storage_client.bucket.get_bucket_read_quota(bucket_name, sp)
+        with self.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.bucket.get_bucket_read_quota(bucket_name, sp)
 
     async def list_buckets_by_bucket_id(
         self, bucket_id: List[int], opts: EndPointOptions
@@ -283,6 +290,7 @@ class Bucket:
             type_url=[MIGRATE_BUCKET],
             broadcast_option=BroadcastOption(sp_signature=sp_signature),
         )
+        self.blockchain_client.bucket_routes.invalidate(bucket_name)
         return tx_hash
 
     async def cancel_migrate_bucket(self, bucket_name: str, opts: CancelMigrateBucketOptions) -> Tuple[int, str]:
@@ -301,12 +309,43 @@ class Bucket:
         return await self.storage_client.bucket.get_bucket_meta(bucket_name, opts)
 
     async def storage_provider_by_bucket(self, bucket_name: str) -> str:
+        route = await self.bucket_route(bucket_name)
+        return route.operator_address if route else None
+
+    async def bucket_route(self, bucket_name: str) -> Optional[BucketRoute]:
+        bucket_routes = self.blockchain_client.bucket_routes
+        route = bucket_routes.get(bucket_name)
+        if route is not None:
+            return route
+
         head_bucket = await self.get_bucket_head(bucket_name)
-        family_res = await self.blockchain_client.virtual_group.global_virtual_group_family(
-            QueryGlobalVirtualGroupFamilyRequest(family_id=head_bucket.global_virtual_group_family_id)
-        )
-        sps = await self.blockchain_client.sp.get_storage_providers()
-        return next(
-            (sp.operator_address for sp in sps.sps if sp.id == family_res.global_virtual_group_family.primary_sp_id),
-            None,
+        sp_directory = self.blockchain_client.sp_directory
+        async with self.blockchain_client.batch():
+            family_res, _ = await asyncio.gather(
+                self.blockchain_client.virtual_group.global_virtual_group_family(
+                    QueryGlobalVirtualGroupFamilyRequest(family_id=head_bucket.global_virtual_group_family_id)
+                ),
+                sp_directory.ensure_fresh(),
+            )
+        sp = await sp_directory.get_by_id(family_res.global_virtual_group_family.primary_sp_id)
+        if sp is None:
+            return None
+        route = BucketRoute(
+            bucket_id=head_bucket.id,
+            global_virtual_group_family_id=head_bucket.global_virtual_group_family_id,
+            primary_sp_id=sp.get("id", 0),
+            operator_address=sp["operator_address"],
+            endpoint=sp.get("endpoint", ""),
         )
+        bucket_routes.put(bucket_name, route)
+        return route
+
+    @contextmanager
+    def invalidate_route_on_wrong_sp(self, bucket_name: str):
+        try:
+            yield
+        except (WrongSpError, RetryableError) as e:
+            # The bucket was likely migrated or its SP is down, resolve its primary SP again on the next request
+            if isinstance(e, WrongSpError) or e.status in UNAVAILABLE_SP_STATUSES:
+                self.blockchain_client.bucket_routes.invalidate(bucket_name)
+            raise
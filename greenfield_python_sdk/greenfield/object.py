@@ -1,5 +1,6 @@
 import io
 import os
+import pathlib
 from typing import Any, List, Tuple
 
 from greenfield_python_sdk.blockchain_client import BlockchainClient
@@ -22,6 +23,7 @@ from greenfield_python_sdk.models.object import (
     ListObjectsResult,
     ObjectMeta,
     ObjectPolicies,
+    ObjectStat,
     PutObjectOptions,
 )
 from greenfield_python_sdk.models.request import Principal, PutPolicyOption, ResourceType
@@ -41,6 +43,8 @@ from greenfield_python_sdk.protos.greenfield.storage import (
     QueryVerifyPermissionRequest,
 )
 from greenfield_python_sdk.storage_client import StorageClient
+from greenfield_python_sdk.storage_provider.download import ObjectStream, RangedDownload
+from greenfield_python_sdk.storage_provider.payload import ObjectSource
 from greenfield_python_sdk.storage_provider.utils import check_valid_bucket_name, check_valid_object_name
 
 
@@ -57,14 +61,20 @@ class Object:
         self.storage_client = storage_client
 
     async def create_object(
-        self, bucket_name: str, object_name: str, reader: io.BytesIO, opts: CreateObjectOptions
+        self, bucket_name: str, object_name: str, reader: ObjectSource, opts: CreateObjectOptions
     ) -> str:
+        """The reader is bytes, an io.BytesIO, a path, a binary file or an async iterator of bytes.
+
+        The checksums of paths, files and async iterators are computed one segment at a time by the Python engine,
+        whatever `opts.hash_engine` is.
+        """
         sp = await self.bucket.storage_provider_by_bucket(bucket_name)
 
         storage_params = await self.blockchain_client.storage.get_params()
-        get_approval, sp_signature, checksums = await self.storage_client.object.get_object_approval(
-            bucket_name, object_name, opts, sp, reader, storage_params, opts.is_serial_compute_mode
-        )
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            get_approval, sp_signature, checksums = await self.storage_client.object.get_object_approval(
+                bucket_name, object_name, opts, sp, reader, storage_params, opts.is_serial_compute_mode
+            )
         messages = [get_approval]
         type_url = [CREATE_OBJECT]
 
@@ -89,11 +99,13 @@ class Object:
         bucket_name: str,
         object_name: str,
         object_size: int,
-        reader: io.BytesIO,
+        reader: ObjectSource,
         opts: PutObjectOptions,
     ) -> str:
+        """The reader is the content of the object: bytes, a path, a binary file or an async iterator of bytes."""
         sp = await self.bucket.storage_provider_by_bucket(bucket_name)
-        return await self.storage_client.object.put_object(bucket_name, object_name, object_size, sp, reader, opts)
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.object.put_object(bucket_name, object_name, object_size, sp, reader, opts)
 
     async def cancel_create_object(self, bucket_name: str, object_name: str) -> str:
         check_valid_bucket_name(bucket_name)
@@ -121,8 +133,56 @@ class Object:
         return response
 
     async def get_object(self, bucket_name: str, object_name: str, opts: GetObjectOption) -> Tuple[Any, ObjectInfo]:
+        """The object as text, decoded the same way whether it is downloaded in ranges or not.
+
+        A binary object raises `UnicodeDecodeError`, download it with `fget_object`, `get_object_stream` or
+        `get_ranged_download` instead.
+        """
+        if self._is_parallel(opts):
+            download = await self.get_ranged_download(bucket_name, object_name, opts)
+            return download.info, await download.text()
+
+        sp = await self.bucket.storage_provider_by_bucket(bucket_name)
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.object.get_object(bucket_name, object_name, sp, opts)
+
+    async def get_object_stream(self, bucket_name: str, object_name: str, opts: GetObjectOption) -> ObjectStream:
+        """The content of the object as bytes, streamed from the SP. Close the stream if it is not read to the end."""
+        sp = await self.bucket.storage_provider_by_bucket(bucket_name)
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.object.get_object_stream(bucket_name, object_name, sp, opts)
+
+    async def get_ranged_download(self, bucket_name: str, object_name: str, opts: GetObjectOption) -> RangedDownload:
+        """A download of the object as `opts.concurrency` concurrent ranges aligned to the max segment size."""
+        object_info = await self.get_object_head(bucket_name, object_name)
+        storage_params = await self.blockchain_client.storage.get_params()
+        segment_size = int(storage_params.params.versioned_params.max_segment_size)
         sp = await self.bucket.storage_provider_by_bucket(bucket_name)
-        return await self.storage_client.object.get_object(bucket_name, object_name, sp, opts)
+
+        async def open_range(start: int, end: int) -> ObjectStream:
+            with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+                return await self.storage_client.object.get_object_stream(
+                    bucket_name, object_name, sp, GetObjectOption(range=f"bytes={start}-{end}")
+                )
+
+        info = ObjectStat(
+            object_name=object_name,
+            content_type=object_info.content_type or "application/octet-stream",
+            size=object_info.payload_size,
+        )
+        return RangedDownload(
+            open_range,
+            info,
+            segment_size,
+            opts.concurrency or 1,
+            part_size=opts.part_size,
+            retry_policy=self.storage_client.retry_policy,
+        )
+
+    @staticmethod
+    def _is_parallel(opts: GetObjectOption) -> bool:
+        # An explicit range is fetched as it is
+        return bool(opts.concurrency and opts.concurrency > 1 and not opts.range)
 
     async def get_object_head(self, bucket_name: str, object_name: str) -> ObjectInfo:
         object_info = await self.blockchain_client.storage.get_head_object(
@@ -221,7 +281,8 @@ class Object:
 
     async def list_objects(self, bucket_name: str, opts: ListObjectsOptions) -> ListObjectsResult:
         sp = await self.bucket.storage_provider_by_bucket(bucket_name)
-        return await self.storage_client.object.list_objects(bucket_name, sp, opts)
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.object.list_objects(bucket_name, sp, opts)
 
     async def create_folder(self, bucket_name: str, object_name: str, opts: CreateObjectOptions) -> str:
         if object_name.endswith("/") == False:
@@ -229,28 +290,23 @@ class Object:
         return await self.create_object(bucket_name, object_name, io.BytesIO(), opts)
 
     async def fput_object(self, bucket_name: str, object_name: str, file_path: str, opts: PutObjectOptions) -> str:
-        with open(file_path, "r") as file:
-            lines = file.read()
-        try:
-            data = io.BytesIO(lines.encode("utf-8"))
-        except Exception:
-            data = io.BytesIO(lines)
+        if os.path.isdir(file_path):
+            raise Exception("File name is a folder")
 
-        res = await self.put_object(bucket_name, object_name, data.getbuffer().nbytes, data, opts)
-        return res
+        # Streamed from the disk in chunks
+        path = pathlib.Path(file_path)
+        return await self.put_object(bucket_name, object_name, path.stat().st_size, path, opts)
 
     async def fget_object(self, bucket_name: str, object_name: str, file_path: str, opts: GetObjectOption):
         if os.path.isdir(file_path):
             raise Exception("File name is a folder")
 
-        if os.path.exists(file_path):
-            file = open(file_path, "a")
+        # Written in binary to a temporary file, which replaces the file once the download is complete
+        if self._is_parallel(opts):
+            download = await self.get_ranged_download(bucket_name, object_name, opts)
         else:
-            file = open(file_path, "w+")
-
-        _, data = await self.get_object(bucket_name, object_name, opts)
-        file.write(data)
-        file.close()
+            download = await self.get_object_stream(bucket_name, object_name, opts)
+        await download.to_file(file_path)
 
     async def list_object_by_object_id(self, object_ids: List[int], opts: EndPointOptions) -> List[ObjectMeta]:
         return await self.storage_client.object.list_object_by_object_id(object_ids, opts)
@@ -259,4 +315,7 @@ class Object:
         self, bucket_name: str, object_name: str, action_type: ActionType, opts: ListObjectPoliciesOptions
     ) -> List[ObjectPolicies]:
         sp = await self.bucket.storage_provider_by_bucket(bucket_name)
-        return await self.storage_client.object.list_object_policies(bucket_name, object_name, sp, action_type, opts)
+        with self.bucket.invalidate_route_on_wrong_sp(bucket_name):
+            return await self.storage_client.object.list_object_policies(
+                bucket_name, object_name, sp, action_type, opts
+            )
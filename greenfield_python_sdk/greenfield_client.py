@@ -1,91 +1,168 @@
 import logging
-from typing import Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
 
 from grpclib.client import Channel
 
 from greenfield_python_sdk.blockchain_client import BlockchainClient
 from greenfield_python_sdk.config import GREENFIELD_VERSION, NetworkConfiguration
-from greenfield_python_sdk.greenfield.account import Account as AccountInterface
-from greenfield_python_sdk.greenfield.basic import Basic
-from greenfield_python_sdk.greenfield.bucket import Bucket
-from greenfield_python_sdk.greenfield.challenge import Challenge
-from greenfield_python_sdk.greenfield.crosschain import CrossChain
-from greenfield_python_sdk.greenfield.distribution import Distribution
-from greenfield_python_sdk.greenfield.feegrant import FeeGrant
-from greenfield_python_sdk.greenfield.group import Group
-from greenfield_python_sdk.greenfield.object import Object
-from greenfield_python_sdk.greenfield.payment import Payment
-from greenfield_python_sdk.greenfield.proposal import Proposal
-from greenfield_python_sdk.greenfield.storage_provider import StorageProvider
-from greenfield_python_sdk.greenfield.validator import Validator
-from greenfield_python_sdk.greenfield.virtual_group import VirtualGroup
 from greenfield_python_sdk.key_manager import Account, KeyManager
 from greenfield_python_sdk.storage_client import StorageClient
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from greenfield_python_sdk.greenfield.account import Account as AccountInterface
+    from greenfield_python_sdk.greenfield.basic import Basic
+    from greenfield_python_sdk.greenfield.bucket import Bucket
+    from greenfield_python_sdk.greenfield.challenge import Challenge
+    from greenfield_python_sdk.greenfield.crosschain import CrossChain
+    from greenfield_python_sdk.greenfield.distribution import Distribution
+    from greenfield_python_sdk.greenfield.feegrant import FeeGrant
+    from greenfield_python_sdk.greenfield.group import Group
+    from greenfield_python_sdk.greenfield.object import Object
+    from greenfield_python_sdk.greenfield.payment import Payment
+    from greenfield_python_sdk.greenfield.proposal import Proposal
+    from greenfield_python_sdk.greenfield.storage_provider import StorageProvider
+    from greenfield_python_sdk.greenfield.validator import Validator
+    from greenfield_python_sdk.greenfield.virtual_group import VirtualGroup
 
 logger = logging.getLogger(__name__)
 
 
 class GreenfieldClient:
-    storage_client: StorageClient
     blockchain_client: BlockchainClient
 
-    basic: Basic
-    bucket: Bucket
-    challenge: Challenge
-    crosschain: CrossChain
-    distribution: Distribution
-    feegrant: FeeGrant
-    group: Group
-    object: Object
-    payment: Payment
-    proposal: Proposal
-    storage_provider: StorageProvider
-    validator: Validator
-    virtual_group: VirtualGroup
-
     def __init__(
         self,
         key_manager: KeyManager,
         network_configuration: NetworkConfiguration,
         channel: Optional[Channel] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        account_number: Optional[int] = None,
+        sequence: Optional[int] = None,
     ):
         self.network_configuration = network_configuration
         self.key_manager = key_manager
         self.channel = channel
+        # Shared by the chain and the SP requests, with one circuit breaker per endpoint
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        # With both of them given, async_init skips the account query
+        self._account_supplied = account_number is not None and sequence is not None
+        if account_number is not None:
+            self.key_manager.account.account_number = account_number
+        if sequence is not None:
+            self.key_manager.account.next_sequence = sequence
 
     async def __aenter__(self):
         self.blockchain_client = await BlockchainClient(
-            network_configuration=self.network_configuration, key_manager=self.key_manager
+            network_configuration=self.network_configuration,
+            channel=self.channel,
+            key_manager=self.key_manager,
+            retry_policy=self.retry_policy,
         ).__aenter__()
+        return self
 
-        # Get the sp_endpoints for the storage client
-        active_sps = await self.blockchain_client.get_active_sps()
-        sp_endpoints = {sp["operator_address"]: sp for sp in active_sps}
-        self.storage_client = await StorageClient(
-            network_configuration=self.network_configuration, key_manager=self.key_manager, sp_endpoints=sp_endpoints
-        ).__aenter__()
+    @cached_property
+    def storage_client(self) -> StorageClient:
+        # The SP session and the SP list are only set up by the first SP request
+        return StorageClient(
+            network_configuration=self.network_configuration,
+            key_manager=self.key_manager,
+            retry_policy=self.retry_policy,
+            sp_directory=self.blockchain_client.sp_directory,
+        )
 
-        # Embeded clients
-        self.basic = Basic(self.blockchain_client, self.key_manager)
-        self.account = AccountInterface(self.blockchain_client, self.basic)
-        self.bucket = Bucket(self.blockchain_client, self.key_manager, self.storage_client)
-        self.challenge = Challenge(self.blockchain_client, self.storage_client)
-        self.crosschain = CrossChain(self.blockchain_client, self.storage_client)
-        self.distribution = Distribution(self.blockchain_client, self.storage_client)
-        self.feegrant = FeeGrant(self.blockchain_client, self.storage_client)
-        self.group = Group(self.blockchain_client, self.key_manager, self.storage_client)
-        self.object = Object(self.blockchain_client, self.key_manager, self.storage_client, self.bucket)
-        self.payment = Payment(self.blockchain_client, self.storage_client)
-        self.proposal = Proposal(self.blockchain_client, self.storage_client)
-        self.storage_provider = StorageProvider(self.blockchain_client, self.key_manager, self.storage_client)
-        self.validator = Validator(self.account, self.basic, self.blockchain_client, self.storage_client)
-        self.virtual_group = VirtualGroup(self.blockchain_client, self.key_manager)
+    # Embeded clients, the modules behind them are only loaded on first use
 
-        return self
+    @cached_property
+    def basic(self) -> "Basic":
+        from greenfield_python_sdk.greenfield.basic import Basic
+
+        return Basic(self.blockchain_client, self.key_manager)
+
+    @cached_property
+    def account(self) -> "AccountInterface":
+        from greenfield_python_sdk.greenfield.account import Account as AccountInterface
+
+        return AccountInterface(self.blockchain_client, self.basic)
+
+    @cached_property
+    def bucket(self) -> "Bucket":
+        from greenfield_python_sdk.greenfield.bucket import Bucket
+
+        return Bucket(self.blockchain_client, self.key_manager, self.storage_client)
+
+    @cached_property
+    def challenge(self) -> "Challenge":
+        from greenfield_python_sdk.greenfield.challenge import Challenge
+
+        return Challenge(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def crosschain(self) -> "CrossChain":
+        from greenfield_python_sdk.greenfield.crosschain import CrossChain
+
+        return CrossChain(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def distribution(self) -> "Distribution":
+        from greenfield_python_sdk.greenfield.distribution import Distribution
+
+        return Distribution(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def feegrant(self) -> "FeeGrant":
+        from greenfield_python_sdk.greenfield.feegrant import FeeGrant
+
+        return FeeGrant(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def group(self) -> "Group":
+        from greenfield_python_sdk.greenfield.group import Group
+
+        return Group(self.blockchain_client, self.key_manager, self.storage_client)
+
+    @cached_property
+    def object(self) -> "Object":
+        from greenfield_python_sdk.greenfield.object import Object
+
+        return Object(self.blockchain_client, self.key_manager, self.storage_client, self.bucket)
+
+    @cached_property
+    def payment(self) -> "Payment":
+        from greenfield_python_sdk.greenfield.payment import Payment
+
+        return Payment(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def proposal(self) -> "Proposal":
+        from greenfield_python_sdk.greenfield.proposal import Proposal
+
+        return Proposal(self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def storage_provider(self) -> "StorageProvider":
+        from greenfield_python_sdk.greenfield.storage_provider import StorageProvider
+
+        return StorageProvider(self.blockchain_client, self.key_manager, self.storage_client)
+
+    @cached_property
+    def validator(self) -> "Validator":
+        from greenfield_python_sdk.greenfield.validator import Validator
+
+        return Validator(self.account, self.basic, self.blockchain_client, self.storage_client)
+
+    @cached_property
+    def virtual_group(self) -> "VirtualGroup":
+        from greenfield_python_sdk.greenfield.virtual_group import VirtualGroup
+
+        return VirtualGroup(self.blockchain_client, self.key_manager)
 
     async def async_init(self):
         # await self.check_node_version()
-        await self.sync_account()
+        if not self._account_supplied:
+            await self.sync_account()
 
     async def check_node_version(self):
         # Check the node version
@@ -100,7 +177,8 @@ class GreenfieldClient:
         self.key_manager.account.account_number = account.account_number
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.storage_client.close()
+        if "storage_client" in self.__dict__:
+            await self.storage_client.close()
         await self.blockchain_client.close()
 
     async def get_default_account(self) -> Account:
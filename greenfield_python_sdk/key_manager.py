@@ -1,17 +1,21 @@
 import binascii
 import hashlib
 import os
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-import hdwallets
-from Crypto.PublicKey import ECC
 from eth_utils import keccak, to_checksum_address
-from mnemonic import Mnemonic
-from py_ecc.bls import G2ProofOfPossession as bls_pop
-from secp256k1 import PrivateKey, PublicKey
+from secp256k1 import PrivateKey
+
+# hdwallets, mnemonic, py_ecc and Crypto.PublicKey.ECC are heavy to import and only needed by the seed phrase,
+# BLS and Ed25519 keys, so they are imported by the code using them
 
 
 def seed_to_private_key(seed, derivation_path, passphrase: str = ""):
+    import hdwallets
+    from mnemonic import Mnemonic
+
     seed_bytes = Mnemonic.to_seed(seed, passphrase=passphrase)
     hd_wallet = hdwallets.BIP32.from_seed(seed_bytes)
     derived_privkey = hd_wallet.get_privkey_from_path(derivation_path)
@@ -35,11 +39,35 @@ def privkey_to_eth_address(privkey: bytes) -> str:
     return pubkey_to_eth_address(pubkey)
 
 
+class DerivedKey(NamedTuple):
+    address_index: int
+    private_key: bytes
+    public_key: bytes
+    address: str
+
+
+def derive_key(privkey: bytes, address_index: int = 0) -> DerivedKey:
+    privkey_obj = PrivateKey(privkey, raw=True)
+    public_key = privkey_obj.pubkey.serialize()
+    address = pubkey_to_eth_address(privkey_obj.pubkey.serialize(compressed=False)[1:])
+    return DerivedKey(address_index, privkey, public_key, address)
+
+
+def derive_child_keys(chaincode: bytes, privkey: bytes, address_indexes: Iterable[int]) -> List[DerivedKey]:
+    """Derives the non-hardened children of an extended private key."""
+    import hdwallets
+
+    node = hdwallets.BIP32(chaincode, privkey=privkey)
+    return [derive_key(node.get_privkey_from_path([index]), index) for index in address_indexes]
+
+
 class AccountED25519:
     def __init__(
         self,
         private_key: str = None,
     ):
+        from Crypto.PublicKey import ECC
+
         if not private_key:
             self._key = ECC.generate(curve="Ed25519")
         else:
@@ -58,7 +86,8 @@ class Account:
     address: str
     """the address of the account derived by using the slip44 param and the address_index"""
 
-    _RAW_DERIVATION_PATH = "m/44'/60'/0'/0/{address_index}"
+    _ACCOUNT_DERIVATION_PATH = "m/44'/60'/0'/0"
+    _RAW_DERIVATION_PATH = _ACCOUNT_DERIVATION_PATH + "/{address_index}"
 
     def __init__(
         self,
@@ -71,14 +100,20 @@ class Account:
         self._address_index = address_index
         self._next_sequence = next_sequence
         self._account_number = account_number
+        # Key material derived so far, by address index
+        self._keys: Dict[int, DerivedKey] = {}
+        # Chaincode and private key of the m/44'/60'/0'/0 node, the parent of every address index
+        self._account_node: Optional[Tuple[bytes, bytes]] = None
 
         if not seed_phrase and not private_key:
+            from mnemonic import Mnemonic
+
             self._seed_phrase = Mnemonic(language="english").generate(strength=256)
-            self._private_key = seed_to_private_key(self._seed_phrase, self._derivation_path())
+            self._private_key = self._derived_key().private_key
 
         elif seed_phrase and not private_key:
             self._seed_phrase = seed_phrase
-            self._private_key = seed_to_private_key(seed_phrase, self._derivation_path())
+            self._private_key = self._derived_key().private_key
 
         elif private_key and not seed_phrase:
             self._seed_phrase = None
@@ -92,6 +127,60 @@ class Account:
         params = {"address_index": adr_id}
         return self._RAW_DERIVATION_PATH.format(**params)
 
+    def _account_node_key(self) -> Tuple[bytes, bytes]:
+        if self._account_node is None:
+            import hdwallets
+            from mnemonic import Mnemonic
+
+            hd_wallet = hdwallets.BIP32.from_seed(Mnemonic.to_seed(self._seed_phrase))
+            self._account_node = hd_wallet.get_extended_privkey_from_path(self._ACCOUNT_DERIVATION_PATH)
+        return self._account_node
+
+    def _derived_key(self) -> DerivedKey:
+        key = self._keys.get(self._address_index)
+        if key is None:
+            if self._seed_phrase:
+                (key,) = derive_child_keys(*self._account_node_key(), [self._address_index])
+            else:
+                key = derive_key(self._private_key, self._address_index)
+            self._keys[self._address_index] = key
+        return key
+
+    def derive_sub_accounts(self, address_indexes: Iterable[int], processes: Optional[int] = None) -> List[DerivedKey]:
+        """
+        Derives the keys and addresses of many sub accounts at once. The seed is stretched only once and every key
+        is derived from the shared m/44'/60'/0'/0 node. The derived keys are kept, so switching to one of these
+        address indexes is free afterwards.
+
+        Args:
+            address_indexes (Iterable[int]): Address indexes of the sub accounts
+            processes (int): Spread the derivation over this many processes
+
+        Returns:
+            Derived keys, in the order of the address indexes
+        """
+        if not self._seed_phrase:
+            raise ValueError("Can't derive sub accounts without provided seed")
+
+        address_indexes = list(address_indexes)
+        missing = [index for index in dict.fromkeys(address_indexes) if index not in self._keys]
+        if missing:
+            chaincode, privkey = self._account_node_key()
+            if processes and processes > 1 and len(missing) > processes:
+                chunk_size = -(-len(missing) // processes)
+                chunks = [missing[i : i + chunk_size] for i in range(0, len(missing), chunk_size)]
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    derived = [
+                        key
+                        for keys in executor.map(partial(derive_child_keys, chaincode, privkey), chunks)
+                        for key in keys
+                    ]
+            else:
+                derived = derive_child_keys(chaincode, privkey, missing)
+            self._keys.update((key.address_index, key) for key in derived)
+
+        return [self._keys[index] for index in address_indexes]
+
     @property
     def address(self) -> str:
         """
@@ -100,17 +189,7 @@ class Account:
         Returns:
             Address
         """
-        if not self._seed_phrase:
-            address = privkey_to_eth_address(self._private_key)
-
-        else:
-            sub_private_key = seed_to_private_key(
-                self._seed_phrase,
-                self._derivation_path(address_index=self._address_index),
-            )
-            address = privkey_to_eth_address(sub_private_key)
-
-        return address
+        return self._derived_key().address
 
     @property
     def seed_phrase(self) -> str:
@@ -130,14 +209,7 @@ class Account:
         Returns:
             Private Key
         """
-        if self._seed_phrase:
-            private_key = seed_to_private_key(
-                self._seed_phrase,
-                self._derivation_path(address_index=self._address_index),
-            )
-            return private_key
-        else:
-            return self._private_key
+        return self._derived_key().private_key
 
     @property
     def public_key(self) -> str:
@@ -147,10 +219,7 @@ class Account:
         Returns:
             Public Key
         """
-        pubkey_bytes = privkey_to_pubkey(self.private_key)
-
-        pubkey = PublicKey(pubkey_bytes, raw=True).serialize()
-        return pubkey
+        return self._derived_key().public_key
 
     @property
     def account_number(self) -> int:
@@ -210,7 +279,7 @@ class Account:
     @address_index.setter
     def address_index(self, address_index: int) -> None:
         if self._seed_phrase:
-            self._DEFAULT_ADDRESS_INDEX = address_index
+            self._address_index = address_index
         else:
             raise ValueError("Can't the change the address index without provided seed")
 
@@ -276,10 +345,14 @@ class BLSAccount:
 
     @property
     def public_key(self) -> str:
+        from py_ecc.bls import G2ProofOfPossession as bls_pop
+
         pub_key = bls_pop.SkToPk(self._key)
         return pub_key.hex()
 
     def bls_proof(self):
+        from py_ecc.bls import G2ProofOfPossession as bls_pop
+
         # Sign the hash of the public key and get the signature in hex
         proof = bls_pop.Sign(SK=self._key, message=tmhash(bytes.fromhex(self.public_key)))
         return proof.hex()
@@ -298,6 +371,8 @@ class BLSKeyManager:
         self.account = BLSAccount(private_key=self.private_key)
 
     def _init_from_nothing(self):
+        from py_ecc.bls import G2ProofOfPossession as bls_pop
+
         # Generate a new private key
         while True:
             potential_privkey = int.from_bytes(os.urandom(32), "big")
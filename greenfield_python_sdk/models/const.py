@@ -6,12 +6,44 @@ PACKAGE = "greenfield-python-sdk"
 
 USER_AGENT = "Greenfield " + PACKAGE + "/" + __version__
 ETH_ADDRESS_LENGTH = 20
+BLOCK_HEIGHT_METADATA = "x-cosmos-block-height"
+
+DEFAULT_CONNECTION_POOL_SIZE = 100
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_REQUEST_TIMEOUT = 60
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_WEBSOCKET_HEARTBEAT = 30
+DEFAULT_HEALTH_CHECK_INTERVAL = 10
+DEFAULT_EJECTION_TIME = 30
+DEFAULT_MAX_ENDPOINT_FAILURES = 3
+DEFAULT_MAX_HEIGHT_LAG = 5
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_MIN_DELAY = 0.01
+DEFAULT_HEDGE_MAX_DELAY = 1.0
+DEFAULT_MAX_HEDGE_RATIO = 0.1
+DEFAULT_RETRY_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_DELAY = 0.2
+DEFAULT_RETRY_MAX_DELAY = 10
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_TIMEOUT = 30
+DEFAULT_HEIGHT_CACHE_SIZE = 64 * 1024 * 1024
+DEFAULT_SP_DIRECTORY_TTL = 300
+DEFAULT_SP_DIRECTORY_MIN_REFRESH_INTERVAL = 10
+DEFAULT_BUCKET_ROUTE_TTL = 60
+DEFAULT_BUCKET_ROUTE_CACHE_SIZE = 10000
+DEFAULT_PARAMS_TTL = 600
+DEFAULT_RESUBSCRIBE_DELAY = 5
+DEFAULT_GAS_PROFILE_TTL = 600
+DEFAULT_GAS_MULTIPLIER = 1.1
+DEFAULT_STREAM_CHUNK_SIZE = 1024 * 1024
 
 CREATE_OBJECT_ACTION = "CreateObject"
 CREATE_BUCKET_ACTION = "CreateBucket"
 MIGRATE_BUCKET_ACTION = "MigrateBucket"
 SIGN_ALGORITHM = "GNFD1-ECDSA"
 AUTH_V1 = "authTypeV1"
+HASH_ENGINE_PYTHON = "python"
+HASH_ENGINE_GO = "go"
 SUPPORT_HEADERS = [
     "Content-MD5",
     "Content-Type",
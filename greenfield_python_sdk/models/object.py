@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
+from greenfield_python_sdk.models.const import HASH_ENGINE_GO
 from greenfield_python_sdk.protos.greenfield.storage import ObjectInfo, ResourceTags, ResourceTagsTag, VisibilityType
 
 
@@ -13,6 +14,9 @@ class CreateObjectOptions(BaseModel):
     is_async_mode: Optional[bool] = None
     is_serial_compute_mode: Optional[str] = "true"
     tags: Optional[ResourceTags] = None
+    # "go" computes the checksums with the shared library of data-redundancy-generator-bridge, "python" in the package.
+    # The readers that are not in memory are always hashed in the package.
+    hash_engine: Optional[str] = HASH_ENGINE_GO
 
 
 class PutObjectOptions(BaseModel):
@@ -52,6 +56,10 @@ class ListObjectsOptions(BaseModel):
 
 class GetObjectOption(BaseModel):
     range: Optional[str] = None
+    # Above 1, the object is downloaded as this many concurrent ranges aligned to the storage segments
+    concurrency: Optional[int] = None
+    # The size of the ranges, rounded up to a multiple of the max segment size
+    part_size: Optional[int] = None
 
 
 class ObjectStat(BaseModel):
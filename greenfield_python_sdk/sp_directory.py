@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from betterproto import Casing
+
+from greenfield_python_sdk.models.const import (
+    DEFAULT_BUCKET_ROUTE_CACHE_SIZE,
+    DEFAULT_BUCKET_ROUTE_TTL,
+    DEFAULT_SP_DIRECTORY_MIN_REFRESH_INTERVAL,
+    DEFAULT_SP_DIRECTORY_TTL,
+)
+
+if TYPE_CHECKING:
+    from greenfield_python_sdk.protos.greenfield.sp import QueryStorageProvidersResponse
+
+logger = logging.getLogger(__name__)
+
+# Statuses of an unavailable storage provider, it may not serve the bucket anymore so its route is resolved again
+UNAVAILABLE_SP_STATUSES = (503, 504)
+# Error codes and messages, lower cased, of a storage provider answering that it is not the primary SP of the bucket
+WRONG_SP_ERRORS = ("mismatched primary sp", "not the primary sp", "wrong sp")
+
+
+class WrongSpError(Exception):
+    """The SP answered that it is not the primary SP of the bucket, asking it again won't help.
+
+    It is not retried nor counted against the circuit breaker of the SP, the route of the bucket is resolved again.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def is_wrong_sp_answer(body: str) -> bool:
+    body = body.lower()
+    return any(error in body for error in WRONG_SP_ERRORS)
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    return (urlparse(endpoint).netloc or endpoint).rstrip("/").lower()
+
+
+class SpDirectory:
+    """Storage providers of the chain, indexed by id, operator address and endpoint.
+
+    The providers are kept as the snake case dicts the SP client works with. The directory is refreshed every
+    `ttl` seconds by a background task once started, on demand when it is stale or invalidated, and when a
+    lookup misses, as a provider may have joined since the last refresh. A miss refreshes the list at most once
+    every `min_refresh_interval` seconds, so the lookups of an unknown provider don't each fetch the whole list.
+
+    `include` selects the providers listed by `active()`, the lookups see every provider.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Callable[[], Awaitable["QueryStorageProvidersResponse"]]] = None,
+        ttl: float = DEFAULT_SP_DIRECTORY_TTL,
+        include: Optional[Callable[[dict], bool]] = None,
+        min_refresh_interval: float = DEFAULT_SP_DIRECTORY_MIN_REFRESH_INTERVAL,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.include = include
+        self.min_refresh_interval = min_refresh_interval
+        self.version = 0  # Bumped whenever the list of providers changes
+        self.updated_at: Optional[float] = None
+        self._sps: List[dict] = []
+        self._by_id: Dict[int, dict] = {}
+        self._by_address: Dict[str, dict] = {}
+        self._by_endpoint: Dict[str, dict] = {}
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._fetches = 0
+        self._refresher: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_endpoints(cls, sp_endpoints: dict) -> "SpDirectory":
+        """Static directory built from an `{operator_address: sp}` dict, it is never refreshed."""
+        directory = cls()
+        directory._index(list(sp_endpoints.values()))
+        return directory
+
+    @property
+    def stale(self) -> bool:
+        if self.fetch is None:
+            return False
+        return self.updated_at is None or time.monotonic() - self.updated_at >= self.ttl
+
+    def _index(self, sps: List[dict]):
+        if sps != self._sps:
+            self.version += 1
+        self._sps = sps
+        self._by_id = {sp.get("id", 0): sp for sp in sps}
+        self._by_address = {sp["operator_address"]: sp for sp in sps}
+        self._by_endpoint = {normalize_endpoint(sp["endpoint"]): sp for sp in sps if sp.get("endpoint")}
+        self.updated_at = time.monotonic()
+
+    async def refresh(self):
+        if self.fetch is None:
+            return
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        fetches = self._fetches
+        async with self._refresh_lock:
+            # Another caller refreshed while this one was waiting for the lock
+            if self._fetches != fetches:
+                return
+            response = await self.fetch()
+            self._index(response.to_pydict(casing=Casing.SNAKE).get("sps", []))
+            self._fetches += 1
+
+    async def ensure_fresh(self):
+        if self.stale:
+            await self.refresh()
+
+    def invalidate(self):
+        if self.fetch is not None:
+            self.updated_at = None
+
+    def by_id(self, sp_id: int) -> Optional[dict]:
+        return self._by_id.get(sp_id)
+
+    def by_address(self, operator_address: str) -> Optional[dict]:
+        return self._by_address.get(operator_address)
+
+    def by_endpoint(self, endpoint: str) -> Optional[dict]:
+        return self._by_endpoint.get(normalize_endpoint(endpoint))
+
+    async def get_by_id(self, sp_id: int) -> Optional[dict]:
+        return await self._lookup(self.by_id, sp_id)
+
+    async def get_by_address(self, operator_address: str) -> Optional[dict]:
+        return await self._lookup(self.by_address, operator_address)
+
+    async def get_by_endpoint(self, endpoint: str) -> Optional[dict]:
+        return await self._lookup(self.by_endpoint, endpoint)
+
+    async def _lookup(self, index: Callable[[str], Optional[dict]], key) -> Optional[dict]:
+        await self.ensure_fresh()
+        sp = index(key)
+        if sp is None and self.fetch is not None and self._may_refresh_on_miss():
+            await self.refresh()
+            sp = index(key)
+        return sp
+
+    def _may_refresh_on_miss(self) -> bool:
+        return self.updated_at is None or time.monotonic() - self.updated_at >= self.min_refresh_interval
+
+    def all(self) -> List[dict]:
+        return list(self._sps)
+
+    def active(self) -> List[dict]:
+        if self.include is None:
+            return list(self._sps)
+        return [sp for sp in self._sps if self.include(sp)]
+
+    def start(self):
+        if self.fetch is not None and self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh the storage provider directory: {e}")
+            await asyncio.sleep(self.ttl)
+
+    async def close(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+
+@dataclass(frozen=True)
+class BucketRoute:
+    bucket_id: str
+    global_virtual_group_family_id: int
+    primary_sp_id: int
+    operator_address: str
+    endpoint: str
+
+
+class BucketRouteCache:
+    """Primary storage provider of the recently used buckets, so a hot bucket is routed without any query.
+
+    The routes expire after `ttl` seconds. They are invalidated explicitly when a bucket is migrated or deleted,
+    and by the callers when the SP answers that it is not the primary SP of the bucket.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_BUCKET_ROUTE_TTL, max_size: int = DEFAULT_BUCKET_ROUTE_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._routes: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, bucket_name: str) -> Optional[BucketRoute]:
+        entry = self._routes.get(bucket_name)
+        if entry is None or time.monotonic() >= entry[1]:
+            if entry is not None:
+                del self._routes[bucket_name]
+            self.misses += 1
+            return None
+        self._routes.move_to_end(bucket_name)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, bucket_name: str, route: BucketRoute):
+        self._routes[bucket_name] = (route, time.monotonic() + self.ttl)
+        self._routes.move_to_end(bucket_name)
+        while len(self._routes) > self.max_size:
+            self._routes.popitem(last=False)
+
+    def invalidate(self, bucket_name: str):
+        self._routes.pop(bucket_name, None)
+
+    def clear(self):
+        self._routes.clear()
+
+    def __contains__(self, bucket_name: str) -> bool:
+        entry = self._routes.get(bucket_name)
+        return entry is not None and time.monotonic() < entry[1]
+
+    def __len__(self):
+        return len(self._routes)
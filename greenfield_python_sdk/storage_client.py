@@ -1,40 +1,68 @@
 import logging
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
 
 from greenfield_python_sdk import NetworkConfiguration
 from greenfield_python_sdk.key_manager import KeyManager
-from greenfield_python_sdk.storage_provider.bucket import Bucket
-from greenfield_python_sdk.storage_provider.group import Group
-from greenfield_python_sdk.storage_provider.object import Object
-from greenfield_python_sdk.storage_provider.request import Client
+from greenfield_python_sdk.sp_directory import SpDirectory
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+if TYPE_CHECKING:
+    from greenfield_python_sdk.storage_provider.bucket import Bucket
+    from greenfield_python_sdk.storage_provider.group import Group
+    from greenfield_python_sdk.storage_provider.object import Object
+    from greenfield_python_sdk.storage_provider.request import Client
 
 logger = logging.getLogger(__name__)
 
 
 class StorageClient:
-    bucket: Bucket
-    client: Client
-    group: Group
-    object: Object
-
     def __init__(
         self,
         network_configuration: NetworkConfiguration,
         key_manager: KeyManager,
-        sp_endpoints: dict,
+        sp_endpoints: Optional[dict] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        sp_directory: Optional[SpDirectory] = None,
     ):
         self.network_url = network_configuration.host
         self.key_manager = key_manager
-        self.sp_endpoints: dict = sp_endpoints
+        # Without given endpoints, the active SPs of the directory are used
+        self.sp_endpoints: Optional[dict] = sp_endpoints
+        self.retry_policy = retry_policy
+        self.sp_directory = sp_directory
 
     async def __aenter__(self):
-        self.client = await Client(self.network_url, self.key_manager, self.sp_endpoints).__aenter__()
-        self.bucket = Bucket(self.client)
-        self.object = Object(self.client)
-        self.group = Group(self.client)
         return self
 
+    # The SP client and APIs, and the protos behind them, are only loaded on first use
+
+    @cached_property
+    def client(self) -> "Client":
+        from greenfield_python_sdk.storage_provider.request import Client
+
+        return Client(self.network_url, self.key_manager, self.sp_endpoints, self.retry_policy, self.sp_directory)
+
+    @cached_property
+    def bucket(self) -> "Bucket":
+        from greenfield_python_sdk.storage_provider.bucket import Bucket
+
+        return Bucket(self.client)
+
+    @cached_property
+    def object(self) -> "Object":
+        from greenfield_python_sdk.storage_provider.object import Object
+
+        return Object(self.client)
+
+    @cached_property
+    def group(self) -> "Group":
+        from greenfield_python_sdk.storage_provider.group import Group
+
+        return Group(self.client)
+
     async def close(self):
-        if self.client:
+        if "client" in self.__dict__:
             await self.client.close()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
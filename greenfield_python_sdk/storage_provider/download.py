@@ -0,0 +1,211 @@
+import asyncio
+import codecs
+import mmap
+import os
+import tempfile
+from email.message import Message
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+
+import aiohttp
+
+from greenfield_python_sdk.models.const import DEFAULT_STREAM_CHUNK_SIZE
+from greenfield_python_sdk.models.object import ObjectStat
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+
+def decode_text(content: Union[bytes, bytearray], content_type: str) -> str:
+    """The content as text, decoded with the charset of its content type or UTF-8 as aiohttp does.
+
+    Raises `UnicodeDecodeError` on binary content, download it as bytes instead.
+    """
+    message = Message()
+    message["Content-Type"] = content_type
+    encoding = message.get_content_charset() or "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return content.decode(encoding)
+
+
+class ObjectStream:
+    """The content of a downloaded object, read from the SP response as bytes without buffering it whole.
+
+    Iterate it for chunks of at most `chunk_size` bytes, `readinto` a buffer or write it `to_file`. The connection
+    goes back to the pool once the content is read, or when the stream is closed.
+    """
+
+    def __init__(self, info: ObjectStat, response: aiohttp.ClientResponse, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE):
+        self.info = info
+        self.response = response
+        self.chunk_size = chunk_size
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.response.release()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.response.content.iter_chunked(self.chunk_size)
+
+    async def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Fills the buffer, returns the number of bytes read: less than its size only at the end of the object."""
+        view = memoryview(buffer).cast("B")
+        filled = 0
+        while filled < len(view):
+            data = await self.response.content.read(len(view) - filled)
+            if not data:
+                break
+            view[filled : filled + len(data)] = data
+            filled += len(data)
+        return filled
+
+    async def text(self) -> str:
+        """Reads the whole object as text, see `decode_text`."""
+        try:
+            return decode_text(await self.response.read(), self.info.content_type)
+        finally:
+            self.close()
+
+    async def to_file(self, file_path: Union[str, os.PathLike]) -> int:
+        """Writes the object to a temporary file next to `file_path`, renamed to it once complete.
+
+        An interrupted download leaves the existing file untouched. Returns the number of bytes written.
+        """
+        directory, name = os.path.split(os.path.abspath(file_path))
+        loop = asyncio.get_running_loop()
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".part", dir=directory)
+        written = 0
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in self:
+                    await loop.run_in_executor(None, file.write, chunk)
+                    written += len(chunk)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        finally:
+            self.close()
+        return written
+
+
+class IncompleteRangeError(ConnectionError):
+    """A range ended before all its bytes were received, it is retried from where it stopped."""
+
+
+def segment_ranges(size: int, segment_size: int, part_size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """The inclusive byte ranges covering `size` bytes, each a whole number of segments long but the last one."""
+    if segment_size <= 0:
+        raise Exception("segment_size must be greater than 0")
+    # The part size is rounded up to a multiple of the segment size
+    segments = max(1, -(-(part_size or segment_size) // segment_size))
+    step = segments * segment_size
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+class RangedDownload:
+    """Downloads an object as concurrent ranges aligned to the storage segments.
+
+    At most `concurrency` ranges are fetched at once, each one written in place into the output, and a range
+    failing with a transient error is fetched again from its first missing byte.
+    """
+
+    def __init__(
+        self,
+        open_range: Callable[[int, int], Awaitable[ObjectStream]],
+        info: ObjectStat,
+        segment_size: int,
+        concurrency: int,
+        part_size: Optional[int] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ):
+        if concurrency <= 0:
+            raise Exception("concurrency must be greater than 0")
+        self.open_range = open_range
+        self.info = info
+        self.ranges = segment_ranges(info.size, segment_size, part_size)
+        self.concurrency = concurrency
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.chunk_size = chunk_size
+
+    @property
+    def size(self) -> int:
+        return self.info.size
+
+    async def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Fills the first `size` bytes of the buffer with the object, returns the number of bytes written."""
+        with memoryview(buffer).cast("B") as view:
+            if len(view) < self.size:
+                raise Exception(f"The buffer holds {len(view)} bytes but the object has {self.size} bytes")
+            await self._download(view)
+        return self.size
+
+    async def text(self) -> str:
+        """Downloads the whole object as text, see `decode_text`."""
+        content = bytearray(self.size)
+        await self.readinto(content)
+        return decode_text(content, self.info.content_type)
+
+    async def to_file(self, file_path: Union[str, os.PathLike]) -> int:
+        """Writes the object to a preallocated, memory-mapped temporary file, renamed to `file_path` once complete."""
+        directory, name = os.path.split(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".part", dir=directory)
+        try:
+            with os.fdopen(fd, "r+b") as file:
+                if self.size:
+                    file.truncate(self.size)
+                    with mmap.mmap(file.fileno(), self.size) as mapped:
+                        await self._download(mapped)
+                        mapped.flush()
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return self.size
+
+    async def _download(self, target: Union[memoryview, mmap.mmap]):
+        ranges = iter(self.ranges)
+
+        async def worker():
+            # The workers share the iterator, each one takes the next range when it is done with its own
+            for start, end in ranges:
+                await self._download_range(target, start, end)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, len(self.ranges)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _download_range(self, target: Union[memoryview, mmap.mmap], start: int, end: int):
+        received = 0
+
+        async def fetch():
+            nonlocal received
+            first = start + received
+            async with await self.open_range(first, end) as stream:
+                if stream.response.status != 206 and (first, end) != (0, self.size - 1):
+                    raise Exception(f"The SP answered the range {first}-{end} with status {stream.response.status}")
+                stream.chunk_size = self.chunk_size
+                try:
+                    async for chunk in stream:
+                        offset = start + received
+                        if offset + len(chunk) > end + 1:
+                            raise Exception(f"The SP sent more bytes than the range {first}-{end}")
+                        # Slice assignment, the mmap or the buffer is not exported while the range is in flight
+                        target[offset : offset + len(chunk)] = chunk
+                        received += len(chunk)
+                except aiohttp.ClientPayloadError as e:
+                    raise IncompleteRangeError(f"The range {start + received}-{end} was interrupted: {e}") from e
+            if start + received <= end:
+                raise IncompleteRangeError(f"The range {start + received}-{end} ended early")
+
+        await self.retry_policy.run(fetch, idempotent=True)
@@ -0,0 +1,260 @@
+"""The expected checksums of an object, computed as the Greenfield SPs do without the Go library.
+
+Each segment of `max_segment_size` bytes is hashed and split into `data_shards` pieces, extended with
+`parity_shards` Reed-Solomon parity pieces as klauspost/reedsolomon does: a Vandermonde matrix over GF(2^8) made
+systematic. The checksums are the hash of the segment hashes followed by, for each piece index, the hash of the
+piece hashes of all the segments.
+"""
+
+import asyncio
+import functools
+import hashlib
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from greenfield_python_sdk.protos.greenfield.storage import RedundancyType
+from greenfield_python_sdk.storage_provider.payload import ObjectPayload, StreamSource
+
+# GF(2^8) generated by x^8 + x^4 + x^3 + x^2 + 1, with 2 as primitive element
+GF_POLYNOMIAL = 0x11D
+MAX_SHARDS = 256
+# The number of uint16 encoded at once, the intermediate arrays stay in the CPU cache
+BLOCK_SIZE = 32 * 1024
+
+
+def _build_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    exp = np.zeros(510, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int32)
+    value = 1
+    for power in range(255):
+        exp[power] = value
+        log[value] = power
+        value <<= 1
+        if value & 0x100:
+            value ^= GF_POLYNOMIAL
+    # Doubled, the sum of two logarithms needs no modulo
+    exp[255:] = exp[:255]
+
+    # The 256 x 256 multiplication table, a row multiplies a whole piece with one lookup per byte
+    mul = exp[log[:, None] + log[None, :]]
+    mul[0, :] = 0
+    mul[:, 0] = 0
+    return exp, log, mul
+
+
+EXP_TABLE, LOG_TABLE, MUL_TABLE = _build_tables()
+
+
+@functools.lru_cache(maxsize=64)
+def _pair_table(coefficient: int) -> np.ndarray:
+    pairs = np.arange(65536)
+    row = MUL_TABLE[coefficient]
+    return row[pairs & 0xFF].astype(np.uint16) | (row[pairs >> 8].astype(np.uint16) << 8)
+
+
+def gf_mul(a: int, b: int) -> int:
+    return int(MUL_TABLE[a, b])
+
+
+def gf_exp(a: int, n: int) -> int:
+    if n == 0:
+        return 1
+    if a == 0:
+        return 0
+    return int(EXP_TABLE[(int(LOG_TABLE[a]) * n) % 255])
+
+
+def gf_inverse(a: int) -> int:
+    if a == 0:
+        raise ZeroDivisionError("0 has no inverse in GF(2^8)")
+    return int(EXP_TABLE[255 - LOG_TABLE[a]])
+
+
+def matrix_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.bitwise_xor.reduce(MUL_TABLE[a[:, :, None], b[None, :, :]], axis=1)
+
+
+def matrix_invert(matrix: np.ndarray) -> np.ndarray:
+    """Gauss-Jordan elimination over GF(2^8)."""
+    size = len(matrix)
+    work = np.concatenate([matrix.astype(np.uint8), np.eye(size, dtype=np.uint8)], axis=1)
+    for column in range(size):
+        pivots = np.nonzero(work[column:, column])[0]
+        if not len(pivots):
+            raise Exception("Singular matrix")
+        pivot = column + pivots[0]
+        if pivot != column:
+            work[[column, pivot]] = work[[pivot, column]]
+        work[column] = MUL_TABLE[gf_inverse(int(work[column, column]))][work[column]]
+        for row in range(size):
+            factor = int(work[row, column])
+            if row != column and factor:
+                work[row] ^= MUL_TABLE[factor][work[column]]
+    return work[:, size:]
+
+
+def build_matrix(data_shards: int, total_shards: int) -> np.ndarray:
+    """The encoding matrix of klauspost/reedsolomon: its first rows are the identity, the others make the parity."""
+    vandermonde = np.array(
+        [[gf_exp(row, column) for column in range(data_shards)] for row in range(total_shards)], dtype=np.uint8
+    )
+    return matrix_multiply(vandermonde, matrix_invert(vandermonde[:data_shards]))
+
+
+class ReedSolomon:
+    def __init__(self, data_shards: int, parity_shards: int):
+        if data_shards <= 0 or parity_shards < 0:
+            raise Exception("The number of data shards must be positive and the parity shards not negative")
+        if data_shards + parity_shards > MAX_SHARDS:
+            raise Exception(f"At most {MAX_SHARDS} shards are supported")
+        self.data_shards = data_shards
+        self.parity_shards = parity_shards
+        self.parity_matrix = build_matrix(data_shards, data_shards + parity_shards)[data_shards:]
+
+    def split(self, data: bytes) -> np.ndarray:
+        """The data shards, zero padded to the same size, as the rows of an array."""
+        if not len(data):
+            raise Exception("Cannot split empty data")
+        per_shard = -(-len(data) // self.data_shards)
+        if per_shard * self.data_shards == len(data):
+            return np.frombuffer(data, dtype=np.uint8).reshape(self.data_shards, per_shard)
+        shards = np.zeros(per_shard * self.data_shards, dtype=np.uint8)
+        shards[: len(data)] = np.frombuffer(data, dtype=np.uint8)
+        return shards.reshape(self.data_shards, per_shard)
+
+    def encode_parity(self, shards: np.ndarray) -> np.ndarray:
+        per_shard = shards.shape[1]
+        # Two bytes are multiplied at once, through a table of the products of all the uint16
+        if per_shard % 2:
+            shards = np.pad(shards, ((0, 0), (0, 1)))
+        pairs = np.ascontiguousarray(shards).view(np.uint16)
+        parity = np.zeros((self.parity_shards, pairs.shape[1]), dtype=np.uint16)
+        indices = np.empty(BLOCK_SIZE, dtype=np.intp)
+        product = np.empty(BLOCK_SIZE, dtype=np.uint16)
+        for start in range(0, pairs.shape[1], BLOCK_SIZE):
+            block = slice(start, min(start + BLOCK_SIZE, pairs.shape[1]))
+            count = block.stop - start
+            for shard, coefficients in zip(pairs, self.parity_matrix.T):
+                # The indices are cast once per block, and shared by the parity rows
+                np.copyto(indices[:count], shard[block])
+                for row, coefficient in zip(parity, coefficients):
+                    if coefficient == 1:
+                        row[block] ^= shard[block]
+                    elif coefficient:
+                        np.take(_pair_table(int(coefficient)), indices[:count], out=product[:count])
+                        row[block] ^= product[:count]
+        return parity.view(np.uint8)[:, :per_shard]
+
+    def encode(self, data: bytes) -> List[np.ndarray]:
+        """The data shards followed by the parity shards."""
+        shards = self.split(data)
+        return list(shards) + list(self.encode_parity(shards))
+
+
+def integrity_hash(checksums: List[bytes]) -> bytes:
+    return hashlib.sha256(b"".join(checksums)).digest()
+
+
+class IntegrityHasher:
+    """Computes the expect_checksums incrementally: `update` it with the content in chunks of any size, the segments
+    are hashed and encoded as soon as they are complete, then `digest` returns the checksums.
+
+    At most one incomplete segment is buffered.
+    """
+
+    def __init__(self, segment_size: int, data_shards: int, parity_shards: int):
+        if segment_size <= 0:
+            raise Exception("segment_size must be greater than 0")
+        self.segment_size = segment_size
+        self.encoder = ReedSolomon(data_shards, parity_shards)
+        self.size = 0
+        self._buffer = bytearray()
+        self._segment_checksums: List[bytes] = []
+        self._piece_checksums: List[List[bytes]] = [[] for _ in range(data_shards + parity_shards)]
+        self._digest = None
+
+    def update(self, data: Union[bytes, bytearray, memoryview]):
+        if self._digest is not None:
+            raise Exception("The checksums were already computed")
+        view = memoryview(data).cast("B")
+        self.size += len(view)
+
+        if self._buffer:
+            missing = self.segment_size - len(self._buffer)
+            self._buffer += view[:missing]
+            view = view[missing:]
+            if len(self._buffer) < self.segment_size:
+                return
+            self._hash_segment(self._buffer)
+            # A new buffer, the full one may still be referenced by the pieces
+            self._buffer = bytearray()
+
+        # The whole segments of the chunk are hashed in place
+        while len(view) >= self.segment_size:
+            self._hash_segment(view[: self.segment_size])
+            view = view[self.segment_size :]
+        self._buffer += view
+
+    def digest(self) -> Tuple[List[bytes], int, RedundancyType]:
+        if self._digest is None:
+            if self._buffer:
+                self._hash_segment(self._buffer)
+                self._buffer = bytearray()
+            checksums = [integrity_hash(self._segment_checksums)]
+            checksums += [integrity_hash(pieces) for pieces in self._piece_checksums]
+            self._digest = checksums
+        return list(self._digest), self.size, RedundancyType.REDUNDANCY_EC_TYPE
+
+    def _hash_segment(self, segment: Union[bytearray, memoryview]):
+        self._segment_checksums.append(hashlib.sha256(segment).digest())
+        for index, piece in enumerate(self.encoder.encode(segment)):
+            self._piece_checksums[index].append(hashlib.sha256(piece).digest())
+
+
+def compute_integrity_hash(
+    reader, segment_size: int, data_shards: int, parity_shards: int
+) -> Tuple[List[bytes], int, RedundancyType]:
+    """The expect_checksums of bytes or of the content of a reader, meant to match the Go library byte for byte.
+
+    An `io.BytesIO` is hashed in place, other readers are read one segment at a time.
+    """
+    hasher = IntegrityHasher(segment_size, data_shards, parity_shards)
+    if hasattr(reader, "getbuffer"):
+        with reader.getbuffer() as content:
+            hasher.update(content)
+    elif isinstance(reader, (bytes, bytearray, memoryview)):
+        hasher.update(reader)
+    else:
+        while True:
+            segment = reader.read(segment_size)
+            if isinstance(segment, str):
+                raise Exception("The file must be opened in binary mode")
+            if not segment:
+                break
+            hasher.update(segment)
+    return hasher.digest()
+
+
+async def compute_integrity_hash_stream(
+    source: StreamSource, segment_size: int, data_shards: int, parity_shards: int
+) -> Tuple[List[bytes], int, RedundancyType]:
+    """The expect_checksums of a file path, a binary file or an async iterator of bytes, read one segment at a time.
+
+    A segment is hashed in the default executor while the next one is read, so at most two segments are in memory.
+    A seekable file is put back at its position once read.
+    """
+    hasher = IntegrityHasher(segment_size, data_shards, parity_shards)
+    payload = ObjectPayload(source, chunk_size=segment_size)
+    loop = asyncio.get_running_loop()
+    hashing = None
+    try:
+        async for segment in payload:
+            if hashing is not None:
+                await hashing
+            hashing = loop.run_in_executor(None, hasher.update, segment)
+        if hashing is not None:
+            await hashing
+    finally:
+        payload.rewind()
+    return hasher.digest()
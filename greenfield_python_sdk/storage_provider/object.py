@@ -9,7 +9,7 @@ from typing import Any, List, Tuple
 import html_to_json
 
 from greenfield_python_sdk.models.bucket import EndPointOptions
-from greenfield_python_sdk.models.const import CREATE_OBJECT_ACTION
+from greenfield_python_sdk.models.const import CREATE_OBJECT_ACTION, HASH_ENGINE_GO, HASH_ENGINE_PYTHON
 from greenfield_python_sdk.models.object import (
     CreateObjectOptions,
     GetObjectOption,
@@ -24,6 +24,8 @@ from greenfield_python_sdk.models.request import AminAPIInfo, RequestMeta, SendO
 from greenfield_python_sdk.protos.greenfield.common import Approval
 from greenfield_python_sdk.protos.greenfield.permission import ActionType
 from greenfield_python_sdk.protos.greenfield.storage import MsgCreateObject, ObjectInfo, RedundancyType, VisibilityType
+from greenfield_python_sdk.storage_provider.download import ObjectStream
+from greenfield_python_sdk.storage_provider.payload import ObjectPayload, ObjectSource, object_payload
 from greenfield_python_sdk.storage_provider.request import Client
 from greenfield_python_sdk.storage_provider.utils import (
     check_valid_bucket_name,
@@ -47,7 +49,7 @@ class Object:
         object_name: str,
         opts: CreateObjectOptions,
         primary_sp_address: str,
-        reader: io.BytesIO,
+        reader: ObjectSource,
         storage_params,
         is_serial_compute_mode: str,
     ) -> Tuple[MsgCreateObject, str, List[str]]:
@@ -55,7 +57,7 @@ class Object:
         check_valid_object_name(object_name)
 
         expect_check_Sums, size, redundancy_type = await self.compute_hash_roots(
-            storage_params, reader, is_serial_compute_mode
+            storage_params, reader, is_serial_compute_mode, opts.hash_engine
         )
 
         if opts.content_type != "" and opts.content_type != None:
@@ -95,15 +97,41 @@ class Object:
         )
 
     async def compute_hash_roots(
-        self, storage_params, reader: io.BytesIO, is_serial_compute_mode: str
+        self,
+        storage_params,
+        reader: ObjectSource,
+        is_serial_compute_mode: str,
+        hash_engine: str = HASH_ENGINE_GO,
     ) -> Tuple[List[bytes], int, RedundancyType]:
+        """Paths, files and async iterators are always hashed by the Python engine, one segment at a time.
+
+        The Go engine needs the whole content in memory, it only hashes bytes and io.BytesIO readers.
+        """
         data_blocks = storage_params.params.versioned_params.redundant_data_chunk_num
         parity_blocks = storage_params.params.versioned_params.redundant_parity_chunk_num
         seg_size = storage_params.params.versioned_params.max_segment_size
 
-        expectCheckSums, size, redundancy_type = compute_integrity_hash_go(
-            reader, int(seg_size), int(data_blocks), int(parity_blocks), is_serial_compute_mode
-        )
+        if hash_engine not in (HASH_ENGINE_GO, HASH_ENGINE_PYTHON):
+            raise Exception(f"Unknown hash engine: {hash_engine}")
+        if isinstance(reader, (bytes, bytearray, memoryview)):
+            reader = io.BytesIO(reader)
+
+        if hash_engine == HASH_ENGINE_GO and isinstance(reader, io.BytesIO):
+            expectCheckSums, size, redundancy_type = compute_integrity_hash_go(
+                reader, int(seg_size), int(data_blocks), int(parity_blocks), is_serial_compute_mode
+            )
+        else:
+            # NumPy is only imported by the uploads
+            from greenfield_python_sdk.storage_provider.integrity import (
+                compute_integrity_hash,
+                compute_integrity_hash_stream,
+            )
+
+            shards = (int(seg_size), int(data_blocks), int(parity_blocks))
+            if isinstance(reader, io.BytesIO):
+                expectCheckSums, size, redundancy_type = compute_integrity_hash(reader, *shards)
+            else:
+                expectCheckSums, size, redundancy_type = await compute_integrity_hash_stream(reader, *shards)
         return expectCheckSums, size, redundancy_type
 
     async def put_object(
@@ -112,12 +140,17 @@ class Object:
         object_name: str,
         object_size: int,
         primary_sp_address: str,
-        reader: bytes,
+        reader: ObjectSource,
         opts: PutObjectOptions,
     ) -> str:
         if object_size < 0:
             raise ValueError("object_size must be greater than 0")
 
+        # Files and async iterators are streamed instead of being read in memory
+        reader = object_payload(reader)
+        if isinstance(reader, ObjectPayload) and reader.size not in (None, object_size):
+            raise ValueError(f"object_size is {object_size} but the payload has {reader.size} bytes")
+
         check_valid_bucket_name(bucket_name)
         check_valid_object_name(object_name)
 
@@ -159,6 +192,16 @@ class Object:
         primary_sp_address: str,
         opts: GetObjectOption,
     ) -> Tuple[Any, ObjectInfo]:
+        stream = await self.get_object_stream(bucket_name, object_name, primary_sp_address, opts)
+        return stream.info, await stream.text()
+
+    async def get_object_stream(
+        self,
+        bucket_name: str,
+        object_name: str,
+        primary_sp_address: str,
+        opts: GetObjectOption,
+    ) -> ObjectStream:
         check_valid_bucket_name(bucket_name)
         check_valid_object_name(object_name)
 
@@ -172,16 +215,14 @@ class Object:
             expiry_timestamp=expiry,
         ).model_dump()
 
-        if opts.range != "":
+        if opts.range:
             request_metadata["range_info"] = opts.range
 
         response = await self.client.prepare_request(
             base_url,
             request_metadata,
         )
-        info = get_obj_info(object_name, response)
-        res = await response.text()
-        return info, res
+        return ObjectStream(get_obj_info(object_name, response), response)
 
     async def list_objects(
         self, bucket_name: str, primary_sp_address: str, opts: ListObjectsOptions
@@ -0,0 +1,118 @@
+import asyncio
+import io
+import os
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Optional, Union
+
+from greenfield_python_sdk.models.const import DEFAULT_STREAM_CHUNK_SIZE
+
+StreamSource = Union[os.PathLike, BinaryIO, AsyncIterable[bytes]]
+ObjectSource = Union[bytes, str, StreamSource]
+
+
+class ObjectPayload:
+    """The body of an object upload, read from a file path, a binary file or an async iterator of bytes.
+
+    It is sent in chunks of `chunk_size` bytes, aiohttp waits for each chunk to be written before asking for the
+    next one, so only a few chunks are in memory whatever the size of the object.
+    """
+
+    def __init__(self, source: StreamSource, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE):
+        if chunk_size <= 0:
+            raise Exception("chunk_size must be greater than 0")
+        if isinstance(source, os.PathLike) and os.path.isdir(source):
+            raise Exception("File name is a folder")
+        if isinstance(source, io.TextIOBase):
+            raise Exception("The file must be opened in binary mode")
+        if not isinstance(source, (os.PathLike, AsyncIterable)) and not hasattr(source, "read"):
+            raise Exception(f"Unsupported object payload: {type(source).__name__}")
+
+        self.source = source
+        self.chunk_size = chunk_size
+        # A seekable file is read again from this offset when the upload is retried
+        self._start = source.tell() if hasattr(source, "read") and _seekable(source) else None
+        self._sent = False
+
+    @property
+    def replayable(self) -> bool:
+        """Whether the body can be sent again, an async iterator or a stream that can't seek is consumed once."""
+        return isinstance(self.source, os.PathLike) or self._start is not None
+
+    @property
+    def size(self) -> Optional[int]:
+        """The number of bytes left to send, None for an async iterator or a stream that can't seek."""
+        if isinstance(self.source, os.PathLike):
+            return os.path.getsize(self.source)
+        if self._start is not None:
+            end = self.source.seek(0, io.SEEK_END)
+            self.source.seek(self._start)
+            return end - self._start
+        return None
+
+    def rewind(self):
+        """Puts a seekable file back at the offset it had when the payload was created."""
+        if self._start is not None:
+            self.source.seek(self._start)
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.chunks()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        if self._sent and not self.replayable:
+            raise Exception("The object payload was already sent and can't be read again")
+        self._sent = True
+
+        if isinstance(self.source, os.PathLike):
+            with open(self.source, "rb") as file:
+                async for chunk in self._read(file):
+                    yield chunk
+        elif hasattr(self.source, "read"):
+            self.rewind()
+            async for chunk in self._read(self.source):
+                yield chunk
+        else:
+            async for chunk in self._rechunk(self.source):
+                yield chunk
+
+    async def _read(self, file: BinaryIO) -> AsyncIterator[bytes]:
+        # The disk reads run in the default executor, an in-memory buffer is read in place
+        loop = asyncio.get_running_loop()
+        in_memory = isinstance(file, io.BytesIO)
+        while True:
+            chunk = (
+                file.read(self.chunk_size)
+                if in_memory
+                else await loop.run_in_executor(None, file.read, self.chunk_size)
+            )
+            if isinstance(chunk, str):
+                raise Exception("The file must be opened in binary mode")
+            if not chunk:
+                return
+            yield chunk
+
+    async def _rechunk(self, iterator: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        buffer = bytearray()
+        async for data in iterator:
+            if isinstance(data, str):
+                raise Exception("The async iterator must yield bytes")
+            buffer += data
+            while len(buffer) >= self.chunk_size:
+                yield bytes(buffer[: self.chunk_size])
+                del buffer[: self.chunk_size]
+        if buffer:
+            yield bytes(buffer)
+
+
+def _seekable(file) -> bool:
+    try:
+        return file.seekable()
+    except (AttributeError, ValueError):
+        return False
+
+
+def object_payload(
+    source: ObjectSource, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+) -> Union[bytes, str, ObjectPayload]:
+    """The bytes and the str are sent as they are, the other sources are streamed."""
+    if isinstance(source, (bytes, bytearray, memoryview, str)):
+        return source
+    return ObjectPayload(source, chunk_size)
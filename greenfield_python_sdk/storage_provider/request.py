@@ -2,7 +2,7 @@ import json
 import logging
 import re
 import urllib.request
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import aiohttp
@@ -11,6 +11,7 @@ import html_to_json
 from greenfield_python_sdk.key_manager import KeyManager
 from greenfield_python_sdk.models.const import USER_AGENT
 from greenfield_python_sdk.models.request import RequestMeta
+from greenfield_python_sdk.sp_directory import SpDirectory, WrongSpError, is_wrong_sp_answer
 from greenfield_python_sdk.storage_provider.utils import (
     convert_key,
     convert_value,
@@ -18,6 +19,7 @@ from greenfield_python_sdk.storage_provider.utils import (
     generate_url,
     generate_url_chunks,
 )
+from greenfield_python_sdk.utils.retry import RETRYABLE_STATUSES, RetryableError, RetryPolicy, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -27,19 +29,44 @@ class Client:
         self,
         network_url: str,
         key_manager: KeyManager,
-        sp_endpoints: dict,
+        sp_endpoints: Optional[dict],
+        retry_policy: Optional[RetryPolicy] = None,
+        sp_directory: Optional[SpDirectory] = None,
     ):
         self.network_url = network_url
         self.key_manager = key_manager
+        # Without given endpoints, the active SPs of the directory are used
         self.sp_endpoints = sp_endpoints
+        self.retry_policy = retry_policy
+        # Without the directory shared by the chain client, index the given endpoints once
+        self.sp_directory = sp_directory or SpDirectory.from_endpoints(sp_endpoints or {})
 
         self.headers = {"accept": "application/json", "User-Agent": USER_AGENT}
-        self.session: aiohttp.ClientSession
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._active_endpoints: Tuple[int, dict] = (-1, {})
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
         return self
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Opened with the first request
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=False))
+        return self._session
+
+    async def get_sp_endpoints(self) -> dict:
+        """The given endpoints, or the active SPs of the directory by operator address."""
+        if self.sp_endpoints is not None:
+            return self.sp_endpoints
+        self.sp_directory.start()
+        await self.sp_directory.ensure_fresh()
+        version, endpoints = self._active_endpoints
+        if version != self.sp_directory.version:
+            endpoints = {sp["operator_address"]: sp for sp in self.sp_directory.active()}
+            self._active_endpoints = (self.sp_directory.version, endpoints)
+        return endpoints
+
     @property
     def open(self) -> bool:
         if self.scheme not in ["http", "https"]:
@@ -56,9 +83,28 @@ class Client:
         headers: dict = None,
         data: Optional[Any] = None,
         type: Optional[str] = None,
+    ) -> Union[str, aiohttp.ClientResponse]:
+        if self.retry_policy is None:
+            return await self._fetch(method, url, headers, data, type)
+
+        # A PUT is only replayed when its body can be sent again
+        replayable = data is None or isinstance(data, (bytes, str)) or getattr(data, "replayable", False)
+        idempotent = method in ("GET", "HEAD") or (method == "PUT" and replayable)
+        return await self.retry_policy.run(
+            lambda: self._fetch(method, url, headers, data, type), endpoint=urlparse(url).netloc, idempotent=idempotent
+        )
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        data: Optional[Any] = None,
+        type: Optional[str] = None,
     ) -> Union[str, aiohttp.ClientResponse]:
         if type == "body":
             async with self.session.request(method, url, headers=headers) as response:
+                await self._raise_for_retry(response)
                 return await response.text()
         else:
             if method == "GET":
@@ -66,8 +112,7 @@ class Client:
             elif method == "PUT":
                 response = await self.session.put(url, data=data, headers=headers)
             if response.status >= 400:
-                if response.status == 503 or response.status == 504:
-                    raise Exception(f"Error {response.status}: \nyou may have used the wrong SP, retry!")
+                await self._raise_for_retry(response)
                 if response.status < 500:
                     converted_data = {
                         convert_key(key): convert_value(key, value) if value[0] else ""
@@ -78,13 +123,29 @@ class Client:
                 raise Exception(f"Error with response status: \n{await response.text()}")
             return response
 
+    @staticmethod
+    async def _raise_for_retry(response: aiohttp.ClientResponse):
+        if response.status < 400:
+            return
+        text = await response.text()
+        if is_wrong_sp_answer(text):
+            response.release()
+            raise WrongSpError(
+                f"Error {response.status}: \nnot the primary SP of the bucket: \n{text}", status=response.status
+            )
+        if response.status not in RETRYABLE_STATUSES:
+            return
+        message = f"Error with response status: \n{text}"
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        response.release()
+        raise RetryableError(message, status=response.status, retry_after=retry_after)
+
     async def _get_sp_url_by_addr(self, address: str, bucket_name: str = "") -> str:
-        if self.sp_endpoints:
-            if address in self.sp_endpoints:
+        if await self.get_sp_endpoints():
+            sp = await self.sp_directory.get_by_address(address)
+            if sp is not None:
                 return (
-                    self.sp_endpoints[address]["endpoint"]
-                    if bucket_name == ""
-                    else self.set_bucket_url(bucket_name, address=address)
+                    sp["endpoint"] if bucket_name == "" else self.set_bucket_url(bucket_name, endpoint=sp["endpoint"])
                 )
             else:
                 res = await self.fetch(
@@ -103,21 +164,25 @@ class Client:
             raise KeyError(f"Address {address} not found in sp_endpoints")
 
     async def _get_sp_url_by_id(self, id: int) -> str:
-        if self.sp_endpoints:
-            for key in self.sp_endpoints:
-                if self.sp_endpoints[key]["id"] == id:
-                    return self.sp_endpoints[key]["endpoint"]
+        if await self.get_sp_endpoints():
+            sp = await self.sp_directory.get_by_id(id)
+            if sp is not None:
+                return sp["endpoint"]
         else:
             raise KeyError(f"Id {id} not found in sp_endpoints")
 
     async def _get_in_service_sp(self):
-        if self.sp_endpoints:
-            return self.sp_endpoints[list(self.sp_endpoints.keys())[0]]["endpoint"]
+        sp_endpoints = await self.get_sp_endpoints()
+        if sp_endpoints:
+            return sp_endpoints[list(sp_endpoints.keys())[0]]["endpoint"]
         else:
             raise KeyError("No sp in service")
 
     def set_bucket_url(self, bucket_name: str, address: str = "", endpoint: str = "") -> str:
-        url = urlparse(self.sp_endpoints[address]["endpoint"]) if address != "" else urlparse(endpoint)
+        if address != "":
+            sp = self.sp_endpoints[address] if self.sp_endpoints is not None else self.sp_directory.by_address(address)
+            endpoint = sp["endpoint"]
+        url = urlparse(endpoint)
         if url.scheme not in ["http", "https"]:
             raise ValueError(f"Invalid scheme: {url.scheme}")
         return url.scheme + "://" + bucket_name + "." + url.netloc
@@ -176,5 +241,6 @@ class Client:
         await self.close()
 
     async def close(self):
-        if self.session:
-            await self.session.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -179,6 +179,10 @@ async def generate_headers(metadata, key_manager: KeyManager) -> Dict[str, str]:
     if metadata["content_type"]:
         headers["Content-Type"] = metadata["content_type"]
 
+    # The signed headers are kept in the sorted order of the canonical request
+    if metadata.get("range_info"):
+        headers["Range"] = metadata["range_info"]
+
     if metadata["expiry_timestamp"]:
         headers["X-Gnfd-Expiry-Timestamp"] = metadata["expiry_timestamp"]
 
@@ -220,12 +224,14 @@ def compute_integrity_hash_go(
     ]
     data_redundancy.restype = ctypes.c_void_p
 
+    # The hash of the segments then one hash per piece index, of 32 bytes each
+    parts_count = data_shards + parity_shards + 1
     data_redundancy_output = ctypes.string_at(
-        data_redundancy(segment_size, data_shards, parity_shards, content_lenght, c_data, c_serial), 224
+        data_redundancy(segment_size, data_shards, parity_shards, content_lenght, c_data, c_serial), 32 * parts_count
     )
 
-    part_size = len(data_redundancy_output) // 7
-    parts = [data_redundancy_output[i * part_size : (i + 1) * part_size] for i in range(7)]
+    part_size = len(data_redundancy_output) // parts_count
+    parts = [data_redundancy_output[i * part_size : (i + 1) * part_size] for i in range(parts_count)]
 
     return parts, content_lenght, RedundancyType.REDUNDANCY_EC_TYPE
 
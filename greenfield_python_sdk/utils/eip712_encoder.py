@@ -0,0 +1,172 @@
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Tuple
+
+import betterproto
+from betterproto import Casing
+from eth_abi import encode as encode_abi
+from hexbytes import HexBytes
+from sha3 import keccak_256
+
+ZERO_WORD = bytes(32)
+
+# Types of the structs with a type and a value field that are not an Any, the dict conversion keeps their value
+IGNORED_TYPES = [
+    "PRINCIPAL_TYPE_UNSPECIFIED",
+    "PRINCIPAL_TYPE_GNFD_ACCOUNT",
+    "PRINCIPAL_TYPE_GNFD_GROUP",
+]
+
+StructEncoder = Callable[[Any], bytes]
+
+
+class UnsupportedValue(Exception):
+    """The value is rewritten by the dict conversion of the messages, it can't be encoded straight from the proto."""
+
+
+class MessageValue(NamedTuple):
+    """A tx message with the type_url its `type` field is filled from, and the fields the dict conversion rewrites."""
+
+    type_url: str
+    message: betterproto.Message
+    overrides: Mapping[str, Any] = {}
+
+
+def _keccak(value: bytes) -> bytes:
+    return keccak_256(value).digest()
+
+
+_message_fields: Dict[type, Mapping[str, str]] = {}
+
+
+def message_fields(message: betterproto.Message) -> Mapping[str, str]:
+    """EIP-712 field names of a proto message, as given by `to_pydict`, mapped to its attributes."""
+    fields = _message_fields.get(type(message))
+    if fields is None:
+        fields = {}
+        for field_name, meta in message._betterproto.meta_by_field_name.items():
+            if meta.proto_type == betterproto.TYPE_MAP:
+                continue
+            fields[Casing.SNAKE(field_name).rstrip("_")] = field_name
+        _message_fields[type(message)] = fields
+    return fields
+
+
+def _field_getter(value) -> Callable[[str], Any]:
+    if isinstance(value, dict):
+        return value.__getitem__
+
+    if isinstance(value, MessageValue):
+        message = value.message
+        fields = message_fields(message)
+        # The dict conversion swaps these keys and the Any values of the message
+        if "type" in fields or "type_url" in fields or "value" in fields:
+            raise UnsupportedValue(f"{type(message).__name__} has a type or value field")
+
+        def get(name: str):
+            if name == "type":
+                return value.type_url
+            if name in value.overrides:
+                return value.overrides[name]
+            return getattr(message, fields[name])
+
+        return get
+
+    if isinstance(value, betterproto.Message):
+        fields = message_fields(value)
+        if "type_url" in fields or (
+            "type" in fields and "value" in fields and getattr(value, fields["type"]) not in IGNORED_TYPES
+        ):
+            raise UnsupportedValue(f"{type(value).__name__} is an Any")
+        return lambda name: getattr(value, fields[name])
+
+    raise UnsupportedValue(f"Can't encode {type(value).__name__} as a struct")
+
+
+def _word_encoder(typ: str) -> Callable[[Any], bytes]:
+    if typ.startswith("uint"):
+        bound = 2 ** int(typ[len("uint") :] or 256)
+
+        def encode_uint(value) -> bytes:
+            if type(value) is int and 0 <= value < bound:
+                return value.to_bytes(32, "big")
+            return encode_abi([typ], [value])
+
+        return encode_uint
+
+    if typ == "bool":
+
+        def encode_bool(value) -> bytes:
+            if type(value) is bool:
+                return (b"\x00" * 31) + (b"\x01" if value else b"\x00")
+            return encode_abi([typ], [value])
+
+        return encode_bool
+
+    return lambda value: encode_abi([typ], [value])
+
+
+def _field_encoder(typ: str, types: Mapping, structs: Dict[str, StructEncoder]) -> Callable[[Any], bytes]:
+    """Encodes a field into its 32 bytes word, as `sign_utils.encode_data` does."""
+    if typ in types:
+
+        def encode_struct(value) -> bytes:
+            if value is None:
+                raise UnsupportedValue(f"Missing {typ}")
+            return _keccak(structs[typ](value))
+
+        return encode_struct
+
+    bytes_like = "bytes" in typ
+    int_like = "int" in typ
+
+    if typ == "bytes":
+        encode = _keccak
+    elif typ == "string":
+
+        def encode(value) -> bytes:
+            return _keccak(value.encode("utf-8"))
+
+    elif typ.endswith("]"):
+        encode_element = _field_encoder(typ[: typ.rindex("[")], types, structs)
+
+        def encode(value) -> bytes:
+            return _keccak(b"".join([encode_element(element) for element in value]))
+
+    else:
+        encode = _word_encoder(typ)
+
+    def encode_field(value) -> bytes:
+        if value is None:
+            raise UnsupportedValue(f"Missing value of type {typ}")
+        if bytes_like and isinstance(value, str):
+            value = HexBytes(value)
+        if int_like and isinstance(value, str):
+            value = int(value)
+        return encode(value)
+
+    return encode_field
+
+
+def compile_struct_encoders(types: Mapping, type_hashes: Mapping[str, bytes]) -> Dict[str, StructEncoder]:
+    """
+    Compiles an encoder for each struct of the types. The encoders read the fields straight from the proto
+    messages, or from dicts, and return the same bytes as `sign_utils.encode_data` does for the dict conversion
+    of these messages. They raise instead of skipping the fields `encode_data` fails to encode.
+    """
+    structs: Dict[str, StructEncoder] = {}
+
+    for name, fields in types.items():
+        plan: Tuple[Tuple[str, Callable[[Any], bytes]], ...] = tuple(
+            (field["name"], _field_encoder(field["type"], types, structs)) for field in fields
+        )
+
+        def encode_struct(value, type_hash: bytes = type_hashes[name], plan=plan) -> bytes:
+            get = _field_getter(value)
+            return type_hash + b"".join([encode_field(get(field_name)) for field_name, encode_field in plan])
+
+        structs[name] = encode_struct
+
+    return structs
+
+
+def hash_struct(structs: Mapping[str, StructEncoder], primary_type: str, value) -> bytes:
+    return _keccak(structs[primary_type](value))
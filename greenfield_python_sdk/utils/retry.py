@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import aiohttp
+
+from greenfield_python_sdk.models.const import (
+    DEFAULT_BREAKER_FAILURE_THRESHOLD,
+    DEFAULT_BREAKER_RESET_TIMEOUT,
+    DEFAULT_RETRY_ATTEMPTS,
+    DEFAULT_RETRY_BASE_DELAY,
+    DEFAULT_RETRY_MAX_DELAY,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses meaning the server is overloaded or temporarily unavailable
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+
+class RetryableError(Exception):
+    """The request failed for a transient reason, `retry_after` carries the delay asked by the server if any."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Short-circuits the requests to an endpoint after `failure_threshold` failures in a row.
+
+    After `reset_timeout` seconds a single probe request is let through, closing the circuit when it succeeds and
+    opening it again otherwise.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_BREAKER_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class RetryPolicy:
+    """Retries the transient failures with exponential backoff and full jitter, honouring `Retry-After`.
+
+    Non idempotent requests, i.e. the tx broadcasts, are only retried when the connection could not be
+    established, as nothing was sent then. Each endpoint gets its own `CircuitBreaker`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        base_delay: float = DEFAULT_RETRY_BASE_DELAY,
+        max_delay: float = DEFAULT_RETRY_MAX_DELAY,
+        failure_threshold: int = DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_BREAKER_RESET_TIMEOUT,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[endpoint]
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    @staticmethod
+    def is_retryable(error: Exception, idempotent: bool) -> bool:
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        if not idempotent:
+            return False
+        return isinstance(
+            error,
+            (
+                RetryableError,
+                aiohttp.ServerDisconnectedError,
+                aiohttp.ClientOSError,
+                asyncio.TimeoutError,
+                ConnectionError,
+            ),
+        )
+
+    async def run(self, call: Callable[[], Awaitable[T]], endpoint: Optional[str] = None, idempotent: bool = True) -> T:
+        breaker = self.breaker(endpoint) if endpoint is not None else None
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {endpoint}, too many failures")
+            try:
+                result = await call()
+            except Exception as e:
+                retryable = self.is_retryable(e, idempotent)
+                if breaker is not None:
+                    # An endpoint answering with a non transient error is still up
+                    if retryable:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if not retryable or attempt + 1 >= self.max_attempts:
+                    raise
+                delay = self.delay(attempt, getattr(e, "retry_after", None))
+                attempt += 1
+                logger.debug(f"Retrying {endpoint or 'request'} in {delay:.2f}s after {e!r}")
+                await asyncio.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
@@ -1,12 +1,14 @@
 import base64
 import json
 import re
+from functools import lru_cache
 from logging import getLogger
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
 
+import coincurve
 from betterproto import Casing
 from eth_abi import encode as encode_abi
-from eth_account import Account
 from eth_typing import Hash32, HexStr
 from hexbytes import HexBytes
 from sha3 import keccak_256
@@ -15,25 +17,28 @@ from greenfield_python_sdk.__version__ import __version__
 from greenfield_python_sdk.key_manager import KeyManager
 from greenfield_python_sdk.models.eip712_messages import TYPES_MAP, URL_TO_PROTOS_TYPE_MAP
 from greenfield_python_sdk.models.eip712_messages.base import BASE_TYPES
+from greenfield_python_sdk.models.eip712_messages.group.group_url import RENEW_GROUP_MEMBER, UPDATE_GROUP_MEMBER
 from greenfield_python_sdk.models.eip712_messages.sp.sp_url import CREATE_STORAGE_PROVIDER
 from greenfield_python_sdk.models.eip712_messages.staking.staking_url import CREATE_VALIDATOR
-from greenfield_python_sdk.models.storage_provider import Any
 from greenfield_python_sdk.models.transaction import BroadcastOption
 from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import Tx
+from greenfield_python_sdk.utils.eip712_encoder import (
+    IGNORED_TYPES,
+    MessageValue,
+    StructEncoder,
+    compile_struct_encoders,
+    message_fields,
+)
+from greenfield_python_sdk.utils.eip712_encoder import hash_struct as hash_struct_direct
 from greenfield_python_sdk.utils.type_url_exception_utils import (
     decode_sp_approval,
-    rmv_unneeded_groups_type_index,
+    member_expiration_time,
     set_group_index_timestamp,
     set_message,
     set_value,
+    unneeded_type_fields,
 )
 
-IGNORED_TYPES = [
-    "PRINCIPAL_TYPE_UNSPECIFIED",
-    "PRINCIPAL_TYPE_GNFD_ACCOUNT",
-    "PRINCIPAL_TYPE_GNFD_GROUP",
-]
-
 logger = getLogger(__name__)
 
 
@@ -46,16 +51,17 @@ def fast_keccak(value: bytes) -> bytes:
     return keccak_256(value).digest()
 
 
-def encode_data(primary_type: str, data, types):
+def encode_data(primary_type: str, data, types, type_hashes: Optional[Mapping[str, bytes]] = None):
     """
     Encode structured data as per Ethereum's signTypeData_v4.
 
     https://docs.metamask.io/guide/signing-data.html#sign-typed-data-v4
 
-    This code is ported from the Javascript "eth-sig-util" package.
+    This code is ported from the Javascript "eth-sig-util" package. The type hashes precomputed by
+    `compile_schema` are used when given.
     """
     encoded_types = ["bytes32"]
-    encoded_values = [hash_type(primary_type, types)]
+    encoded_values = [type_hashes[primary_type] if type_hashes is not None else hash_type(primary_type, types)]
 
     def _encode_field(name, typ, value):
         if typ in types:
@@ -65,7 +71,7 @@ def encode_data(primary_type: str, data, types):
                     "0x0000000000000000000000000000000000000000000000000000000000000000",
                 ]
             else:
-                return ["bytes32", fast_keccak(encode_data(typ, value, types))]
+                return ["bytes32", fast_keccak(encode_data(typ, value, types, type_hashes))]
 
         if value is None:
             raise Exception(f"Missing value for field {name} of type {type}")
@@ -113,12 +119,13 @@ def encode_data(primary_type: str, data, types):
     return encode_abi(encoded_types, encoded_values)
 
 
-def encode_type(primary_type: str, types) -> str:
+def encode_type(primary_type: str, types, dependencies: Optional[Sequence[str]] = None) -> str:
+    """The dependencies, the primary type first then the others sorted, are looked up when not given."""
     result = ""
-    deps = find_type_dependencies(primary_type, types)
-    deps = sorted([d for d in deps if d != primary_type])
-    deps = [primary_type] + deps
-    for typ in deps:
+    if dependencies is None:
+        deps = find_type_dependencies(primary_type, types)
+        dependencies = [primary_type] + sorted([d for d in deps if d != primary_type])
+    for typ in dependencies:
         children = types[typ]
         if not children:
             raise Exception(f"No type definition specified: {type}")
@@ -146,15 +153,15 @@ def find_type_dependencies(primary_type: str, types, results=None):
     return results
 
 
-def hash_type(primary_type: str, types) -> Hash32:
-    return fast_keccak(encode_type(primary_type, types).encode())
+def hash_type(primary_type: str, types, dependencies: Optional[Sequence[str]] = None) -> Hash32:
+    return fast_keccak(encode_type(primary_type, types, dependencies).encode())
 
 
-def hash_struct(primary_type: str, data, types) -> Hash32:
-    return fast_keccak(encode_data(primary_type, data, types))
+def hash_struct(primary_type: str, data, types, type_hashes: Optional[Mapping[str, bytes]] = None) -> Hash32:
+    return fast_keccak(encode_data(primary_type, data, types, type_hashes))
 
 
-def eip712_encode(typed_data: Dict[str, Any]) -> List[bytes]:
+def eip712_encode(typed_data: Dict[str, Any], type_hashes: Optional[Mapping[str, bytes]] = None) -> List[bytes]:
     """
     Given a dict of structured data and types, return a 3-element list of
     the encoded, signable data.
@@ -166,7 +173,7 @@ def eip712_encode(typed_data: Dict[str, Any]) -> List[bytes]:
     try:
         parts = [
             bytes.fromhex("1901"),
-            hash_struct("EIP712Domain", typed_data["domain"], typed_data["types"]),
+            hash_struct("EIP712Domain", typed_data["domain"], typed_data["types"], type_hashes),
         ]
         if typed_data["primaryType"] != "EIP712Domain":
             parts.append(
@@ -174,6 +181,7 @@ def eip712_encode(typed_data: Dict[str, Any]) -> List[bytes]:
                     typed_data["primaryType"],
                     typed_data["message"],
                     typed_data["types"],
+                    type_hashes,
                 )
             )
         return parts
@@ -181,12 +189,13 @@ def eip712_encode(typed_data: Dict[str, Any]) -> List[bytes]:
         raise ValueError(f"Not valid {typed_data}; Error at --> {exc}") from exc
 
 
-def eip712_encode_hash(typed_data: Dict[str, Any]) -> Hash32:
+def eip712_encode_hash(typed_data: Dict[str, Any], type_hashes: Optional[Mapping[str, bytes]] = None) -> Hash32:
     """
     :param typed_data: EIP712 structured data and types
+    :param type_hashes: Precomputed hashes of the types
     :return: Keccak256 hash of encoded signable data
     """
-    return fast_keccak(b"".join(eip712_encode(typed_data)))
+    return fast_keccak(b"".join(eip712_encode(typed_data, type_hashes)))
 
 
 def eip712_signature(hashed_payload: bytes, private_key: Union[HexStr, bytes]) -> bytes:
@@ -199,9 +208,9 @@ def eip712_signature(hashed_payload: bytes, private_key: Union[HexStr, bytes]) -
     elif isinstance(private_key, bytes):
         private_key = private_key.hex()
 
-    account = Account.from_key(private_key)
-    signature = account.signHash(hashed_payload)["signature"]
-    return signature
+    # The recoverable signature of eth_account's signHash, without importing eth_account
+    signature = coincurve.PrivateKey(bytes.fromhex(private_key)).sign_recoverable(hashed_payload, hasher=None)
+    return HexBytes(signature[:64] + bytes([signature[64] + 27]))
 
 
 def deep_sort(obj):
@@ -257,23 +266,148 @@ def swap_type_url_key(obj):
         return obj
 
 
+TX_TYPE = [
+    {"name": "account_number", "type": "uint256"},
+    {"name": "chain_id", "type": "uint256"},
+    {"name": "fee", "type": "Fee"},
+    {"name": "memo", "type": "string"},
+    {"name": "sequence", "type": "uint256"},
+    {"name": "timeout_height", "type": "uint256"},
+]
+
+
+class CompiledSchema(NamedTuple):
+    """EIP-712 types of a tx, sorted and frozen, with the dependencies, the hash and the direct encoder of each type."""
+
+    types: Mapping[str, Tuple[Mapping[str, str], ...]]
+    dependencies: Mapping[str, Tuple[str, ...]]
+    type_hashes: Mapping[str, bytes]
+    encoders: Mapping[str, StructEncoder]
+
+
+def message_types(type_url: str, index: int = 0, unneeded_fields: FrozenSet[str] = frozenset()) -> dict:
+    """Types of the message at `index` in the tx, renamed from Msg1 to its position. TYPES_MAP is never modified."""
+    tx_types = TYPES_MAP[type_url]
+    if unneeded_fields:
+        tx_types = {**tx_types, "Msg1": [field for field in tx_types["Msg1"] if field["name"] not in unneeded_fields]}
+
+    if index > 0:
+        tx_types = {
+            key.replace("Msg1", f"Msg{index+1}"): [
+                {**item, "type": item["type"].replace("Msg1", f"Msg{index+1}")} if "Msg1" in item["type"] else item
+                for item in value
+            ]
+            for key, value in tx_types.items()
+            if "Msg1" in key
+        }
+    return tx_types
+
+
+@lru_cache(maxsize=256)
+def compile_schema(messages: Tuple[Tuple[str, FrozenSet[str]], ...]) -> CompiledSchema:
+    """
+    Compiles the EIP-712 types of a tx made of the given messages, each one given as its type_url and the fields
+    left out of its type. The result only depends on these, so it is cached.
+    """
+    tx_type = {"Tx": TX_TYPE + [{"name": f"msg{i+1}", "type": f"Msg{i+1}"} for i in range(len(messages))]}
+    full_types = {**BASE_TYPES, **tx_type}
+    for i, (type_url, unneeded_fields) in enumerate(messages):
+        full_types = full_types | message_types(type_url, i, unneeded_fields)
+    full_types = sorted_dict(full_types)
+
+    dependencies = {}
+    type_hashes = {}
+    for name in full_types:
+        deps = find_type_dependencies(name, full_types)
+        dependencies[name] = tuple([name] + sorted(dep for dep in deps if dep != name))
+        type_hashes[name] = hash_type(name, full_types, dependencies[name])
+
+    types = MappingProxyType(
+        {name: tuple(MappingProxyType(dict(field)) for field in fields) for name, fields in full_types.items()}
+    )
+    return CompiledSchema(
+        types=types,
+        dependencies=MappingProxyType(dependencies),
+        type_hashes=MappingProxyType(type_hashes),
+        encoders=MappingProxyType(compile_struct_encoders(types, type_hashes)),
+    )
+
+
+def tx_schema(tx_messages, message) -> CompiledSchema:
+    return compile_schema(
+        tuple(
+            (message_url.type_url, unneeded_type_fields(message_url.type_url, message[i]))
+            for i, message_url in enumerate(tx_messages)
+        )
+    )
+
+
+def tx_domain(chain_id: int) -> dict:
+    return {
+        "name": "Greenfield Tx",
+        "version": "1.0.0",
+        "chainId": chain_id,
+        "verifyingContract": "greenfield",
+        "salt": "0",
+    }
+
+
+def encode_tx_hash(schema: CompiledSchema, tx: Tx, message, chain_id: int, account_number, sequence) -> Hash32:
+    """
+    Hash to sign for the tx, encoded straight from the proto messages converted by `set_message`.
+
+    It matches `eip712_encode_hash` of the dict conversion of the messages, reading the fields this conversion
+    rewrites from `rewritten_fields`, and raises on the values it can't encode the same way.
+    """
+    tx_message = {
+        "account_number": account_number,
+        "chain_id": str(chain_id),
+        "fee": tx.auth_info.fee,
+        "memo": "",
+        "sequence": sequence,
+        "timeout_height": "0",
+    }
+    for i, message_url in enumerate(tx.body.messages):
+        tx_message[f"msg{i+1}"] = MessageValue(
+            message_url.type_url, message[i], rewritten_fields(message_url.type_url, message[i])
+        )
+
+    domain_hash = hash_struct_direct(schema.encoders, "EIP712Domain", tx_domain(chain_id))
+    return fast_keccak(b"\x19\x01" + domain_hash + hash_struct_direct(schema.encoders, "Tx", tx_message))
+
+
 async def get_signatures(
-    key_manager: KeyManager, tx: Tx, message, chain_id: int, broadcast_option: Optional[BroadcastOption] = None
+    key_manager: KeyManager,
+    tx: Tx,
+    message,
+    chain_id: int,
+    broadcast_option: Optional[BroadcastOption] = None,
+    direct_encoding: bool = True,
 ):
-    tx_type = {
-        "Tx": [
-            {"name": "account_number", "type": "uint256"},
-            {"name": "chain_id", "type": "uint256"},
-            {"name": "fee", "type": "Fee"},
-            {"name": "memo", "type": "string"},
-            {"name": "sequence", "type": "uint256"},
-            {"name": "timeout_height", "type": "uint256"},
-        ],
-    }
-    for i in range(0, len(message)):
-        tx_type["Tx"].append({"name": f"msg{i+1}", "type": f"Msg{i+1}"})
+    # The types depend on the messages before set_message converts them
+    schema = tx_schema(tx.body.messages, message)
+    for i, message_url in enumerate(tx.body.messages):
+        message[i] = set_message(message_url.type_url, message[i], broadcast_option)
 
-    full_types = {**BASE_TYPES, **tx_type}
+    eip712_hash = None
+    if direct_encoding:
+        try:
+            eip712_hash = encode_tx_hash(
+                schema, tx, message, chain_id, key_manager.account.account_number, key_manager.account.next_sequence
+            )
+        except Exception as e:
+            # The messages it can't encode are listed by the tests, another one means the two encodings diverged
+            logger.warning(f"Encoding the tx from its dict conversion: {e!r}")
+
+    if eip712_hash is None:
+        eip712_hash = encode_tx_hash_from_dict(schema, tx, message, chain_id, key_manager)
+
+    signature = eip712_signature(eip712_hash, key_manager.private_key)
+    signature = bytes.fromhex(signature.hex()[2:])
+    return signature
+
+
+def encode_tx_hash_from_dict(schema: CompiledSchema, tx: Tx, message, chain_id: int, key_manager: KeyManager):
     tx_message = {
         "account_number": key_manager.account.account_number,
         "chain_id": str(chain_id),
@@ -283,23 +417,15 @@ async def get_signatures(
         "timeout_height": "0",
     }
 
-    all_messages, full_types = set_messages(tx.body.messages, message, full_types, broadcast_option)
+    all_messages = message_dicts(tx.body.messages, message)
 
     tx_message = tx_message | all_messages
     tx_message = deep_sort(tx_message)
 
-    full_types = sorted_dict(full_types)
-
     payload = {
-        "types": full_types,
+        "types": schema.types,
         "primaryType": "Tx",
-        "domain": {
-            "name": "Greenfield Tx",
-            "version": "1.0.0",
-            "chainId": chain_id,
-            "verifyingContract": "greenfield",
-            "salt": "0",
-        },
+        "domain": tx_domain(chain_id),
         "message": tx_message,
     }
 
@@ -308,32 +434,40 @@ async def get_signatures(
     payload["message"]["fee"]["amount"] = [
         {"amount": entry["amount"], "denom": entry["denom"]} for entry in payload["message"]["fee"]["amount"]
     ]
-    eip712_hash = eip712_encode_hash(payload)
-    signature = eip712_signature(eip712_hash, key_manager.private_key)
-    signature = bytes.fromhex(signature.hex()[2:])
-    return signature
+    return eip712_encode_hash(payload, schema.type_hashes)
 
 
-def set_messages(tx, message, full_types, broadcast_option: Optional[BroadcastOption] = None):
-    all_messages = {}
+def policy_expiration_time(message) -> str:
+    return message.expiration_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ") if message.expiration_time.year != 1969 else ""
 
-    for i, message_url in enumerate(tx):
-        tx_types = TYPES_MAP[message_url.type_url]
-        tx_types = rmv_unneeded_groups_type_index(message_url.type_url, message[i], tx_types)
-
-        if len(message) > 1 and i > 0:
-            tx_types = {
-                key.replace("Msg1", f"Msg{i+1}"): [
-                    {**item, "type": item["type"].replace("Msg1", f"Msg{i+1}")} if "Msg1" in item["type"] else item
-                    for item in value
-                ]
-                for key, value in tx_types.items()
-                if "Msg1" in key
-            }
 
-        full_types = full_types | {**tx_types}
+def struct_fields(message, **rewritten) -> dict:
+    return {name: getattr(message, attribute) for name, attribute in message_fields(message).items()} | rewritten
 
-        message[i] = set_message(message_url.type_url, message[i], broadcast_option)
+
+def member_structs(members) -> list:
+    return [struct_fields(member, expiration_time=member_expiration_time(member)) for member in members]
+
+
+def rewritten_fields(type_url: str, message) -> dict:
+    """The fields `message_dicts` rewrites in the dict conversion of a message, with their rewritten values."""
+    if type_url == UPDATE_GROUP_MEMBER:
+        return {"members_to_add": member_structs(message.members_to_add)}
+    if type_url == RENEW_GROUP_MEMBER:
+        return {"members": member_structs(message.members)}
+    if not hasattr(message, "statements"):
+        return {}
+    return {
+        "statements": [struct_fields(message.statements[0], expiration_time=""), *message.statements[1:]],
+        "expiration_time": policy_expiration_time(message),
+    }
+
+
+def message_dicts(tx, message):
+    """Dict conversion of the messages, once converted by `set_message`."""
+    all_messages = {}
+
+    for i, message_url in enumerate(tx):
         msg = {
             "type": message_url.type_url,  # Swaps the type_url key for the type key
             **message[i].to_pydict(casing=Casing.SNAKE, include_default_values=True),
@@ -361,14 +495,10 @@ def set_messages(tx, message, full_types, broadcast_option: Optional[BroadcastOp
             if not msg["statements"][0]["resources"]:
                 del msg["statements"][0]["resources"]
             msg["statements"][0]["expiration_time"] = ""
-            msg["expiration_time"] = (
-                message[i].expiration_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-                if message[i].expiration_time.year != 1969
-                else ""
-            )
+            msg["expiration_time"] = policy_expiration_time(message[i])
 
         all_messages = all_messages | {f"msg{i+1}": msg}
-    return all_messages, full_types
+    return all_messages
 
 
 def sorted_dict(full_types):
@@ -3,7 +3,7 @@ import binascii
 import json
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import FrozenSet, Optional
 
 from betterproto import Casing
 
@@ -110,22 +110,29 @@ def decode_sp_approval(message, type_url: str):
     return message
 
 
-def rmv_unneeded_groups_type_index(type_url: str, message, tx_types: dict):
-    if type_url == CREATE_GROUP and tx_types["Msg1"][3]["name"] == "members":
-        del tx_types["Msg1"][3]
+def unneeded_type_fields(type_url: str, message) -> FrozenSet[str]:
+    """Fields of the message type left out of the EIP-712 types, as the chain skips these empty lists."""
+    if type_url == CREATE_GROUP:
+        return frozenset(["members"])
     if type_url == UPDATE_GROUP_MEMBER:
-        if len(message.members_to_delete) == 0 and len(tx_types["Msg1"]) == 6:
-            del tx_types["Msg1"][5]
-        if len(message.members_to_add) == 0 and tx_types["Msg1"][4]["name"] == "members_to_add":
-            del tx_types["Msg1"][4]
-    return tx_types
+        fields = []
+        if len(message.members_to_delete) == 0:
+            fields.append("members_to_delete")
+        if len(message.members_to_add) == 0:
+            fields.append("members_to_add")
+        return frozenset(fields)
+    return frozenset()
+
+
+def member_expiration_time(member) -> str:
+    return member.expiration_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def set_group_index_timestamp(message, final_message, type_url: str):
     if type_url == UPDATE_GROUP_MEMBER:
         if hasattr(message, "members_to_add"):
             for j, members in enumerate(final_message["members_to_add"]):
-                members["expiration_time"] = message.members_to_add[j].expiration_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+                members["expiration_time"] = member_expiration_time(message.members_to_add[j])
         if len(message.members_to_delete) == 0:
             final_message.pop("members_to_delete")
         if len(message.members_to_add) == 0:
@@ -133,7 +140,7 @@ def set_group_index_timestamp(message, final_message, type_url: str):
 
     if type_url == RENEW_GROUP_MEMBER:
         for j, members in enumerate(final_message["members"]):
-            members["expiration_time"] = message.members[j].expiration_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+            members["expiration_time"] = member_expiration_time(message.members[j])
 
     return final_message
 
@@ -0,0 +1,30 @@
+import pytest
+
+from greenfield_python_sdk.blockchain.cache import ByteLRUCache
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_byte_lru_cache_evicts_by_size():
+    cache = ByteLRUCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    cache.put("c", b"1234")
+
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.size == 8
+
+
+def test_byte_lru_cache_replaces_and_skips_oversized_values():
+    cache = ByteLRUCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("a", b"12")
+    cache.put("big", b"x" * 11)
+
+    assert cache.size == 2
+    assert "big" not in cache
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (0, 1)
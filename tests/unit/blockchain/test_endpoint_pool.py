@@ -0,0 +1,125 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer, unused_port
+
+from greenfield_python_sdk.blockchain.endpoint_pool import Endpoint, EndpointPool
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.blockchain.utils import CustomChannel
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+async def start_node(height=100, catching_up=False):
+    async def status(request):
+        server.requests += 1
+        sync_info = {"latest_block_height": str(server.height), "catching_up": server.catching_up}
+        return web.json_response({"result": {"sync_info": sync_info}})
+
+    async def abci_query(request):
+        server.requests += 1
+        return web.json_response({"result": {"response": {"value": ""}}})
+
+    app = web.Application()
+    app.router.add_get("/status", status)
+    app.router.add_get("/abci_query", abci_query)
+    server = TestServer(app)
+    server.requests = 0
+    server.height = height
+    server.catching_up = catching_up
+    await server.start_server()
+    server.url = f"http://{server.host}:{server.port}"
+    return server
+
+
+@pytest.fixture
+async def nodes():
+    nodes = [await start_node(), await start_node()]
+    yield nodes
+    for node in nodes:
+        await node.close()
+
+
+@pytest.fixture
+async def transport():
+    transport = RpcTransport("http://localhost", timeout=5)
+    yield transport
+    await transport.close()
+
+
+async def test_pick_prefers_fast_and_idle_endpoints(transport):
+    pool = EndpointPool(["http://a", "http://b", "http://a"], transport)
+    a, b = pool.endpoints
+
+    assert len(pool.endpoints) == 2
+    a.record_success(0.1)
+    assert pool.pick() is b
+
+    b.record_success(0.05)
+    assert pool.pick() is b
+    b.in_flight = 3
+    assert pool.pick() is a
+    assert pool.pick(exclude=[a]) is b
+
+
+async def test_failover_and_ejection(transport, nodes):
+    down = f"http://localhost:{unused_port()}"
+    pool = EndpointPool([down, nodes[0].url], transport, max_failures=2)
+
+    for _ in range(2):
+        await pool.run(lambda url: transport.get("/status", base_url=url))
+
+    assert nodes[0].requests == 2
+    assert not pool.endpoints[0].healthy
+    assert pool.pick() is pool.endpoints[1]
+
+    with pytest.raises(aiohttp.ClientError):
+        await pool.run(lambda url: transport.get("/status", base_url=down), failover=False)
+
+
+async def test_health_check_ejects_and_readmits(transport, nodes):
+    lagging = await start_node(height=50)
+    syncing = await start_node(catching_up=True)
+    pool = EndpointPool([node.url for node in (*nodes, lagging, syncing)], transport)
+
+    await pool.check_health()
+    assert [endpoint.healthy for endpoint in pool.endpoints] == [True, True, False, False]
+    assert pool.endpoints[2].latest_height == 50
+
+    lagging.height = 99
+    await pool.check_health()
+    assert pool.endpoints[2].healthy
+
+    await lagging.close()
+    await syncing.close()
+
+
+async def test_broadcast_endpoint_is_sticky(transport):
+    pool = EndpointPool(["http://a", "http://b"], transport)
+    endpoint = pool.broadcast_endpoint
+    other = pool.endpoints[1] if endpoint is pool.endpoints[0] else pool.endpoints[0]
+
+    endpoint.in_flight = 10
+    endpoint.record_success(1.0)
+    assert pool.broadcast_endpoint is endpoint
+
+    endpoint.eject(30)
+    assert pool.broadcast_endpoint is other
+
+
+async def test_channel_spreads_queries(transport, nodes):
+    pool = EndpointPool([node.url for node in nodes], transport)
+    channel = CustomChannel("http://localhost", 0, transport=transport, pool=pool)
+
+    await asyncio.gather(*[channel.abci_query("/greenfield.storage.Query/Params", b"") for _ in range(10)])
+    assert all(node.requests > 0 for node in nodes)
+    assert sum(node.requests for node in nodes) == 10
+
+
+async def test_endpoint_latency_ewma():
+    endpoint = Endpoint("http://a", ewma_alpha=0.5)
+    endpoint.record_success(1.0)
+    endpoint.record_success(0.0)
+    assert endpoint.latency == 0.5
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from greenfield_python_sdk.blockchain.gas import PLACEHOLDER_SIGNATURE, GasEstimator, GasProfile
+from greenfield_python_sdk.blockchain_client import BlockchainClient
+from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.key_manager import KeyManager
+from greenfield_python_sdk.models.eip712_messages.bank.msg_send import TYPE_URL as SEND
+from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import MsgSend
+from greenfield_python_sdk.protos.cosmos.base.abci.v1beta1 import GasInfo
+from greenfield_python_sdk.protos.cosmos.base.v1beta1 import Coin
+from greenfield_python_sdk.protos.cosmos.tx.v1beta1 import SimulateResponse
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+ADDRESS = "0x" + "11" * 20
+
+
+@pytest.fixture
+async def client():
+    key_manager = KeyManager(private_key="ab" * 32)
+    key_manager.account.account_number = 7
+    key_manager.account.next_sequence = 3
+    client = BlockchainClient(
+        NetworkConfiguration(host="http://localhost", port=26750, chain_id=5600),
+        key_manager=key_manager,
+        gas_estimator=GasEstimator(multiplier=1.5),
+    )
+    client.simulate_tx = AsyncMock(
+        return_value=SimulateResponse(gas_info=GasInfo(gas_used=1200, min_gas_price="5000000000BNB"))
+    )
+    yield client
+    await client.close()
+
+
+def msg_send():
+    return MsgSend(from_address=ADDRESS, to_address=ADDRESS, amount=[Coin(denom="BNB", amount="1")])
+
+
+async def test_gas_profiles():
+    estimator = GasEstimator(multiplier=1.25, ttl=60)
+    assert estimator.get([SEND]) is None
+
+    estimator.record([SEND], 1000, 5)
+    estimator.record([SEND], 800, 6)
+    assert estimator.get([SEND]) == GasProfile(1000, 6)
+    assert estimator.gas_limit(estimator.get([SEND])) == 1250
+    assert estimator.get([SEND, SEND]) is None
+
+    with patch("greenfield_python_sdk.blockchain.gas.time.monotonic", return_value=float("inf")):
+        assert estimator.get([SEND]) is None
+
+    estimator.invalidate([SEND])
+    assert [SEND] not in estimator
+
+
+async def test_first_tx_is_simulated_with_a_placeholder_and_signed_once(client):
+    simulated_signatures = []
+    simulation = client.simulate_tx.return_value
+
+    def simulate_tx(tx):
+        simulated_signatures.extend(tx.signatures)
+        return simulation
+
+    client.simulate_tx.side_effect = simulate_tx
+
+    with patch("greenfield_python_sdk.utils.sign_utils.get_signatures", AsyncMock(return_value=b"sig")) as sign:
+        tx = await client.build_tx_from_message([msg_send()], [SEND])
+
+    assert simulated_signatures == [PLACEHOLDER_SIGNATURE]
+    assert sign.await_count == 1
+    assert tx.signatures == [b"sig"]
+    assert tx.auth_info.fee.gas_limit == 1200
+    assert tx.auth_info.fee.amount[0].amount == str(5000000000 * 1200)
+
+
+async def test_repeated_txs_skip_the_simulation(client):
+    await client.build_tx_from_message([msg_send()], [SEND])
+    tx = await client.build_tx_from_message([msg_send()], [SEND])
+
+    assert client.simulate_tx.await_count == 1
+    assert tx.auth_info.fee.gas_limit == 1800
+    assert tx.auth_info.fee.amount[0].amount == str(5000000000 * 1800)
+
+
+async def test_signed_simulation(client):
+    client.gas_estimator = GasEstimator(placeholder_signature=False, cache=False)
+
+    with patch("greenfield_python_sdk.utils.sign_utils.get_signatures", AsyncMock(return_value=b"sig")) as sign:
+        await client.build_tx_from_message([msg_send()], [SEND])
+        await client.build_tx_from_message([msg_send()], [SEND])
+
+    assert client.simulate_tx.await_count == 2
+    assert sign.await_count == 4
+
+
+async def test_out_of_gas_drops_the_profile(client):
+    client.broadcast_tx = AsyncMock(side_effect=Exception("Transaction error: ", "out of gas in location: txSize"))
+    await client.build_tx_from_message([msg_send()], [SEND])
+    assert [SEND] in client.gas_estimator
+
+    with pytest.raises(Exception):
+        await client.broadcast_message([msg_send()], [SEND])
+    assert [SEND] not in client.gas_estimator
+
+
+async def test_txs_are_simulated_by_default(client):
+    default_client = BlockchainClient(NetworkConfiguration(host="http://localhost", port=26750, chain_id=5600))
+    client.gas_estimator = default_client.gas_estimator
+    await default_client.close()
+
+    await client.build_tx_from_message([msg_send()], [SEND])
+    client.simulate_tx.side_effect = Exception("bucket already exists")
+
+    # The errors are still caught before the broadcast
+    with pytest.raises(Exception, match="bucket already exists"):
+        await client.build_tx_from_message([msg_send()], [SEND])
+    assert client.simulate_tx.await_count == 2
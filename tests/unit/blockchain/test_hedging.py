@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer, unused_port
+
+from greenfield_python_sdk.blockchain.endpoint_pool import EndpointPool
+from greenfield_python_sdk.blockchain.hedging import HedgingPolicy
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.blockchain.utils import CustomChannel
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+ROUTE = "/greenfield.storage.Query/HeadBucket"
+
+
+async def start_node(name, delay=0.0):
+    async def abci_query(request):
+        server.requests += 1
+        await asyncio.sleep(delay)
+        return web.json_response({"result": {"response": {"value": "", "log": name}}})
+
+    app = web.Application()
+    app.router.add_get("/abci_query", abci_query)
+    server = TestServer(app)
+    server.requests = 0
+    await server.start_server()
+    server.url = f"http://{server.host}:{server.port}"
+    return server
+
+
+@pytest.fixture
+async def nodes():
+    nodes = [await start_node("slow", delay=0.5), await start_node("fast")]
+    yield nodes
+    for node in nodes:
+        await node.close()
+
+
+@pytest.fixture
+async def transport():
+    transport = RpcTransport("http://localhost", timeout=5)
+    yield transport
+    await transport.close()
+
+
+def build_channel(transport, urls, hedging):
+    return CustomChannel(
+        "http://localhost", 0, transport=transport, pool=EndpointPool(urls, transport), hedging=hedging
+    )
+
+
+async def test_slow_query_is_hedged(transport, nodes):
+    hedging = HedgingPolicy(max_delay=0.05, max_hedge_ratio=1.0)
+    channel = build_channel(transport, [node.url for node in nodes], hedging)
+
+    response = await channel.abci_query(ROUTE, b"")
+
+    assert response["result"]["response"]["log"] == "fast"
+    assert hedging.metrics[ROUTE].hedged == 1
+    assert hedging.metrics[ROUTE].hedge_won == 1
+    assert hedging.metrics[ROUTE].hedge_win_rate == 1.0
+
+
+async def test_hedge_budget(transport, nodes):
+    hedging = HedgingPolicy(max_delay=0.05, max_hedge_ratio=0.0)
+    channel = build_channel(transport, [node.url for node in nodes], hedging)
+
+    response = await channel.abci_query(ROUTE, b"")
+
+    assert response["result"]["response"]["log"] == "slow"
+    assert hedging.metrics[ROUTE].requests == 1
+    assert hedging.metrics[ROUTE].hedged == 0
+
+
+async def test_only_selected_routes_are_hedged(transport, nodes):
+    hedging = HedgingPolicy(max_delay=0.05, max_hedge_ratio=1.0, routes={ROUTE})
+    channel = build_channel(transport, [node.url for node in nodes], hedging)
+
+    await channel.abci_query("/greenfield.storage.Query/Params", b"")
+    assert hedging.metrics == {}
+    assert not hedging.is_hedgeable("/cosmos.tx.v1beta1.Service/BroadcastTx")
+
+
+async def test_failed_primary_fails_over(transport, nodes):
+    hedging = HedgingPolicy(max_delay=1.0)
+    channel = build_channel(transport, [f"http://localhost:{unused_port()}", nodes[1].url], hedging)
+
+    response = await channel.abci_query(ROUTE, b"")
+
+    assert response["result"]["response"]["log"] == "fast"
+    assert hedging.metrics[ROUTE].hedged == 0
+
+
+async def test_delay_follows_latency_percentile():
+    hedging = HedgingPolicy(percentile=0.9, min_delay=0.01, max_delay=1.0, min_samples=10)
+    assert hedging.delay(ROUTE) == 1.0
+
+    for latency in range(1, 11):
+        hedging._record(ROUTE, latency / 100)
+    assert hedging.delay(ROUTE) == 0.1
+
+    hedging._record(ROUTE, 5.0)
+    hedging._record(ROUTE, 5.0)
+    assert hedging.delay(ROUTE) == 1.0
+
+
+async def test_cancelled_query_cancels_its_attempts(transport, nodes):
+    hedging = HedgingPolicy(max_delay=1.0)
+    slow = await start_node("slow", delay=0.5)
+    channel = build_channel(transport, [nodes[0].url, slow.url], hedging)
+    query = asyncio.ensure_future(channel.abci_query(ROUTE, b""))
+    await asyncio.sleep(0.05)
+
+    query.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await query
+    await asyncio.sleep(0)
+    assert [endpoint.in_flight for endpoint in channel.pool.endpoints] == [0, 0]
+    await slow.close()
+
+
+async def test_hedged_latency_excludes_the_hedge_delay(transport, nodes):
+    hedging = HedgingPolicy(max_delay=0.2, max_hedge_ratio=1.0)
+    channel = build_channel(transport, [node.url for node in nodes], hedging)
+
+    await channel.abci_query(ROUTE, b"")
+
+    assert hedging.metrics[ROUTE].hedge_won == 1
+    assert hedging._latencies[ROUTE][0] < 0.1
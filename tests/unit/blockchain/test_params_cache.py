@@ -0,0 +1,133 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+
+from greenfield_python_sdk.blockchain._cosmos.gov import Gov
+from greenfield_python_sdk.blockchain.params_cache import ParamsCache
+from greenfield_python_sdk.blockchain.storage import Storage
+from greenfield_python_sdk.blockchain.subscription import SubscriptionClosed
+from greenfield_python_sdk.blockchain.utils import _query_height
+from greenfield_python_sdk.protos.cosmos.gov.v1 import QueryParamsRequest
+from greenfield_python_sdk.protos.greenfield.storage import Params, QueryParamsResponse, QueryStub
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class FakeSubscriber:
+    def __init__(self):
+        self.events = asyncio.Queue()
+
+    async def subscribe(self, query):
+        while True:
+            event = await self.events.get()
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+
+async def failing_subscription():
+    raise aiohttp.ClientConnectorError(MagicMock(), OSError("Connection refused"))
+    yield
+
+
+@pytest.fixture
+def storage(mock_channel):
+    storage = Storage(mock_channel, ParamsCache(ttl=60))
+    storage.query_stub = MagicMock(spec=QueryStub)
+    storage.query_stub.params = AsyncMock(return_value=QueryParamsResponse(params=Params(max_payload_size=1024 * 1024)))
+    return storage
+
+
+async def test_params_are_cached_by_module(storage):
+    responses = await asyncio.gather(*[storage.get_params() for _ in range(5)])
+    await storage.get_params()
+
+    assert storage.query_stub.params.await_count == 1
+    assert all(response is responses[0] for response in responses)
+    assert storage.params_cache.peek("storage") is responses[0]
+    assert storage.params_cache.peek("payment") is None
+
+
+async def test_params_expire_and_invalidate(storage):
+    await storage.get_params()
+
+    with patch("greenfield_python_sdk.blockchain.params_cache.time.monotonic", return_value=float("inf")):
+        assert storage.params_cache.peek("storage") is None
+
+    storage.params_cache.invalidate("storage")
+    await storage.get_params()
+    assert storage.query_stub.params.await_count == 2
+
+
+async def test_pinned_queries_bypass_the_cache(storage):
+    await storage.get_params()
+    token = _query_height.set(10)
+    try:
+        await storage.get_params()
+    finally:
+        _query_height.reset(token)
+
+    assert storage.query_stub.params.await_count == 2
+
+
+async def test_requests_are_part_of_the_key(mock_channel):
+    gov = Gov(mock_channel, ParamsCache())
+    gov.query_stub = MagicMock()
+    gov.query_stub.params = AsyncMock(side_effect=lambda request: request.params_type)
+
+    assert await gov.get_params(QueryParamsRequest(params_type="voting")) == "voting"
+    assert await gov.get_params(QueryParamsRequest(params_type="tallying")) == "tallying"
+    assert await gov.get_params(QueryParamsRequest(params_type="voting")) == "voting"
+    assert gov.query_stub.params.await_count == 2
+
+    gov.params_cache.invalidate("gov")
+    assert len(gov.params_cache._entries) == 0
+
+
+async def test_passed_proposal_invalidates_every_module(storage):
+    subscriber = FakeSubscriber()
+    params_cache = storage.params_cache
+    params_cache.subscriber = subscriber
+    await params_cache.get("payment", AsyncMock(return_value="payment params"))
+    await storage.get_params()
+
+    subscriber.events.put_nowait({"query": "proposal_passed"})
+    await asyncio.sleep(0)
+
+    assert params_cache.peek("storage") is None and params_cache.peek("payment") is None
+    await params_cache.close()
+
+
+async def test_failed_subscription_keeps_the_params(storage):
+    subscriber = MagicMock()
+    subscriber.subscribe = MagicMock(side_effect=lambda query: failing_subscription())
+    params_cache = storage.params_cache
+    params_cache.subscriber = subscriber
+
+    for _ in range(3):
+        await storage.get_params()
+        await asyncio.sleep(0)
+
+    assert storage.query_stub.params.await_count == 1
+    assert params_cache.peek("storage") is not None
+    # Not subscribed again before the delay
+    assert subscriber.subscribe.call_count == 1
+    params_cache.invalidate()
+    await storage.get_params()
+    assert subscriber.subscribe.call_count == 1
+    await params_cache.close()
+
+
+async def test_dropped_subscription_invalidates_every_module(storage):
+    subscriber = FakeSubscriber()
+    params_cache = storage.params_cache
+    params_cache.subscriber = subscriber
+    await storage.get_params()
+
+    subscriber.events.put_nowait(SubscriptionClosed("Tendermint websocket connection closed"))
+    await asyncio.sleep(0)
+
+    assert params_cache.peek("storage") is None
+    await params_cache.close()
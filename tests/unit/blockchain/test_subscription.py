@@ -0,0 +1,150 @@
+import asyncio
+import gc
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.blockchain.subscription import (
+    NEW_BLOCK_HEADER_QUERY,
+    TX_QUERY,
+    EventSubscriber,
+    websocket_url,
+)
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.blockchain.utils import wait_for_block_height
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+def block_event(height):
+    return {"query": NEW_BLOCK_HEADER_QUERY, "data": {"value": {"header": {"height": str(height)}}}}
+
+
+def tx_event(tx_hash, height):
+    return {
+        "query": TX_QUERY,
+        "data": {"value": {"TxResult": {"height": str(height)}}},
+        "events": {"tx.hash": [tx_hash], "tx.height": [str(height)]},
+    }
+
+
+@pytest.fixture
+async def websocket_server():
+    async def websocket(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        server.sockets.append(ws)
+        async for message in ws:
+            payload = message.json()
+            server.subscriptions.append(payload["params"]["query"])
+            await ws.send_json({"jsonrpc": "2.0", "id": payload["id"], "result": {}})
+        return ws
+
+    async def publish(result):
+        for ws in server.sockets:
+            await ws.send_json({"jsonrpc": "2.0", "id": 1, "result": result})
+
+    app = web.Application()
+    app.router.add_get("/websocket", websocket)
+    server = TestServer(app)
+    server.sockets = []
+    server.subscriptions = []
+    server.publish = publish
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def subscriber(websocket_server):
+    transport = RpcTransport(f"http://{websocket_server.host}:{websocket_server.port}", timeout=5)
+    subscriber = EventSubscriber(transport)
+    yield subscriber
+    await subscriber.close()
+    await transport.close()
+
+
+async def test_websocket_url():
+    assert websocket_url("https://gnfd-testnet-fullnode-tendermint-us.bnbchain.org:443") == (
+        "wss://gnfd-testnet-fullnode-tendermint-us.bnbchain.org:443/websocket"
+    )
+    assert websocket_url("http://localhost:26750") == "ws://localhost:26750/websocket"
+
+
+async def test_block_waiters_share_one_socket(subscriber, websocket_server):
+    waiters = asyncio.gather(subscriber.wait_for_block_height(11), subscriber.wait_for_block_height(12))
+    await asyncio.sleep(0.1)
+    await websocket_server.publish(block_event(11))
+    await websocket_server.publish(block_event(12))
+
+    assert await asyncio.wait_for(waiters, 2) == [11, 12]
+    assert len(websocket_server.sockets) == 1
+    assert websocket_server.subscriptions == [NEW_BLOCK_HEADER_QUERY]
+    assert await subscriber.wait_for_block_height(5) == 12
+
+
+async def test_tx_waiter(subscriber, websocket_server):
+    waiter = await subscriber.tx_waiter("abcd")
+    other = await subscriber.tx_waiter("ef01")
+    await websocket_server.publish(tx_event("ABCD", 7))
+
+    assert await asyncio.wait_for(waiter, 2) == {"height": "7"}
+    assert not other.done()
+    other.cancel()
+    await asyncio.sleep(0)
+    assert subscriber._tx_waiters == {}
+
+
+async def test_subscribe_query(subscriber, websocket_server):
+    query = "tm.event='Tx' AND message.sender='0x01'"
+    events = subscriber.subscribe(query)
+    event = asyncio.ensure_future(events.__anext__())
+    await asyncio.sleep(0.1)
+    await websocket_server.publish({"query": query, "data": {}})
+
+    assert (await asyncio.wait_for(event, 2))["query"] == query
+    await events.aclose()
+    assert websocket_server.subscriptions == [query, query]
+
+
+async def test_waiters_fail_when_socket_drops(subscriber, websocket_server):
+    waiter = asyncio.ensure_future(subscriber.wait_for_block_height(100))
+    await asyncio.sleep(0.1)
+    await websocket_server.sockets[0].close()
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(waiter, 2)
+    assert not subscriber.connected
+
+
+async def test_abandoned_waiters_are_not_logged_when_socket_drops(subscriber, websocket_server):
+    errors = []
+    asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+    abandoned = await subscriber.tx_waiter("abcd")
+    cancelled = asyncio.ensure_future(subscriber.wait_for_block_height(100))
+    await asyncio.sleep(0.1)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    await websocket_server.sockets[0].close()
+    await asyncio.sleep(0.1)
+
+    assert abandoned.done()
+    del abandoned
+    gc.collect()
+    assert errors == []
+
+
+async def test_wait_for_block_height_falls_back_to_polling():
+    heights = iter([1, 2, 3])
+    blockchain_client = MagicMock()
+    blockchain_client.tendermint.get_latest_block = AsyncMock(
+        side_effect=lambda: MagicMock(sdk_block=MagicMock(header=MagicMock(height=next(heights))))
+    )
+    blockchain_client.subscriber.wait_for_block_height = AsyncMock(side_effect=ConnectionError)
+
+    with patch("asyncio.sleep", AsyncMock()):
+        assert await wait_for_block_height(blockchain_client, 3) == 3
+    blockchain_client.subscriber.wait_for_block_height.assert_awaited_once_with(3)
@@ -0,0 +1,72 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.blockchain.transport import RpcTransport
+from greenfield_python_sdk.blockchain.utils import CustomChannel
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+@pytest.fixture
+async def rpc_server():
+    async def json_rpc(request):
+        payload = await request.json()
+        server.requests.append((payload, request.headers))
+        if payload["method"] == "unknown":
+            return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "error": {"code": -32601}})
+        return web.json_response({"jsonrpc": "2.0", "id": payload["id"], "result": {"method": payload["method"]}})
+
+    async def abci_info(request):
+        server.requests.append((dict(request.query), request.headers))
+        return web.json_response({"result": {"response": {"version": "v1.2.0"}}})
+
+    app = web.Application()
+    app.router.add_post("/", json_rpc)
+    app.router.add_get("/abci_info", abci_info)
+    server = TestServer(app)
+    server.requests = []
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def transport(rpc_server):
+    transport = RpcTransport(f"http://{rpc_server.host}:{rpc_server.port}", pool_size=2, timeout=5)
+    yield transport
+    await transport.close()
+
+
+async def test_transport_json_rpc(transport, rpc_server):
+    result = await transport.json_rpc("status", {})
+
+    assert result == {"method": "status"}
+    payload, headers = rpc_server.requests[0]
+    assert payload == {"jsonrpc": "2.0", "id": 1, "method": "status", "params": {}}
+    assert headers["User-Agent"].startswith("greenfield-python-sdk/")
+
+
+async def test_transport_json_rpc_error(transport):
+    with pytest.raises(Exception):
+        await transport.json_rpc("unknown", {})
+
+
+async def test_transport_get(transport, rpc_server):
+    response = await transport.get("/abci_info", headers={"accept": "application/json"})
+
+    assert response["result"]["response"]["version"] == "v1.2.0"
+    assert rpc_server.requests[0][1]["accept"] == "application/json"
+
+
+async def test_transport_settings(transport):
+    assert transport.session.connector.limit == 2
+    assert transport.session.timeout.total == 5
+
+
+async def test_channel_uses_provided_transport(transport):
+    channel = CustomChannel("http://localhost", 26657, transport=transport)
+    assert channel.session is transport.session
+
+    await channel.close()
+    assert not transport.session.closed
@@ -0,0 +1,229 @@
+import asyncio
+import base64
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.blockchain.sp import Sp
+from greenfield_python_sdk.blockchain.utils import CustomChannel
+from greenfield_python_sdk.protos.greenfield.sp import (
+    Params,
+    QueryParamsRequest,
+    QueryParamsResponse,
+    QuerySpStoragePriceRequest,
+    QueryStorageProviderRequest,
+    QueryStorageProviderResponse,
+    StorageProvider,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+PARAMS_RESPONSE = QueryParamsResponse(params=Params(deposit_denom="BNB", num_of_lockup_blocks_for_maintenance=7))
+
+
+def abci_response(message) -> dict:
+    return {"result": {"response": {"code": 0, "log": "", "value": base64.b64encode(bytes(message)).decode()}}}
+
+
+def batch_item_response(item) -> dict:
+    if item["params"]["path"] == "/greenfield.sp.Query/Params":
+        response = abci_response(PARAMS_RESPONSE)
+    elif item["params"]["path"] == "/greenfield.sp.Query/StorageProvider":
+        request = QueryStorageProviderRequest().parse(bytes.fromhex(item["params"]["data"]))
+        response = abci_response(QueryStorageProviderResponse(storage_provider=StorageProvider(id=request.id)))
+    else:
+        response = {"result": {"response": {"code": 6, "log": "unknown query path", "value": None}}}
+    return {"jsonrpc": "2.0", "id": item["id"], **response}
+
+
+@pytest.fixture
+async def abci_server():
+    async def abci_query(request):
+        server.paths.append(request.query["path"])
+        server.heights.append(request.query.get("height"))
+        return web.json_response(abci_response(PARAMS_RESPONSE))
+
+    async def json_rpc_batch(request):
+        batch = await request.json()
+        server.batches.append(batch)
+        # Answer out of order, the ids are what matter
+        return web.json_response([batch_item_response(item) for item in reversed(batch)])
+
+    app = web.Application()
+    app.router.add_get("/abci_query", abci_query)
+    app.router.add_post("/", json_rpc_batch)
+    server = TestServer(app)
+    server.paths = []
+    server.heights = []
+    server.batches = []
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def channel(abci_server):
+    channel = CustomChannel(f"http://{abci_server.host}", abci_server.port)
+    yield channel
+    await channel.close()
+
+
+async def test_streams_share_the_channel_session(channel):
+    sp = Sp(channel)
+
+    first = await sp.get_params()
+    session = channel.session
+    second = await sp.get_params()
+
+    assert first == PARAMS_RESPONSE
+    assert second == PARAMS_RESPONSE
+    assert channel.session is session
+
+
+async def test_channel_reuses_pooled_connections(channel, abci_server):
+    sp = Sp(channel)
+    for _ in range(5):
+        await sp.get_params()
+
+    assert abci_server.paths == ['"/greenfield.sp.Query/Params"'] * 5
+    assert len(channel.session.connector._conns) == 1
+
+
+async def test_channel_close_releases_the_session(channel):
+    await Sp(channel).get_params()
+    session = channel.session
+
+    await channel.close()
+
+    assert session.closed
+
+
+async def test_channel_pool_size(abci_server):
+    channel = CustomChannel(f"http://{abci_server.host}", abci_server.port, pool_size=3)
+    assert channel.session.connector.limit == 3
+    await channel.close()
+
+
+async def test_batch_scope_coalesces_concurrent_queries(channel, abci_server):
+    sp = Sp(channel)
+
+    async with channel.batch():
+        params, first, second = await asyncio.gather(
+            sp.get_params(),
+            sp.get_storage_provider(QueryStorageProviderRequest(id=1)),
+            sp.get_storage_provider(QueryStorageProviderRequest(id=2)),
+        )
+
+    assert params == PARAMS_RESPONSE
+    assert first.storage_provider.id == 1
+    assert second.storage_provider.id == 2
+    assert abci_server.paths == []
+    assert len(abci_server.batches) == 1
+    assert [item["method"] for item in abci_server.batches[0]] == ["abci_query"] * 3
+
+
+async def test_queries_outside_batch_scope_are_not_batched(channel, abci_server):
+    sp = Sp(channel)
+    async with channel.batch():
+        await sp.get_params()
+
+    await sp.get_params()
+    await sp.get_params()
+
+    assert len(abci_server.batches) == 1
+    assert len(abci_server.paths) == 2
+
+
+async def test_auto_batch(abci_server):
+    channel = CustomChannel(f"http://{abci_server.host}", abci_server.port, auto_batch=True, max_batch_size=2)
+    sp = Sp(channel)
+
+    responses = await asyncio.gather(*[sp.get_storage_provider(QueryStorageProviderRequest(id=i)) for i in range(5)])
+
+    assert [response.storage_provider.id for response in responses] == list(range(5))
+    assert [len(batch) for batch in abci_server.batches] == [2, 2, 1]
+    await channel.close()
+
+
+async def test_batched_query_error_only_fails_its_caller(channel):
+    sp = Sp(channel)
+
+    async with channel.batch():
+        params, error = await asyncio.gather(
+            sp.get_params(), sp.get_sp_storage_price(QuerySpStoragePriceRequest(sp_addr="0x01")), return_exceptions=True
+        )
+
+    assert params == PARAMS_RESPONSE
+    assert str(error) == "unknown query path"
+
+
+async def test_concurrent_identical_queries_share_one_call(channel, abci_server):
+    sp = Sp(channel)
+
+    responses = await asyncio.gather(*[sp.get_params() for _ in range(20)])
+
+    assert len(abci_server.paths) == 1
+    assert all(response is responses[0] for response in responses)
+    assert len(channel.single_flight) == 0
+
+    await sp.get_params()
+    assert len(abci_server.paths) == 2
+
+
+async def test_single_flight_keys_on_the_request(abci_server):
+    channel = CustomChannel(f"http://{abci_server.host}", abci_server.port, auto_batch=True)
+    sp = Sp(channel)
+
+    responses = await asyncio.gather(
+        *[sp.get_storage_provider(QueryStorageProviderRequest(id=i % 2)) for i in range(10)],
+        sp.get_sp_storage_price(QuerySpStoragePriceRequest(sp_addr="0x01")),
+        sp.get_sp_storage_price(QuerySpStoragePriceRequest(sp_addr="0x01")),
+        return_exceptions=True,
+    )
+
+    assert [response.storage_provider.id for response in responses[:10]] == [0, 1] * 5
+    assert str(responses[10]) == str(responses[11]) == "unknown query path"
+    assert len(abci_server.batches[0]) == 3
+    await channel.close()
+
+
+async def test_single_flight_can_be_disabled(abci_server):
+    channel = CustomChannel(f"http://{abci_server.host}", abci_server.port, single_flight=False)
+
+    await asyncio.gather(*[Sp(channel).get_params() for _ in range(3)])
+
+    assert len(abci_server.paths) == 3
+    await channel.close()
+
+
+async def test_queries_at_height_are_cached(channel, abci_server):
+    sp = Sp(channel)
+
+    async with channel.at_height(100):
+        first = await sp.get_params()
+        second = await sp.get_params()
+    await sp.get_params()
+    await sp.query_stub.params(QueryParamsRequest(), metadata={"x-cosmos-block-height": "101"})
+
+    assert first == second == PARAMS_RESPONSE
+    assert first is not second
+    assert abci_server.heights == ["100", None, "101"]
+    assert len(channel.height_cache) == 2
+
+
+async def test_batched_queries_at_height(channel, abci_server):
+    async with channel.batch(), channel.at_height(42):
+        await asyncio.gather(
+            Sp(channel).get_params(), Sp(channel).get_storage_provider(QueryStorageProviderRequest(id=1))
+        )
+
+    assert [item["params"]["height"] for item in abci_server.batches[0]] == ["42", "42"]
+
+
+async def test_failed_queries_at_height_are_not_cached(channel):
+    with pytest.raises(Exception, match="unknown query path"):
+        async with channel.batch(), channel.at_height(7):
+            await Sp(channel).get_sp_storage_price(QuerySpStoragePriceRequest(sp_addr="0x01"))
+
+    assert len(channel.height_cache) == 0
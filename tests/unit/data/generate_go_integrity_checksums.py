@@ -0,0 +1,54 @@
+"""Writes the checksums the Go library computes for the cases of go_integrity_checksums.json.
+
+Run it from the root of the repository once the Go library is built:
+    python tests/unit/data/generate_go_integrity_checksums.py
+"""
+
+import hashlib
+import io
+import json
+import os
+
+from greenfield_python_sdk.storage_provider.utils import compute_integrity_hash_go
+
+PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), "go_integrity_checksums.json")
+SEGMENT_SIZE = 1024
+# Empty, shorter than a segment, exactly one segment, several segments with a ragged tail
+CASES = [
+    (0, 4, 2),
+    (100, 4, 2),
+    (1024, 4, 2),
+    (3 * 1024 + 17, 4, 2),
+    (1, 6, 3),
+    (1024, 6, 3),
+    (3 * 1024 + 17, 6, 3),
+    (2 * 1024, 10, 4),
+    (3 * 1024 + 17, 10, 4),
+]
+
+
+def content(size: int) -> bytes:
+    return hashlib.shake_256(b"greenfield").digest(size)
+
+
+def main():
+    cases = []
+    for size, data_shards, parity_shards in CASES:
+        checksums, _, _ = compute_integrity_hash_go(
+            io.BytesIO(content(size)), SEGMENT_SIZE, data_shards, parity_shards, "false"
+        )
+        cases.append(
+            {
+                "size": size,
+                "data_shards": data_shards,
+                "parity_shards": parity_shards,
+                "checksums": [checksum.hex() for checksum in checksums],
+            }
+        )
+    with open(PATH, "w") as file:
+        json.dump({"segment_size": SEGMENT_SIZE, "cases": cases}, file, indent=2)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import pytest
+from grpclib.client import Channel
+from grpclib.server import Server
 
 from greenfield_python_sdk import BlockchainClient
 from greenfield_python_sdk.blockchain.bridge import Bridge
@@ -9,7 +11,11 @@ from greenfield_python_sdk.blockchain.permission import Permission
 from greenfield_python_sdk.blockchain.sp import Sp
 from greenfield_python_sdk.blockchain.storage import Storage
 from greenfield_python_sdk.blockchain.tendermint import Tendermint
+from greenfield_python_sdk.blockchain.utils import CustomChannel
 from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.protos.greenfield.sp import Params
+from greenfield_python_sdk.protos.greenfield.sp import QueryBase as SpQueryBase
+from greenfield_python_sdk.protos.greenfield.sp import QueryParamsRequest, QueryParamsResponse
 
 HOST = "localhost"
 PORT = 9090
@@ -57,3 +63,66 @@ async def test_blockchain_client_not_connected(mock_channel):
     client = BlockchainClient(network_config, channel=mock_channel)
 
     assert client.connected is False
+
+
+@pytest.mark.asyncio
+async def test_blockchain_client_closes_its_own_channel():
+    network_config = NetworkConfiguration(host=HOST, port=PORT, chain_id=CHAIN_ID)
+    async with BlockchainClient(network_config, pool_size=5) as client:
+        assert isinstance(client.channel, CustomChannel)
+        session = client.channel.session
+        assert session.connector.limit == 5
+
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_blockchain_client_leaves_provided_channel_open(mock_channel):
+    network_config = NetworkConfiguration(host=HOST, port=PORT, chain_id=CHAIN_ID)
+    session = mock_channel.session
+    async with BlockchainClient(network_config, channel=mock_channel):
+        pass
+
+    assert not session.closed
+    await mock_channel.close()
+
+
+@pytest.mark.asyncio
+async def test_blockchain_client_grpc_channel():
+    network_config = NetworkConfiguration(
+        host=HOST, port=PORT, chain_id=CHAIN_ID, grpc_host="https://grpc.localhost", grpc_port=9090, channel_type="grpc"
+    )
+    async with BlockchainClient(network_config) as client:
+        assert isinstance(client.channel, Channel)
+        assert client.channel._host == "grpc.localhost"
+        assert client.channel._port == 9090
+        assert client.channel._ssl is not None
+
+
+@pytest.mark.asyncio
+async def test_blockchain_client_grpc_channel_requires_endpoint():
+    network_config = NetworkConfiguration(host=HOST, port=PORT, chain_id=CHAIN_ID, channel_type="grpc")
+    with pytest.raises(ValueError):
+        await BlockchainClient(network_config).__aenter__()
+
+
+class SpQueryService(SpQueryBase):
+    async def params(self, query_params_request: QueryParamsRequest) -> QueryParamsResponse:
+        return QueryParamsResponse(params=Params(deposit_denom="BNB"))
+
+
+@pytest.mark.asyncio
+async def test_blockchain_client_grpc_query():
+    server = Server([SpQueryService()])
+    await server.start("127.0.0.1", 0)
+    port = server._server.sockets[0].getsockname()[1]
+
+    network_config = NetworkConfiguration(
+        host=HOST, port=PORT, chain_id=CHAIN_ID, grpc_host="http://127.0.0.1", grpc_port=port, channel_type="grpc"
+    )
+    async with BlockchainClient(network_config) as client:
+        response = await client.sp.get_params()
+
+    assert response.params.deposit_denom == "BNB"
+    server.close()
+    await server.wait_closed()
@@ -1,6 +1,6 @@
 import pytest
 
-from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.config import ChannelType, NetworkConfiguration
 
 pytestmark = [pytest.mark.unit]
 
@@ -19,3 +19,25 @@ def test_network_configuration_initialization():
     network_config_custom = NetworkConfiguration(host=host, port=port, chain_id=chain_id)
     assert network_config_custom.host == host
     assert network_config_custom.port == port
+
+
+def test_network_configuration_channel_type():
+    network_config = NetworkConfiguration(host="localhost", port=443, chain_id=5000)
+    assert network_config.channel_type == ChannelType.ABCI
+    assert network_config.grpc_host is None
+
+    network_config = NetworkConfiguration(
+        host="localhost", port=443, chain_id=5000, grpc_host="localhost", grpc_port=9090, channel_type="grpc"
+    )
+    assert network_config.channel_type == ChannelType.GRPC
+    assert network_config.grpc_port == 9090
+
+
+def test_network_configuration_endpoints():
+    network_config = NetworkConfiguration(host="localhost", port=443, chain_id=5000)
+    assert network_config.endpoints == []
+
+    network_config = NetworkConfiguration(
+        host="localhost", port=443, chain_id=5000, endpoints=["https://fullnode-2.example.org:443"]
+    )
+    assert network_config.endpoints == ["https://fullnode-2.example.org:443"]
@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from greenfield_python_sdk import GreenfieldClient
+from greenfield_python_sdk.blockchain_client import BlockchainClient
+from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.key_manager import KeyManager
+from greenfield_python_sdk.sp_directory import SpDirectory
+from greenfield_python_sdk.storage_provider.request import Client
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+SPS = [
+    {"id": 1, "operator_address": "0x01", "endpoint": "https://sp1.example.org"},
+    {"id": 2, "operator_address": "0x02", "endpoint": "https://sp2.example.org"},
+]
+
+
+def client(**kwargs):
+    return GreenfieldClient(
+        KeyManager(private_key="ab" * 32),
+        NetworkConfiguration(host="http://localhost", port=26750, chain_id=5600),
+        **kwargs,
+    )
+
+
+async def test_enter_sends_no_request(mock_channel):
+    with patch.object(BlockchainClient, "get_active_sps", AsyncMock()) as get_active_sps:
+        async with client(channel=mock_channel) as greenfield_client:
+            assert "storage_client" not in greenfield_client.__dict__
+            assert "bucket" not in greenfield_client.__dict__
+            assert "storage" not in greenfield_client.blockchain_client.__dict__
+
+            assert greenfield_client.object.bucket is greenfield_client.bucket
+            assert "client" not in greenfield_client.storage_client.__dict__
+
+    get_active_sps.assert_not_awaited()
+
+
+async def test_supplied_account_skips_the_sync(mock_channel):
+    async with client(channel=mock_channel, account_number=7, sequence=3) as greenfield_client:
+        greenfield_client.sync_account = AsyncMock()
+        await greenfield_client.async_init()
+
+        greenfield_client.sync_account.assert_not_awaited()
+        assert greenfield_client.key_manager.account.account_number == 7
+        assert greenfield_client.key_manager.account.next_sequence == 3
+
+    async with client(channel=mock_channel, account_number=7) as greenfield_client:
+        greenfield_client.sync_account = AsyncMock()
+        await greenfield_client.async_init()
+
+        greenfield_client.sync_account.assert_awaited_once()
+
+
+async def test_sp_client_resolves_the_sps_on_first_use():
+    fetch = AsyncMock(return_value=MagicMock(to_pydict=MagicMock(return_value={"sps": SPS})))
+    directory = SpDirectory(fetch, include=lambda sp: sp["id"] == 2)
+
+    async with Client("", MagicMock(), None, sp_directory=directory) as sp_client:
+        assert sp_client._session is None
+        fetch.assert_not_awaited()
+
+        assert await sp_client._get_in_service_sp() == "https://sp2.example.org"
+        assert await sp_client._get_sp_url_by_id(1) == "https://sp1.example.org"
+        assert sp_client.set_bucket_url("bucket", address="0x01") == "https://bucket.sp1.example.org"
+        assert fetch.await_count == 1
+    await directory.close()
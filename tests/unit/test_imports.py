@@ -0,0 +1,93 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = [pytest.mark.unit]
+
+LOADED_MODULES = """
+import json, sys
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def loaded_modules(statement: str):
+    # A fresh interpreter, the modules of the test session are already imported
+    output = subprocess.run(
+        [sys.executable, "-c", LOADED_MODULES.format(statement=statement)], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import greenfield_python_sdk",
+        "from greenfield_python_sdk import GreenfieldClient",
+        "from greenfield_python_sdk import BlockchainClient",
+    ],
+)
+def test_the_clients_do_not_import_the_protos(statement):
+    modules = loaded_modules(statement)
+
+    assert not [module for module in modules if module.startswith("greenfield_python_sdk.protos")]
+    assert "greenfield_python_sdk.greenfield.bucket" not in modules
+    assert "greenfield_python_sdk.models.eip712_messages" not in modules
+
+
+# Only needed by the seed phrases, the BLS keys and the Ed25519 keys
+HEAVY_CRYPTO_MODULES = ["py_ecc", "hdwallets", "mnemonic", "eth_account", "Crypto.PublicKey.ECC"]
+
+SIGN_TX = """
+import asyncio
+from greenfield_python_sdk import BlockchainClient, KeyManager, NetworkConfiguration
+from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import MsgSend
+from greenfield_python_sdk.utils.sign_utils import get_signatures
+
+
+async def sign():
+    key_manager = KeyManager(private_key="ab" * 32)
+    key_manager.account.account_number = 1
+    key_manager.account.next_sequence = 1
+    configuration = NetworkConfiguration(host="http://localhost", port=26750, chain_id=5600)
+    async with BlockchainClient(configuration, key_manager=key_manager) as client:
+        messages = [MsgSend(from_address=key_manager.address, to_address=key_manager.address)]
+        tx = await client.build_tx(messages, ["/cosmos.bank.v1beta1.MsgSend"])
+        await get_signatures(key_manager, tx, messages, 5600)
+
+
+asyncio.run(sign())
+"""
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from greenfield_python_sdk import GreenfieldClient, KeyManager",
+        "from greenfield_python_sdk import KeyManager; KeyManager(private_key='ab' * 32)",
+        SIGN_TX,
+    ],
+)
+def test_private_keys_do_not_import_the_heavy_crypto_modules(statement):
+    modules = loaded_modules(statement)
+
+    assert not [module for module in HEAVY_CRYPTO_MODULES if module in modules]
+
+
+def test_seed_phrases_import_their_modules_on_demand():
+    modules = loaded_modules("from greenfield_python_sdk.key_manager import Account; Account()")
+
+    assert "mnemonic" in modules and "hdwallets" in modules
+    assert "py_ecc" not in modules
+
+
+def test_lazy_exports():
+    import greenfield_python_sdk
+    from greenfield_python_sdk.greenfield_client import GreenfieldClient
+
+    assert greenfield_python_sdk.GreenfieldClient is GreenfieldClient
+    assert set(greenfield_python_sdk.__all__) <= set(dir(greenfield_python_sdk))
+    with pytest.raises(AttributeError):
+        greenfield_python_sdk.Missing
@@ -0,0 +1,243 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import tracemalloc
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from greenfield_python_sdk.greenfield.object import Object as GreenfieldObject
+from greenfield_python_sdk.models.const import HASH_ENGINE_PYTHON
+from greenfield_python_sdk.models.object import CreateObjectOptions
+from greenfield_python_sdk.protos.greenfield.storage import RedundancyType
+from greenfield_python_sdk.storage_provider.integrity import (
+    MUL_TABLE,
+    IntegrityHasher,
+    ReedSolomon,
+    build_matrix,
+    compute_integrity_hash,
+    compute_integrity_hash_stream,
+    gf_exp,
+    gf_mul,
+    matrix_invert,
+    matrix_multiply,
+)
+from greenfield_python_sdk.storage_provider.object import Object
+from greenfield_python_sdk.storage_provider.utils import compute_integrity_hash_go, getDirPath
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+EMPTY_HASH = hashlib.sha256(b"").digest()
+
+# Checksums of the Go library, written by data/generate_go_integrity_checksums.py
+with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "data", "go_integrity_checksums.json")) as file:
+    GO_CHECKSUMS = json.load(file)
+
+
+def sha256(data) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+# The test vectors of klauspost/reedsolomon and of the Backblaze library it is ported from
+async def test_galois_field():
+    assert [gf_mul(3, 4), gf_mul(7, 7), gf_mul(23, 45)] == [12, 21, 41]
+    assert [gf_exp(2, 2), gf_exp(5, 20), gf_exp(13, 7)] == [4, 235, 43]
+    assert all(gf_mul(a, 1) == a and gf_mul(a, 0) == 0 for a in range(256))
+
+    matrix = np.array([[56, 23, 98], [3, 100, 200], [45, 201, 123]], dtype=np.uint8)
+    assert matrix_invert(matrix).tolist() == [[175, 133, 33], [130, 13, 245], [112, 35, 126]]
+    assert matrix_multiply(matrix, matrix_invert(matrix)).tolist() == np.eye(3, dtype=np.uint8).tolist()
+
+
+async def test_reed_solomon_encoding():
+    shards = np.array([[0, 1], [4, 5], [2, 3], [6, 7], [8, 9]], dtype=np.uint8)
+
+    parity = ReedSolomon(5, 5).encode_parity(shards)
+
+    assert parity.tolist() == [[12, 13], [10, 11], [14, 15], [90, 91], [94, 95]]
+
+
+@pytest.mark.parametrize("data_shards, parity_shards, size", [(4, 2, 100_001), (6, 3, 7), (1, 1, 10)])
+async def test_any_data_shards_rebuild_the_data(data_shards, parity_shards, size):
+    encoder = ReedSolomon(data_shards, parity_shards)
+    data = os.urandom(size)
+    shards = np.array(encoder.encode(data))
+    matrix = build_matrix(data_shards, data_shards + parity_shards)
+
+    assert matrix[:data_shards].tolist() == np.eye(data_shards, dtype=np.uint8).tolist()
+    # Without the first parity_shards shards
+    rows = list(range(parity_shards, data_shards + parity_shards))
+    decode = matrix_invert(matrix[rows])
+    rebuilt = np.zeros_like(shards[:data_shards])
+    for row, coefficients in enumerate(decode):
+        for shard, coefficient in zip(shards[rows], coefficients):
+            rebuilt[row] ^= MUL_TABLE[coefficient][shard]
+    assert rebuilt.tobytes()[:size] == data
+
+
+async def test_integrity_hash():
+    content = os.urandom(2500)
+
+    checksums, size, redundancy_type = compute_integrity_hash(io.BytesIO(content), 1024, 4, 2)
+
+    assert size == 2500 and redundancy_type == RedundancyType.REDUNDANCY_EC_TYPE
+    assert len(checksums) == 7
+    segments = [content[offset : offset + 1024] for offset in range(0, 2500, 1024)]
+    assert checksums[0] == sha256(b"".join(sha256(segment) for segment in segments))
+    # The data pieces of the last segment of 452 bytes are 113 bytes long
+    pieces = [segment.ljust(-(-len(segment) // 4) * 4, b"\0") for segment in segments]
+    assert checksums[1] == sha256(b"".join(sha256(piece[: len(piece) // 4]) for piece in pieces))
+
+    assert len(compute_integrity_hash(io.BytesIO(content), 1024, 6, 3)[0]) == 10
+    assert compute_integrity_hash(io.BytesIO(), 1024, 4, 2)[0] == [EMPTY_HASH] * 7
+
+
+async def async_chunks(data: bytes, size: int):
+    for offset in range(0, len(data), size):
+        yield data[offset : offset + size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024, 1500, 5000])
+async def test_hasher_accepts_chunks_of_any_size(chunk_size):
+    content = os.urandom(3000)
+    hasher = IntegrityHasher(1024, 4, 2)
+
+    for offset in range(0, len(content), chunk_size):
+        hasher.update(content[offset : offset + chunk_size])
+
+    assert hasher.digest() == compute_integrity_hash(io.BytesIO(content), 1024, 4, 2)
+    with pytest.raises(Exception, match="already computed"):
+        hasher.update(b"more")
+
+
+async def test_streamed_sources(tmp_path):
+    content = os.urandom(5000)
+    expected = compute_integrity_hash(io.BytesIO(content), 1024, 4, 2)
+    path = tmp_path / "object"
+    path.write_bytes(content)
+
+    assert await compute_integrity_hash_stream(path, 1024, 4, 2) == expected
+    assert await compute_integrity_hash_stream(async_chunks(content, 700), 1024, 4, 2) == expected
+    with open(path, "rb") as file:
+        assert compute_integrity_hash(file, 1024, 4, 2) == expected
+        file.seek(0)
+        assert await compute_integrity_hash_stream(file, 1024, 4, 2) == expected
+        # Put back for the upload
+        assert file.tell() == 0
+
+
+async def test_streamed_hashing_memory_is_flat(tmp_path):
+    path = tmp_path / "object"
+    with open(path, "wb") as file:
+        for _ in range(32):
+            file.write(os.urandom(1024 * 1024))
+
+    tracemalloc.start()
+    try:
+        checksums, size, _ = await compute_integrity_hash_stream(path, 1024 * 1024, 4, 2)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert size == 32 * 1024 * 1024 and len(checksums) == 7
+    assert peak < 8 * 1024 * 1024
+
+
+async def test_hash_engine_selection(tmp_path):
+    versioned_params = MagicMock(redundant_data_chunk_num=4, redundant_parity_chunk_num=2, max_segment_size=1024)
+    storage_params = MagicMock(params=MagicMock(versioned_params=versioned_params))
+    reader = io.BytesIO(os.urandom(3000))
+
+    checksums, size, _ = await Object(MagicMock()).compute_hash_roots(
+        storage_params, reader, "true", HASH_ENGINE_PYTHON
+    )
+    assert (checksums, size) == compute_integrity_hash(reader, 1024, 4, 2)[:2]
+    with pytest.raises(Exception, match="Unknown hash engine"):
+        await Object(MagicMock()).compute_hash_roots(storage_params, reader, "true", "rust")
+
+    path = tmp_path / "object"
+    path.write_bytes(reader.getvalue())
+    streamed = await Object(MagicMock()).compute_hash_roots(storage_params, path, "true", HASH_ENGINE_PYTHON)
+    assert streamed[:2] == (checksums, size)
+    # The Go library is the default engine, it can't stream a path
+    assert (await Object(MagicMock()).compute_hash_roots(storage_params, path, "true"))[:2] == (checksums, size)
+
+
+async def test_create_object_hashes_a_path_with_the_default_options(tmp_path):
+    content = os.urandom(3000)
+    path = tmp_path / "object"
+    path.write_bytes(content)
+    versioned_params = MagicMock(redundant_data_chunk_num=4, redundant_parity_chunk_num=2, max_segment_size=1024)
+    blockchain_client = MagicMock()
+    blockchain_client.storage.get_params = AsyncMock(
+        return_value=MagicMock(params=MagicMock(versioned_params=versioned_params))
+    )
+    blockchain_client.broadcast_message = AsyncMock(return_value="tx_hash")
+    bucket = MagicMock()
+    bucket.storage_provider_by_bucket = AsyncMock(return_value="0x01")
+    storage_client = MagicMock()
+    storage_client.object = Object(MagicMock())
+
+    async def create_object_approval(message, primary_sp_address):
+        checksums = [base64.b64encode(checksum).decode() for checksum in message.expect_checksums]
+        approval = {"expired_height": "100", "sig": "signature"}
+        return json.dumps({"expect_checksums": checksums, "primary_sp_approval": approval}).encode()
+
+    storage_client.object.create_object_approval = create_object_approval
+    greenfield_object = GreenfieldObject(blockchain_client, MagicMock(address="0x02"), storage_client, bucket)
+
+    assert await greenfield_object.create_object("bucket", "object", path, CreateObjectOptions()) == "tx_hash"
+
+    message = blockchain_client.broadcast_message.await_args.args[0][0]
+    checksums, size, _ = compute_integrity_hash(io.BytesIO(content), 1024, 4, 2)
+    assert message.expect_checksums == checksums
+    assert message.payload_size == size
+
+
+def golden_content(size: int) -> bytes:
+    return hashlib.shake_256(b"greenfield").digest(size)
+
+
+@pytest.mark.parametrize(
+    "case", GO_CHECKSUMS["cases"], ids=lambda case: f"{case['size']}-{case['data_shards']}+{case['parity_shards']}"
+)
+async def test_same_checksums_as_the_go_library(case):
+    content = golden_content(case["size"])
+
+    checksums, size, _ = compute_integrity_hash(
+        io.BytesIO(content), GO_CHECKSUMS["segment_size"], case["data_shards"], case["parity_shards"]
+    )
+
+    assert [checksum.hex() for checksum in checksums] == case["checksums"]
+    assert size == case["size"]
+
+
+@pytest.mark.go_library
+@pytest.mark.skipif(not os.path.exists(getDirPath()), reason="the Go library is not built")
+async def test_golden_checksums_come_from_the_go_library():
+    for case in GO_CHECKSUMS["cases"]:
+        go, _, _ = compute_integrity_hash_go(
+            io.BytesIO(golden_content(case["size"])),
+            GO_CHECKSUMS["segment_size"],
+            case["data_shards"],
+            case["parity_shards"],
+            "false",
+        )
+        assert [checksum.hex() for checksum in go] == case["checksums"]
+
+
+@pytest.mark.go_library
+@pytest.mark.skipif(not os.path.exists(getDirPath()), reason="the Go library is not built")
+# Empty, shorter than a segment, exactly one segment, several segments with a ragged tail
+@pytest.mark.parametrize("size", [0, 1, 1000, 1024 * 1024 + 3, 16 * 1024 * 1024, 40 * 1024 * 1024 + 17])
+@pytest.mark.parametrize("data_shards, parity_shards", [(4, 2), (6, 3), (10, 4)])
+async def test_same_checksums_as_the_go_library_at_segment_size(size, data_shards, parity_shards):
+    content = os.urandom(size)
+    segment_size = 16 * 1024 * 1024
+
+    go = compute_integrity_hash_go(io.BytesIO(content), segment_size, data_shards, parity_shards, "false")
+
+    assert compute_integrity_hash(io.BytesIO(content), segment_size, data_shards, parity_shards) == go
@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+import pytest
+
+from greenfield_python_sdk.key_manager import Account, privkey_to_eth_address, seed_to_private_key
+
+pytestmark = [pytest.mark.unit]
+
+SEED_PHRASE = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+def test_seed_account_derives_its_keys_once():
+    account = Account(seed_phrase=SEED_PHRASE)
+    private_key = seed_to_private_key(SEED_PHRASE, "m/44'/60'/0'/0/0")
+
+    with patch("mnemonic.Mnemonic.to_seed") as to_seed:
+        for _ in range(3):
+            assert account.private_key == private_key
+            assert account.address == privkey_to_eth_address(account.private_key)
+            assert account.public_key
+    to_seed.assert_not_called()
+
+
+def test_address_index_selects_the_sub_account():
+    account = Account(seed_phrase=SEED_PHRASE)
+    account.address_index = 2
+
+    assert account.address == Account(seed_phrase=SEED_PHRASE, address_index=2).address
+    assert account.private_key == seed_to_private_key(SEED_PHRASE, "m/44'/60'/0'/0/2")
+
+
+def test_derive_sub_accounts():
+    account = Account(seed_phrase=SEED_PHRASE)
+
+    keys = account.derive_sub_accounts([3, 1, 3])
+
+    assert [key.address_index for key in keys] == [3, 1, 3]
+    assert keys[1].private_key == seed_to_private_key(SEED_PHRASE, "m/44'/60'/0'/0/1")
+    assert keys[0].address == privkey_to_eth_address(keys[0].private_key)
+    account.address_index = 3
+    assert account.address == keys[0].address
+
+
+def test_derive_sub_accounts_needs_a_seed():
+    with pytest.raises(ValueError):
+        Account(private_key="ab" * 32).derive_sub_accounts(range(2))
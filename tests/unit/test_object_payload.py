@@ -0,0 +1,130 @@
+import io
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.models.object import PutObjectOptions
+from greenfield_python_sdk.storage_provider.object import Object
+from greenfield_python_sdk.storage_provider.payload import ObjectPayload, object_payload
+from greenfield_python_sdk.storage_provider.request import Client
+from greenfield_python_sdk.utils.retry import RetryableError, RetryPolicy
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+CONTENT = os.urandom(10_000)
+
+
+@pytest.fixture
+async def sp_server():
+    async def put(request):
+        body = await request.read()
+        server.bodies.append(body)
+        if len(server.bodies) <= server.failures:
+            return web.Response(status=503)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_put("/{path:.*}", put)
+    server = TestServer(app)
+    server.bodies = []
+    server.failures = 0
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+async def async_chunks(data: bytes, size: int):
+    for offset in range(0, len(data), size):
+        yield data[offset : offset + size]
+
+
+async def collect(payload: ObjectPayload):
+    return [chunk async for chunk in payload]
+
+
+async def test_files_are_read_in_fixed_size_chunks(tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(CONTENT)
+
+    for source in (path, io.BytesIO(CONTENT)):
+        payload = ObjectPayload(source, chunk_size=4096)
+        chunks = await collect(payload)
+
+        assert [len(chunk) for chunk in chunks] == [4096, 4096, 1808]
+        assert b"".join(chunks) == CONTENT
+        assert payload.size == len(CONTENT)
+        assert payload.replayable
+        assert b"".join(await collect(payload)) == CONTENT
+
+    with open(path, "rb") as file:
+        file.seek(1000)
+        payload = ObjectPayload(file, chunk_size=4096)
+        assert payload.size == len(CONTENT) - 1000
+        assert b"".join(await collect(payload)) == CONTENT[1000:]
+
+
+async def test_async_iterators_are_rechunked_once():
+    payload = ObjectPayload(async_chunks(CONTENT, 300), chunk_size=4096)
+
+    assert payload.size is None
+    assert not payload.replayable
+    assert [len(chunk) for chunk in await collect(payload)] == [4096, 4096, 1808]
+    with pytest.raises(Exception, match="already sent"):
+        await collect(payload)
+
+
+async def test_unsupported_payloads(tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(CONTENT)
+
+    assert object_payload(CONTENT) is CONTENT
+    assert object_payload("text") == "text"
+    with open(path, "r") as file, pytest.raises(Exception, match="binary mode"):
+        ObjectPayload(file)
+    with pytest.raises(Exception, match="folder"):
+        ObjectPayload(tmp_path)
+    with pytest.raises(Exception, match="must yield bytes"):
+        await collect(ObjectPayload(async_chunks("text", 2)))
+    with pytest.raises(Exception, match="Unsupported"):
+        ObjectPayload(42)
+
+
+async def test_put_object_streams_the_payload(sp_server, tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(CONTENT)
+    base_url = f"http://{sp_server.host}:{sp_server.port}"
+
+    async with Client("", MagicMock(address="0x01"), {}) as client:
+        client._get_sp_url_by_addr = AsyncMock(return_value=base_url)
+        headers = AsyncMock(return_value={"Content-Length": str(len(CONTENT))})
+        with patch("greenfield_python_sdk.storage_provider.request.generate_headers", headers):
+            for source in (path, io.BytesIO(CONTENT), async_chunks(CONTENT, 512)):
+                result = await Object(client).put_object(
+                    "bucket", "object", len(CONTENT), "0x01", source, PutObjectOptions()
+                )
+                assert result == "Object added successfully"
+
+            with pytest.raises(ValueError, match="object_size"):
+                await Object(client).put_object("bucket", "object", 5, "0x01", path, PutObjectOptions())
+
+    assert sp_server.bodies == [CONTENT] * 3
+
+
+async def test_replayable_payloads_are_retried(sp_server, tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(CONTENT)
+    sp_server.failures = 1
+    url = f"http://{sp_server.host}:{sp_server.port}/bucket/object"
+
+    with patch("greenfield_python_sdk.utils.retry.asyncio.sleep", AsyncMock()):
+        async with Client("", MagicMock(), {}, retry_policy=RetryPolicy()) as client:
+            await client.fetch("PUT", url, data=ObjectPayload(path))
+            assert sp_server.bodies == [CONTENT, CONTENT]
+
+            sp_server.bodies, sp_server.failures = [], 1
+            with pytest.raises(RetryableError, match="Error with response status"):
+                await client.fetch("PUT", url, data=ObjectPayload(async_chunks(CONTENT, 512)))
+            assert sp_server.bodies == [CONTENT]
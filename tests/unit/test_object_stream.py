@@ -0,0 +1,83 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.models.object import GetObjectOption
+from greenfield_python_sdk.storage_provider.download import ObjectStream
+from greenfield_python_sdk.storage_provider.object import Object
+from greenfield_python_sdk.storage_provider.request import Client
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+CONTENT = os.urandom(10_000)
+
+
+@pytest.fixture
+async def sp_client():
+    async def get(request):
+        return web.Response(body=CONTENT, content_type="application/octet-stream")
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", get)
+    server = TestServer(app)
+    await server.start_server()
+    async with Client("", MagicMock(), {}) as client:
+        client._get_sp_url_by_addr = AsyncMock(return_value=f"http://{server.host}:{server.port}")
+        with patch("greenfield_python_sdk.storage_provider.request.generate_headers", AsyncMock(return_value={})):
+            yield client
+    await server.close()
+
+
+async def open_stream(client: Client, chunk_size: int = 4096) -> ObjectStream:
+    stream = await Object(client).get_object_stream("bucket", "object", "0x01", GetObjectOption())
+    stream.chunk_size = chunk_size
+    return stream
+
+
+async def test_stream_yields_bytes_chunks(sp_client):
+    async with await open_stream(sp_client) as stream:
+        chunks = [chunk async for chunk in stream]
+
+    assert stream.info.size == len(CONTENT)
+    assert all(isinstance(chunk, bytes) and len(chunk) <= 4096 for chunk in chunks)
+    assert b"".join(chunks) == CONTENT
+
+
+async def test_readinto_fills_the_buffer(sp_client):
+    buffer = bytearray(6000)
+    async with await open_stream(sp_client) as stream:
+        assert await stream.readinto(buffer) == 6000
+        assert buffer == CONTENT[:6000]
+        assert await stream.readinto(memoryview(buffer)[:5000]) == 4000
+        assert buffer[:4000] == CONTENT[6000:]
+        assert await stream.readinto(buffer) == 0
+
+
+async def test_to_file_replaces_the_file_once_complete(sp_client, tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(b"previous content")
+
+    assert await (await open_stream(sp_client)).to_file(path) == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+
+    async def interrupted(self):
+        yield CONTENT[:100]
+        raise ConnectionError("connection lost")
+
+    path.write_bytes(b"previous content")
+    with patch.object(ObjectStream, "__aiter__", interrupted), pytest.raises(ConnectionError):
+        await (await open_stream(sp_client)).to_file(path)
+    assert path.read_bytes() == b"previous content"
+    assert os.listdir(tmp_path) == ["object"]
+
+
+async def test_get_object_decodes_the_text(sp_client, monkeypatch):
+    text = "Grüße, Größe. " * 1000
+    monkeypatch.setitem(globals(), "CONTENT", text.encode())
+
+    info, content = await Object(sp_client).get_object("bucket", "object", "0x01", GetObjectOption())
+
+    assert content == text and info.size == len(text.encode())
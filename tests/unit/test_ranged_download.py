@@ -0,0 +1,122 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.models.object import GetObjectOption, ObjectStat
+from greenfield_python_sdk.storage_provider.download import RangedDownload, decode_text, segment_ranges
+from greenfield_python_sdk.storage_provider.object import Object
+from greenfield_python_sdk.storage_provider.request import Client
+from greenfield_python_sdk.utils.retry import RetryPolicy
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+CONTENT = os.urandom(10_000)
+SEGMENT_SIZE = 1024
+
+
+@pytest.fixture
+async def sp_server():
+    async def get(request):
+        start, end = map(int, request.headers["Range"].removeprefix("bytes=").split("-"))
+        server.ranges.append((start, end))
+        server.active += 1
+        server.max_active = max(server.max_active, server.active)
+        try:
+            await asyncio.sleep(0.01)
+            if server.ignore_range:
+                return web.Response(body=CONTENT)
+            data = CONTENT[start : end + 1]
+            response = web.StreamResponse(status=206, headers={"Content-Length": str(len(data))})
+            await response.prepare(request)
+            if start in server.interrupt:
+                # Half of the range, then the connection is lost
+                server.interrupt.remove(start)
+                await response.write(data[: len(data) // 2])
+                request.transport.close()
+                return response
+            await response.write(data)
+            return response
+        finally:
+            server.active -= 1
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", get)
+    server = TestServer(app)
+    server.ranges, server.interrupt = [], set()
+    server.active = server.max_active = 0
+    server.ignore_range = False
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def ranged_download(sp_server):
+    async with Client("", MagicMock(), {}) as client:
+        client._get_sp_url_by_addr = AsyncMock(return_value=f"http://{sp_server.host}:{sp_server.port}")
+
+        async def open_range(start, end):
+            opts = GetObjectOption(range=f"bytes={start}-{end}")
+            return await Object(client).get_object_stream("bucket", "object", "0x01", opts)
+
+        def ranged_download(concurrency=3, part_size=None, content_type="application/octet-stream"):
+            info = ObjectStat(object_name="object", content_type=content_type, size=len(CONTENT))
+            retry_policy = RetryPolicy(base_delay=0)
+            return RangedDownload(open_range, info, SEGMENT_SIZE, concurrency, part_size, retry_policy, chunk_size=256)
+
+        with patch(
+            "greenfield_python_sdk.storage_provider.utils.generate_authorization_header", AsyncMock(return_value="")
+        ):
+            yield ranged_download
+
+
+async def test_segment_ranges():
+    assert segment_ranges(2500, 1024) == [(0, 1023), (1024, 2047), (2048, 2499)]
+    assert segment_ranges(2500, 1024, part_size=1500) == [(0, 2047), (2048, 2499)]
+    assert segment_ranges(1024, 1024) == [(0, 1023)]
+    assert segment_ranges(0, 1024) == []
+
+
+async def test_ranges_are_downloaded_concurrently(sp_server, ranged_download):
+    buffer = bytearray(len(CONTENT))
+
+    assert await ranged_download(concurrency=3).readinto(buffer) == len(CONTENT)
+    assert buffer == CONTENT
+    assert sorted(sp_server.ranges) == segment_ranges(len(CONTENT), SEGMENT_SIZE)
+    assert sp_server.max_active == 3
+
+
+async def test_failed_ranges_resume_from_their_missing_bytes(sp_server, ranged_download, tmp_path):
+    path = tmp_path / "object"
+    sp_server.interrupt = {2048, 8192}
+
+    assert await ranged_download(part_size=2048).to_file(path) == len(CONTENT)
+    assert path.read_bytes() == CONTENT
+    assert (2048 + 1024, 4095) in sp_server.ranges and (8192 + 904, 9999) in sp_server.ranges
+    assert os.listdir(tmp_path) == ["object"]
+
+
+async def test_ignored_ranges_are_rejected(sp_server, ranged_download, tmp_path):
+    path = tmp_path / "object"
+    path.write_bytes(b"previous content")
+    sp_server.ignore_range = True
+
+    with pytest.raises(Exception, match="status 200"):
+        await ranged_download().to_file(path)
+    assert path.read_bytes() == b"previous content"
+    assert os.listdir(tmp_path) == ["object"]
+
+
+async def test_text_is_decoded_with_the_charset_of_the_content_type(ranged_download, monkeypatch):
+    text = "Grüße, Größe. " * 1000
+    monkeypatch.setitem(globals(), "CONTENT", text.encode("latin-1"))
+
+    assert await ranged_download(content_type="text/plain; charset=latin-1").text() == text
+    with pytest.raises(UnicodeDecodeError):
+        await ranged_download().text()
+    assert decode_text("Grüße".encode(), "text/plain") == "Grüße"
+    assert decode_text("Grüße".encode(), "text/plain; charset=unknown") == "Grüße"
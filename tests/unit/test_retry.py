@@ -0,0 +1,156 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from greenfield_python_sdk.sp_directory import WrongSpError
+from greenfield_python_sdk.storage_provider.request import Client
+from greenfield_python_sdk.utils.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryableError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+@pytest.fixture
+def no_sleep():
+    with patch("greenfield_python_sdk.utils.retry.asyncio.sleep", AsyncMock()) as sleep:
+        yield sleep
+
+
+@pytest.fixture
+async def sp_server():
+    async def status(request):
+        server.requests += 1
+        if server.requests <= server.failures:
+            return web.Response(status=server.status, text=server.error, headers={"Retry-After": "2"})
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/status", status)
+    server = TestServer(app)
+    server.requests = 0
+    server.failures = 1
+    server.status = 503
+    server.error = ""
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+async def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+async def test_backoff_is_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+    assert all(0 <= policy.delay(attempt) <= min(1.0, 0.1 * 2**attempt) for attempt in range(10))
+    assert policy.delay(0, retry_after=5) == 1.0
+    assert policy.delay(0, retry_after=0.5) == 0.5
+
+
+async def test_retries_transient_errors(no_sleep):
+    call = AsyncMock(side_effect=[RetryableError("503", retry_after=0.3), asyncio.TimeoutError(), "ok"])
+
+    assert await RetryPolicy(max_attempts=3).run(call) == "ok"
+    assert call.await_count == 3
+    assert no_sleep.await_args_list[0].args == (0.3,)
+
+
+async def test_does_not_retry_other_errors(no_sleep):
+    call = AsyncMock(side_effect=Exception("invalid request"))
+
+    with pytest.raises(Exception, match="invalid request"):
+        await RetryPolicy().run(call)
+    assert call.await_count == 1
+
+
+async def test_non_idempotent_requests_only_retry_connection_failures(no_sleep):
+    call = AsyncMock(side_effect=[aiohttp.ServerDisconnectedError(), "ok"])
+    with pytest.raises(aiohttp.ServerDisconnectedError):
+        await RetryPolicy().run(call, idempotent=False)
+
+    connector_error = aiohttp.ClientConnectorError(MagicMock(), OSError(111, "refused"))
+    call = AsyncMock(side_effect=[connector_error, "ok"])
+    assert await RetryPolicy().run(call, idempotent=False) == "ok"
+
+
+async def test_circuit_breaker(no_sleep):
+    policy = RetryPolicy(max_attempts=1, failure_threshold=2, reset_timeout=30)
+    call = AsyncMock(side_effect=RetryableError("503"))
+
+    for _ in range(2):
+        with pytest.raises(RetryableError):
+            await policy.run(call, endpoint="sp1")
+    with pytest.raises(CircuitOpenError):
+        await policy.run(call, endpoint="sp1")
+    assert call.await_count == 2
+    assert policy.breaker("sp1").state == "open"
+    assert policy.breaker("sp2").state == "closed"
+
+
+async def test_circuit_breaker_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+async def test_sp_client_retries_unavailable_sp(sp_server, no_sleep, status):
+    sp_server.status = status
+    url = f"http://{sp_server.host}:{sp_server.port}/status"
+    async with Client("", MagicMock(), {}, retry_policy=RetryPolicy()) as client:
+        assert await client.fetch("GET", url, type="body") == "ok"
+    assert sp_server.requests == 2
+    assert no_sleep.await_args_list[0].args == (2.0,)
+
+
+async def test_sp_client_without_retry_policy(sp_server):
+    url = f"http://{sp_server.host}:{sp_server.port}/status"
+    async with Client("", MagicMock(), {}) as client:
+        with pytest.raises(RetryableError, match="Error with response status") as error:
+            await client.fetch("GET", url)
+    assert error.value.status == 503
+    assert error.value.retry_after == 2.0
+
+
+async def test_overloaded_sp_trips_the_circuit_breaker(sp_server, no_sleep):
+    sp_server.failures = 10
+    url = f"http://{sp_server.host}:{sp_server.port}/status"
+    policy = RetryPolicy(max_attempts=2, failure_threshold=2, reset_timeout=30)
+    async with Client("", MagicMock(), {}, retry_policy=policy) as client:
+        with pytest.raises(RetryableError):
+            await client.fetch("GET", url)
+        with pytest.raises(CircuitOpenError):
+            await client.fetch("GET", url)
+    assert sp_server.requests == 2
+    assert policy.breaker(f"{sp_server.host}:{sp_server.port}").state == "open"
+
+
+async def test_wrong_sp_is_not_retried(sp_server, no_sleep):
+    sp_server.status = 400
+    sp_server.error = "<Error><Code>50027</Code><Message>mismatched primary sp</Message></Error>"
+    url = f"http://{sp_server.host}:{sp_server.port}/status"
+    policy = RetryPolicy(failure_threshold=1)
+    async with Client("", MagicMock(), {}, retry_policy=policy) as client:
+        with pytest.raises(WrongSpError, match="not the primary SP") as error:
+            await client.fetch("GET", url)
+    assert error.value.status == 400
+    assert sp_server.requests == 1
+    assert policy.breaker(f"{sp_server.host}:{sp_server.port}").state == "closed"
@@ -0,0 +1,246 @@
+import base64
+import copy
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from betterproto.lib.google.protobuf import Any
+
+from greenfield_python_sdk.blockchain_client import BlockchainClient
+from greenfield_python_sdk.config import NetworkConfiguration
+from greenfield_python_sdk.key_manager import KeyManager
+from greenfield_python_sdk.models.eip712_messages import TYPES_MAP
+from greenfield_python_sdk.models.eip712_messages.bank.msg_send import TYPE_URL as SEND
+from greenfield_python_sdk.models.eip712_messages.group.group_url import CREATE_GROUP, UPDATE_GROUP_MEMBER
+from greenfield_python_sdk.models.eip712_messages.proposal.proposal_url import VOTE
+from greenfield_python_sdk.models.eip712_messages.storage.bucket_url import (
+    CREATE_BUCKET,
+    DELETE_BUCKET,
+    UPDATE_BUCKET_INFO,
+)
+from greenfield_python_sdk.models.eip712_messages.storage.object_url import CREATE_OBJECT
+from greenfield_python_sdk.models.eip712_messages.storage.policy_url import DELETE_POLICY, PUT_POLICY
+from greenfield_python_sdk.models.transaction import BroadcastOption
+from greenfield_python_sdk.protos.cosmos.bank.v1beta1 import MsgSend
+from greenfield_python_sdk.protos.cosmos.base.v1beta1 import Coin
+from greenfield_python_sdk.protos.cosmos.gov.v1 import MsgVote, VoteOption
+from greenfield_python_sdk.protos.greenfield.common import Approval, UInt64Value
+from greenfield_python_sdk.protos.greenfield.permission import ActionType, Effect, Principal, PrincipalType, Statement
+from greenfield_python_sdk.protos.greenfield.storage import (
+    MsgCreateBucket,
+    MsgCreateGroup,
+    MsgCreateObject,
+    MsgDeleteBucket,
+    MsgDeletePolicy,
+    MsgGroupMember,
+    MsgPutPolicy,
+    MsgUpdateBucketInfo,
+    MsgUpdateGroupMember,
+    RedundancyType,
+    VisibilityType,
+)
+from greenfield_python_sdk.utils.eip712_encoder import UnsupportedValue
+from greenfield_python_sdk.utils.sign_utils import (
+    compile_schema,
+    encode_tx_hash,
+    encode_tx_hash_from_dict,
+    get_signatures,
+    hash_type,
+    set_message,
+    sorted_dict,
+    tx_schema,
+)
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+ADDRESS = "0x" + "11" * 20
+MEMBER = "0x" + "22" * 20
+CHAIN_ID = 5600
+
+
+@pytest.fixture
+async def client():
+    key_manager = KeyManager(private_key="ab" * 32)
+    key_manager.account.account_number = 7
+    key_manager.account.next_sequence = 3
+    client = BlockchainClient(
+        NetworkConfiguration(host="http://localhost", port=26750, chain_id=CHAIN_ID), key_manager=key_manager
+    )
+    yield client
+    await client.close()
+
+
+def msg_send():
+    return MsgSend(from_address=ADDRESS, to_address=MEMBER, amount=[Coin(denom="BNB", amount="1000")])
+
+
+def msg_update_group_member(add: bool, delete: bool):
+    return MsgUpdateGroupMember(
+        operator=ADDRESS,
+        group_owner=ADDRESS,
+        group_name="g",
+        members_to_add=[MsgGroupMember(member=MEMBER, expiration_time=datetime(2030, 1, 2, 3, 4, 5))] if add else [],
+        members_to_delete=[MEMBER] if delete else [],
+    )
+
+
+async def sign(client, messages, type_urls, direct_encoding=True):
+    tx = await client.build_tx(messages, type_urls)
+    return (await get_signatures(client.key_manager, tx, messages, CHAIN_ID, direct_encoding=direct_encoding)).hex()
+
+
+async def encode_both_ways(client, messages, type_urls, broadcast_option=None):
+    tx = await client.build_tx(messages, type_urls)
+    schema = tx_schema(tx.body.messages, messages)
+    messages = [set_message(type_url, message, broadcast_option) for type_url, message in zip(type_urls, messages)]
+    account = client.key_manager.account
+
+    direct = encode_tx_hash(schema, tx, messages, CHAIN_ID, account.account_number, account.next_sequence)
+    return direct, encode_tx_hash_from_dict(schema, tx, messages, CHAIN_ID, client.key_manager)
+
+
+async def test_compiled_schemas_are_cached_and_immutable():
+    schema = compile_schema(((SEND, frozenset()),))
+
+    assert compile_schema(((SEND, frozenset()),)) is schema
+    assert "msg1" in [field["name"] for field in schema.types["Tx"]]
+    assert schema.dependencies["Fee"] == ("Fee", "Coin")
+    assert schema.type_hashes["Tx"] == hash_type("Tx", sorted_dict({k: list(v) for k, v in schema.types.items()}))
+    with pytest.raises(TypeError):
+        schema.types["Msg1"] = ()
+    with pytest.raises(TypeError):
+        schema.types["Msg1"][0]["type"] = "bytes"
+
+
+async def test_signatures(client):
+    assert await sign(client, [msg_send()], [SEND]) == (
+        "30a99ab20f4c6d44cb3e13c72017a80cec827f7da36d65e2d6442921dfe9ed5e"
+        "421ff778955a675898e64d02382388a1ae97e0f97ffcb123515f414a6a13437e1c"
+    )
+
+
+async def test_group_member_types_do_not_leak_between_txs(client):
+    types_map = copy.deepcopy(TYPES_MAP)
+
+    add = await sign(client, [msg_update_group_member(add=True, delete=False)], [UPDATE_GROUP_MEMBER])
+    delete = await sign(client, [msg_update_group_member(add=False, delete=True)], [UPDATE_GROUP_MEMBER])
+
+    assert add == (
+        "1dc4f7f3295a6728ddb9c3658a3c7afbd86b4fce9ba3dbb92d92b1b963919e2a"
+        "5cc1971ea1d79fb1e62b53e3d09791fea0fc62cb49f404e998fac366c284eb4a1c"
+    )
+    assert delete == (
+        "5531c64e166166084051f537eeafd3aeccf743b6749b41813de16814499af699"
+        "75421f6511d26c6ef692221f17b9d134805e985e9294084dc368ec0cd5d352d71b"
+    )
+    assert TYPES_MAP == types_map
+
+
+async def test_direct_encoding_matches_the_dict_conversion(client):
+    direct, from_dict = await encode_both_ways(
+        client, [msg_send(), msg_update_group_member(add=False, delete=True)], [SEND, UPDATE_GROUP_MEMBER]
+    )
+
+    assert direct == from_dict
+
+
+SP_SIGNATURE = base64.b64encode(b"\x01" * 65).decode()
+SP_APPROVAL = Approval(expired_height=100, global_virtual_group_family_id=3, sig=bytes(SP_SIGNATURE, "utf-8"))
+CHECKSUMS = [base64.b64encode(bytes([i]) * 32).decode() for i in range(7)]
+PRINCIPAL = Principal(type=PrincipalType.PRINCIPAL_TYPE_GNFD_ACCOUNT, value=MEMBER)
+
+
+def msg_put_policy(expiration_time=None):
+    message = MsgPutPolicy(
+        operator=ADDRESS,
+        resource="grn:b::bucket",
+        principal=copy.deepcopy(PRINCIPAL),
+        statements=[Statement(effect=Effect.EFFECT_ALLOW, actions=[ActionType.ACTION_GET_OBJECT])],
+    )
+    if expiration_time:
+        message.expiration_time = expiration_time
+    return message
+
+
+# The messages the SDK sends, as its modules build them
+SENT_MESSAGES = {
+    "create_bucket": (
+        CREATE_BUCKET,
+        lambda: MsgCreateBucket(
+            creator=ADDRESS,
+            bucket_name="bucket",
+            visibility=VisibilityType.VISIBILITY_TYPE_PRIVATE,
+            payment_address=ADDRESS,
+            primary_sp_address=MEMBER,
+            primary_sp_approval=copy.deepcopy(SP_APPROVAL),
+            charged_read_quota=100,
+        ),
+    ),
+    "create_object": (
+        CREATE_OBJECT,
+        lambda: MsgCreateObject(
+            creator=ADDRESS,
+            bucket_name="bucket",
+            object_name="object",
+            payload_size=3000,
+            visibility=VisibilityType.VISIBILITY_TYPE_INHERIT,
+            content_type="application/octet-stream",
+            primary_sp_approval=copy.deepcopy(SP_APPROVAL),
+            expect_checksums=[base64.b64decode(checksum) for checksum in CHECKSUMS],
+            redundancy_type=RedundancyType.REDUNDANCY_EC_TYPE,
+        ),
+    ),
+    "delete_bucket": (DELETE_BUCKET, lambda: MsgDeleteBucket(operator=ADDRESS, bucket_name="bucket")),
+    "update_bucket_info": (
+        UPDATE_BUCKET_INFO,
+        lambda: MsgUpdateBucketInfo(
+            operator=ADDRESS,
+            bucket_name="bucket",
+            charged_read_quota=UInt64Value(value=100),
+            payment_address=ADDRESS,
+            visibility=VisibilityType.VISIBILITY_TYPE_PUBLIC_READ,
+        ),
+    ),
+    "put_policy": (PUT_POLICY, msg_put_policy),
+    "put_policy_with_expiration": (PUT_POLICY, lambda: msg_put_policy(datetime(2030, 1, 2, 3, 4, 5))),
+    "delete_policy": (
+        DELETE_POLICY,
+        lambda: MsgDeletePolicy(operator=ADDRESS, resource="grn:b::bucket", principal=copy.deepcopy(PRINCIPAL)),
+    ),
+    "vote": (VOTE, lambda: MsgVote(proposal_id=4, voter=ADDRESS, option=VoteOption.VOTE_OPTION_YES, metadata="")),
+    "create_group": (CREATE_GROUP, lambda: MsgCreateGroup(creator=ADDRESS, group_name="group", extra="extra")),
+}
+
+
+@pytest.mark.parametrize("type_url, message", SENT_MESSAGES.values(), ids=SENT_MESSAGES.keys())
+async def test_direct_encoding_matches_the_dict_conversion_of_the_sent_messages(client, type_url, message):
+    broadcast_option = BroadcastOption(sp_signature=SP_SIGNATURE, checksums=CHECKSUMS)
+
+    direct, from_dict = await encode_both_ways(client, [message()], [type_url], broadcast_option)
+
+    assert direct == from_dict
+
+
+@pytest.mark.parametrize("add, delete", [(True, False), (True, True)])
+async def test_direct_encoding_reads_the_rewritten_fields(client, add, delete):
+    direct, from_dict = await encode_both_ways(
+        client, [msg_update_group_member(add=add, delete=delete)], [UPDATE_GROUP_MEMBER]
+    )
+
+    assert direct == from_dict
+
+
+async def test_direct_encoding_falls_back_with_a_warning(client, caplog):
+    from_dict = await sign(client, [msg_send()], [SEND], direct_encoding=False)
+
+    with patch("greenfield_python_sdk.utils.sign_utils.encode_tx_hash", side_effect=UnsupportedValue("Any")):
+        assert await sign(client, [msg_send()], [SEND]) == from_dict
+
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+
+
+async def test_direct_encoding_rejects_any_messages():
+    schema = compile_schema(((SEND, frozenset()),))
+
+    with pytest.raises(UnsupportedValue):
+        schema.encoders["Coin"](Any(type_url="/cosmos.base.v1beta1.Coin", value=b""))
@@ -0,0 +1,177 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from greenfield_python_sdk.greenfield.bucket import Bucket
+from greenfield_python_sdk.protos.greenfield.sp import QueryStorageProvidersResponse, StorageProvider
+from greenfield_python_sdk.protos.greenfield.storage import BucketInfo, QueryHeadBucketResponse
+from greenfield_python_sdk.protos.greenfield.virtualgroup import (
+    GlobalVirtualGroupFamily,
+    QueryGlobalVirtualGroupFamilyResponse,
+)
+from greenfield_python_sdk.sp_directory import BucketRoute, BucketRouteCache, SpDirectory, WrongSpError
+from greenfield_python_sdk.storage_provider.request import Client
+from greenfield_python_sdk.utils.retry import RetryableError
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+def storage_providers(*ids):
+    return QueryStorageProvidersResponse(
+        sps=[
+            StorageProvider(id=i, operator_address=f"0x{i:040x}", endpoint=f"https://gnfd-sp-{i}.bnbchain.org")
+            for i in ids
+        ]
+    )
+
+
+async def test_lookups_by_id_address_and_endpoint():
+    directory = SpDirectory(AsyncMock(return_value=storage_providers(1, 2)))
+
+    sp = await directory.get_by_id(2)
+
+    assert sp["operator_address"] == f"0x{2:040x}"
+    assert directory.by_address(f"0x{2:040x}") is sp
+    assert directory.by_endpoint("https://GNFD-SP-2.bnbchain.org/") is sp
+    assert directory.version == 1
+
+
+async def test_refreshes_when_stale_or_missing():
+    fetch = AsyncMock(side_effect=[storage_providers(1), storage_providers(1, 2), storage_providers(1, 2)])
+    directory = SpDirectory(fetch, ttl=60, min_refresh_interval=0)
+
+    assert await directory.get_by_id(1)
+    assert await directory.get_by_id(1)
+    assert fetch.await_count == 1
+
+    assert (await directory.get_by_id(2))["id"] == 2
+    assert fetch.await_count == 2
+    assert directory.version == 2
+
+    directory.invalidate()
+    await directory.ensure_fresh()
+    assert fetch.await_count == 3
+    assert directory.version == 2
+
+
+async def test_missing_providers_refresh_at_most_once_per_interval():
+    fetch = AsyncMock(return_value=storage_providers(1))
+    directory = SpDirectory(fetch, ttl=60, min_refresh_interval=10)
+
+    for _ in range(5):
+        assert await directory.get_by_id(9) is None
+        assert await directory.get_by_endpoint("https://unknown.example.org") is None
+    assert fetch.await_count == 1
+
+    fetch.return_value = storage_providers(1, 9)
+    later = directory.updated_at + 10
+    with patch("greenfield_python_sdk.sp_directory.time.monotonic", return_value=later):
+        assert (await directory.get_by_id(9))["id"] == 9
+    assert fetch.await_count == 2
+
+
+async def test_concurrent_refreshes_share_one_fetch():
+    fetch = AsyncMock(return_value=storage_providers(1))
+    directory = SpDirectory(fetch)
+
+    await asyncio.gather(*[directory.get_by_id(1) for _ in range(10)])
+
+    assert fetch.await_count == 1
+
+
+async def test_active_filter():
+    directory = SpDirectory(AsyncMock(return_value=storage_providers(1, 2)), include=lambda sp: sp["id"] == 1)
+    await directory.ensure_fresh()
+
+    assert [sp["id"] for sp in directory.active()] == [1]
+    assert len(directory.all()) == 2
+
+
+async def test_sp_client_uses_the_directory():
+    sp_endpoints = {"0x01": {"id": 7, "operator_address": "0x01", "endpoint": "https://sp7.example.org"}}
+    client = Client("", MagicMock(), sp_endpoints)
+
+    assert await client._get_sp_url_by_id(7) == "https://sp7.example.org"
+    assert await client._get_sp_url_by_addr("0x01", "bucket") == "https://bucket.sp7.example.org"
+
+
+def route(sp_id):
+    return BucketRoute("1", 3, sp_id, f"0x{sp_id:040x}", f"https://gnfd-sp-{sp_id}.bnbchain.org")
+
+
+@pytest.fixture
+def bucket():
+    @asynccontextmanager
+    async def batch():
+        yield
+
+    blockchain_client = MagicMock()
+    blockchain_client.batch = batch
+    blockchain_client.bucket_routes = BucketRouteCache()
+    blockchain_client.sp_directory = SpDirectory(AsyncMock(return_value=storage_providers(1, 2)))
+    blockchain_client.storage.get_head_bucket = AsyncMock(
+        return_value=QueryHeadBucketResponse(bucket_info=BucketInfo(id="1", global_virtual_group_family_id=3))
+    )
+    blockchain_client.virtual_group.global_virtual_group_family = AsyncMock(
+        return_value=QueryGlobalVirtualGroupFamilyResponse(
+            global_virtual_group_family=GlobalVirtualGroupFamily(id=3, primary_sp_id=2)
+        )
+    )
+    blockchain_client.broadcast_message = AsyncMock(return_value="tx_hash")
+    return Bucket(blockchain_client, MagicMock(), MagicMock())
+
+
+async def test_bucket_route_cache_expires_and_evicts():
+    cache = BucketRouteCache(ttl=60, max_size=2)
+    cache.put("a", route(1))
+    cache.put("b", route(2))
+    assert cache.get("a") == route(1)
+
+    cache.put("c", route(1))
+    assert "b" not in cache and "a" in cache
+
+    with patch("greenfield_python_sdk.sp_directory.time.monotonic", return_value=float("inf")):
+        assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+async def test_hot_bucket_resolves_without_queries(bucket):
+    blockchain_client = bucket.blockchain_client
+
+    assert await bucket.storage_provider_by_bucket("bucket") == f"0x{2:040x}"
+    assert await bucket.storage_provider_by_bucket("bucket") == f"0x{2:040x}"
+
+    assert blockchain_client.storage.get_head_bucket.await_count == 1
+    assert blockchain_client.virtual_group.global_virtual_group_family.await_count == 1
+    assert blockchain_client.bucket_routes.get("bucket") == route(2)
+
+
+async def test_migrate_bucket_invalidates_the_route(bucket):
+    await bucket.storage_provider_by_bucket("bucket")
+    bucket.storage_client.bucket.get_migrate_bucket_approval = AsyncMock(return_value=(MagicMock(), "signature"))
+
+    await bucket.migrate_bucket("bucket", 1, MagicMock())
+
+    assert "bucket" not in bucket.blockchain_client.bucket_routes
+
+
+async def test_wrong_sp_answer_invalidates_the_route(bucket):
+    await bucket.storage_provider_by_bucket("bucket")
+    bucket.storage_client.bucket.get_bucket_read_quota = AsyncMock(side_effect=RetryableError("429", status=429))
+
+    with pytest.raises(RetryableError):
+        await bucket.get_bucket_read_quota("bucket")
+    assert "bucket" in bucket.blockchain_client.bucket_routes
+
+    bucket.storage_client.bucket.get_bucket_read_quota = AsyncMock(side_effect=RetryableError("503", status=503))
+    with pytest.raises(RetryableError):
+        await bucket.get_bucket_read_quota("bucket")
+    assert "bucket" not in bucket.blockchain_client.bucket_routes
+
+    await bucket.storage_provider_by_bucket("bucket")
+    bucket.storage_client.bucket.get_bucket_read_quota = AsyncMock(side_effect=WrongSpError("400", status=400))
+    with pytest.raises(WrongSpError):
+        await bucket.get_bucket_read_quota("bucket")
+    assert "bucket" not in bucket.blockchain_client.bucket_routes